@@ -1,14 +1,36 @@
-from flask import Flask, request, jsonify, Blueprint, abort, send_from_directory, render_template
+from flask import Flask, request, jsonify, Blueprint, abort, send_from_directory, send_file, render_template, g, Response, stream_with_context
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.orm.attributes import flag_modified
 from datetime import date, datetime, timezone
 import os
 from flask_cors import CORS
+from werkzeug.exceptions import RequestEntityTooLarge, UnsupportedMediaType
+from werkzeug.security import safe_join
 from werkzeug.utils import secure_filename
-from tempfile import NamedTemporaryFile
-import traceback
+import hmac
 import json
 import re
-import dateparser  # <-- added date parsing
+from utils.deadlines import DEFAULT_NORMALIZER as DEADLINES
+from utils.task_extraction import extract_tasks_regex
+from utils.inference_pool import InferencePool, PooledLLM
+from utils.speculative import SpeculativeDecoding, parse_sites
+from utils import runtime_profile
+from utils.stage_dag import StageGraph, StageRun
+from utils import metrics, request_profiler
+from utils.structured_log import configure_logging, get_logger, new_request_id, REQUEST_ID_HEADER
+import time
+from utils.segment_table import SegmentTable, SegmentTableType, segments_as_dicts
+from utils.json_stream import JsonArrayStream
+from utils.serializers import Schema, Field, iso, list_or_empty, or_none, or_empty, dumps
+from utils.http_cache import collection_version, compress_response, etag_from_version
+from utils.artifact_store import DEFAULT_STORE as ARTIFACTS, is_content_addressed
+from utils.change_feed import ChangeFeed
+from utils.job_queue import JobQueue, JobRejected
+from utils.near_duplicates import NearDuplicateIndex, normalize_text
+from utils.upload_spool import (
+    SpoolingRequest, SpooledUpload, UploadRejected, MAX_UPLOAD_BYTES, SPOOL_DIR, spool_upload,
+    check_audio_duration
+)
 # Optional AI inference imports
 try:
     from faster_whisper import WhisperModel  # Windows-safe
@@ -19,12 +41,26 @@ try:
 except Exception:
     Llama = None
 
+configure_logging()
+log = get_logger("app")
+
 # Flask app
 app = Flask(__name__, static_folder="frontend/dist", static_url_path="")
 app.secret_key = os.environ.get("FLASK_SECRET", "replace-me-for-prod")
+# Uploads are streamed to the spool dir; reject oversized bodies before parsing
+app.request_class = SpoolingRequest
+app.config['MAX_CONTENT_LENGTH'] = MAX_UPLOAD_BYTES
+# Request profiling: every request when PROFILE_REQUESTS is on, otherwise only
+# requests sent with "X-Profile: 1" and a valid "X-Admin-Token" (if PROFILE_ALLOW_HEADER)
+app.config['PROFILE_REQUESTS'] = os.environ.get("MOM_PROFILE_REQUESTS", "0").lower() in ("1", "true", "yes")
+app.config['PROFILE_ALLOW_HEADER'] = os.environ.get("MOM_PROFILE_ALLOW_HEADER", "0").lower() in ("1", "true", "yes")
+# Let a fronting nginx/Apache send files directly (X-Sendfile) when enabled
+app.config['USE_X_SENDFILE'] = os.environ.get("MOM_USE_X_SENDFILE", "0").lower() in ("1", "true", "yes")
+# Admin endpoints require "X-Admin-Token" to match MOM_ADMIN_TOKEN; without it they are closed
+ADMIN_TOKEN = os.environ.get("MOM_ADMIN_TOKEN")
 
 # Database config
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///mom.db'
+app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///mom.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 db = SQLAlchemy(app)
 CORS(app, resources={r"/api/*": {"origins": "*"}})
@@ -45,9 +81,13 @@ class Meeting(db.Model):
     start_time = db.Column(db.String(50))
     end_time = db.Column(db.String(50))
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc),
+                           onupdate=lambda: datetime.now(timezone.utc), index=True)
+    version = db.Column(db.Integer, index=True)  # Change-feed sequence number of the last write
     key_decisions = db.Column(db.PickleType)
     mom_file_path = db.Column(db.String(500))  # Path to generated MoM file
-    transcript_segments = db.Column(db.PickleType)  # Store timestamps/transcript
+    mom_content_hash = db.Column(db.String(64))  # Hash of the inputs the MoM was rendered from
+    transcript_segments = db.Column(SegmentTableType)  # Columnar timestamps/transcript (SegmentTable)
     speakers = db.Column(db.Text)  # Comma-separated list of unique speakers
 
 class Task(db.Model):
@@ -58,8 +98,13 @@ class Task(db.Model):
     status = db.Column(db.String(50), default="Pending")
     notes = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc),
+                           onupdate=lambda: datetime.now(timezone.utc), index=True)
+    version = db.Column(db.Integer, index=True)  # Change-feed sequence number of the last write
     meeting_id = db.Column(db.Integer, db.ForeignKey('meeting.id'), nullable=True)
     speaker_id = db.Column(db.String(50))  # Link to speaker who assigned task
+    duplicate_of = db.Column(db.Integer, db.ForeignKey('task.id'), index=True)  # Near-identical task from an earlier meeting
+    window_index = db.Column(db.Integer)  # Transcript window it was extracted from (NULL: whole-transcript pass)
 
 class Conflict(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -68,10 +113,63 @@ class Conflict(db.Model):
     resolution = db.Column(db.Text)
     severity = db.Column(db.String(50), default="Medium")
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc),
+                           onupdate=lambda: datetime.now(timezone.utc), index=True)
+    version = db.Column(db.Integer, index=True)  # Change-feed sequence number of the last write
     stance = db.Column(db.Text)  # stance analysis results (JSON string)
     participants = db.Column(db.Text)  # comma-separated speakers
     topic = db.Column(db.String(200))
     meeting_id = db.Column(db.Integer, db.ForeignKey('meeting.id'), nullable=True)
+    duplicate_of = db.Column(db.Integer, db.ForeignKey('conflict.id'), index=True)  # Near-identical conflict from an earlier meeting
+    window_index = db.Column(db.Integer)  # Transcript window it was extracted from (NULL: whole-transcript pass)
+
+class ChangeSequence(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0)
+
+class ChangeTombstone(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    collection = db.Column(db.String(50), nullable=False)  # "meetings" | "tasks" | "conflicts"
+    row_id = db.Column(db.Integer, nullable=False)
+    version = db.Column(db.Integer, nullable=False, index=True)
+
+class WindowExtraction(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    content_hash = db.Column(db.String(64), nullable=False, index=True)  # window_hash of the window's LLM input
+    meeting_id = db.Column(db.Integer, index=True)  # meeting the window was first extracted for
+    window_index = db.Column(db.Integer)
+    tasks = db.Column(db.JSON)  # normalized extracted tasks
+    conflicts = db.Column(db.JSON)  # normalized extracted conflicts
+    summary = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+
+class Job(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)  # "transcribe" | "reprocess"
+    status = db.Column(db.String(20), default="queued", index=True)  # queued | running | succeeded | failed
+    payload = db.Column(db.JSON)
+    result = db.Column(db.JSON)
+    error = db.Column(db.Text)
+    meeting_id = db.Column(db.Integer, index=True)  # no FK: finished jobs must not block meeting deletes
+    attempts = db.Column(db.Integer, nullable=False, default=0)  # leases taken; also the lease fencing token
+    max_attempts = db.Column(db.Integer, nullable=False, default=3)
+    available_at = db.Column(db.Float, index=True)  # epoch seconds; retries are delayed by backoff
+    lease_owner = db.Column(db.String(120))  # worker id holding (or that last held) the lease
+    lease_expires_at = db.Column(db.Float)  # epoch seconds; extended by heartbeats
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
+class LiveSession(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    meeting_id = db.Column(db.Integer, db.ForeignKey('meeting.id'), nullable=False)
+    status = db.Column(db.String(20), default="active")  # active | finalized
+    chunk_count = db.Column(db.Integer, default=0)
+    audio_offset = db.Column(db.Float, default=0.0)  # seconds of audio received so far
+    processed_until = db.Column(db.Float, default=0.0)  # windows before this time are extracted
+    chunk_summaries = db.Column(db.PickleType)  # list of per-window summaries
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    finalized_at = db.Column(db.DateTime)
 
 class MeetingSummary(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -88,51 +186,123 @@ class MeetingSummary(db.Model):
 # -----------------------------
 # Serialization Helpers
 # -----------------------------
-def meeting_to_dict(m):
-    return {
-        "id": m.id,
-        "title": m.title,
-        "summary": m.summary,
-        "date": m.date.isoformat() if m.date else None,
-        "location": m.location,
-        "host": m.host,
-        "presentees": m.presentees,
-        "absentees": m.absentees,
-        "agenda": m.agenda,
-        # NEW FIELDS
-        "start_time": m.start_time,
-        "end_time": m.end_time,
-        "created_at": m.created_at.isoformat() if m.created_at else None,
-        "key_decisions": m.key_decisions if isinstance(m.key_decisions, list) else [],
-        "mom_file_path": m.mom_file_path or None,
-        "speakers": m.speakers or "",
-        "transcript_segments": m.transcript_segments or None,
-    }
-def task_to_dict(t):
-    return {
-        "id": t.id,
-        "person": t.person,
-        "task": t.task,
-        "deadline": t.deadline,
-        "status": t.status,
-        "notes": t.notes,
-        "created_at": t.created_at.isoformat() if t.created_at else None,
-        "meeting_id": t.meeting_id,
-        "speaker_id": t.speaker_id
-    }
-def conflict_to_dict(c):
-    return {
-        "id": c.id,
-        "issue": c.issue,
-        "raised_by": c.raised_by,
-        "resolution": c.resolution,
-        "severity": c.severity,
-        "created_at": c.created_at.isoformat() if c.created_at else None,
-        "stance": c.stance or "",
-        "participants": c.participants or "",
-        "topic": c.topic or "",
-        "meeting_id": c.meeting_id
-    }
+def segments_or_none(value):
+    return segments_as_dicts(value) or None
+
+MEETING_SCHEMA = Schema(
+    Field("id"),
+    Field("title"),
+    Field("summary"),
+    iso("date"),
+    Field("location"),
+    Field("host"),
+    Field("presentees"),
+    Field("absentees"),
+    Field("agenda"),
+    # NEW FIELDS
+    Field("start_time"),
+    Field("end_time"),
+    iso("created_at"),
+    Field("key_decisions", convert=list_or_empty),
+    Field("mom_file_path", convert=or_none),
+    Field("speakers", convert=or_empty),
+    Field("transcript_segments", convert=segments_or_none),
+    Field("version"),
+)
+TASK_SCHEMA = Schema(
+    Field("id"),
+    Field("person"),
+    Field("task"),
+    Field("deadline"),
+    Field("status"),
+    Field("notes"),
+    iso("created_at"),
+    Field("meeting_id"),
+    Field("speaker_id"),
+    Field("duplicate_of"),
+    Field("version"),
+)
+CONFLICT_SCHEMA = Schema(
+    Field("id"),
+    Field("issue"),
+    Field("raised_by"),
+    Field("resolution"),
+    Field("severity"),
+    iso("created_at"),
+    Field("stance", convert=or_empty),
+    Field("participants", convert=or_empty),
+    Field("topic", convert=or_empty),
+    Field("meeting_id"),
+    Field("duplicate_of"),
+    Field("version"),
+)
+JOB_SCHEMA = Schema(
+    Field("id"),
+    Field("kind"),
+    Field("status"),
+    Field("meeting_id"),
+    Field("attempts"),
+    Field("max_attempts"),
+    Field("error"),
+    Field("result"),
+    Field("lease_owner"),
+    iso("created_at"),
+    iso("started_at"),
+    iso("finished_at"),
+)
+meeting_to_dict = MEETING_SCHEMA.to_dict
+task_to_dict = TASK_SCHEMA.to_dict
+conflict_to_dict = CONFLICT_SCHEMA.to_dict
+job_to_dict = JOB_SCHEMA.to_dict
+
+# Change feed: rows carry the version of their last write; see utils.change_feed
+CHANGES = ChangeFeed(ChangeSequence, ChangeTombstone)
+CHANGES.track("meetings", Meeting, MEETING_SCHEMA)
+CHANGES.track("tasks", Task, TASK_SCHEMA)
+CHANGES.track("conflicts", Conflict, CONFLICT_SCHEMA)
+
+# Pipeline jobs drained by `python main.py worker` processes; see utils.job_queue
+JOBS = JobQueue(Job)
+# "queue": upload/reprocess endpoints enqueue by default (?async=0 runs inline)
+PIPELINE_MODE = os.environ.get("MOM_PIPELINE_MODE", "inline").lower()
+# Audio for queued transcribe jobs; must be storage every worker host can read
+JOB_SPOOL_DIR = os.environ.get("MOM_JOB_SPOOL_DIR", os.path.join(SPOOL_DIR, "jobs"))
+os.makedirs(JOB_SPOOL_DIR, exist_ok=True)
+CHANGES.install(db.session)
+CHANGE_VERSION_HEADER = "X-Change-Version"
+
+# Lists longer than this are streamed instead of encoded in one buffer
+STREAM_MIN_ROWS = int(os.environ.get("MOM_STREAM_MIN_ROWS", "5000"))
+
+def json_rows_response(model, schema, *order_by):
+    """
+    Select only the schema's columns as tuples and encode them directly to
+    JSON bytes; very long lists are streamed in chunks. The change-feed
+    version read first goes out as X-Change-Version, the `since` for the
+    client's next delta request.
+    """
+    version = CHANGES.current_version(db.session)
+    query = db.session.query(*schema.columns(model)).order_by(*order_by)
+    if query.order_by(None).count() > STREAM_MIN_ROWS:
+        response = Response(schema.stream_rows(query.yield_per(1000)), mimetype="application/json")
+    else:
+        response = Response(schema.dumps_rows(query.all()), mimetype="application/json")
+    response.headers[CHANGE_VERSION_HEADER] = str(version)
+    return response
+
+def list_or_changes_response(name, *order_by):
+    """Full list, or only what changed after ?since=<version>."""
+    since = request.args.get("since", type=int)
+    if since is not None:
+        return changes_response(since, [name])
+    model, schema = CHANGES.collections[name]
+    return json_rows_response(model, schema, *order_by)
+
+def changes_response(since, names):
+    payload = CHANGES.changes_since(db.session, since, names)
+    response = Response(dumps(payload), mimetype="application/json")
+    response.headers[CHANGE_VERSION_HEADER] = str(payload["version"])
+    return response
 
 # -----------------------------
 # Utility: Robust JSON parsing and extraction helpers
@@ -162,67 +332,31 @@ def safe_json_parse(text):
                 except Exception:
                     return None
         return None
-def parse_deadline(deadline_str: str) -> str:
-    """Convert natural-language deadline into ISO date string."""
-    if not deadline_str:
-        return ""
-    dt = dateparser.parse(deadline_str, settings={'PREFER_DATES_FROM': 'future'})
-    return dt.date().isoformat() if dt else deadline_str
-def extract_tasks_from_transcript_regex(transcript):
+def parse_deadline(deadline_str: str, anchor=None) -> str:
+    """
+    Convert natural-language deadline into ISO date string.
+    Relative phrases resolve against `anchor` (the meeting date), not the server clock.
+    """
+    return DEADLINES.normalize(deadline_str, anchor)
+def parse_meeting_date(value, default=None):
+    """Parse a YYYY-MM-DD meeting date, returning `default` when missing/invalid."""
+    if isinstance(value, date):
+        return value
+    if value:
+        try:
+            return datetime.strptime(value, "%Y-%m-%d").date()
+        except Exception:
+            pass
+    return default
+def extract_tasks_from_transcript_regex(transcript, meeting_date=None):
     """
     A heuristic fallback that scans the transcript for lines like:
     - 'John: I'll take X by Friday.'
     - 'Assign John to prepare the report by Oct 20.'
     Returns a list of dicts with keys: task_name, assigned_to, due_date, status
+    (see utils.task_extraction for the precompiled single-pass scanner)
     """
-    tasks = []
-    # Pattern 1: "Name: ... (I'll|I will|I'll) <task> (by <deadline>)"
-    pattern1 = re.compile(r'(?P<speaker>[A-Z][a-z]+):\s*(?:(?:I will|I\'ll|I am going to|I’ll)\s*)(?P<task>.*?)(?:\s+by\s+(?P<deadline>[\w\s\d,/-]+))?[.\n]', re.IGNORECASE)
-    for m in pattern1.finditer(transcript + "\n"):
-        speaker = m.group('speaker').strip()
-        task_text = m.group('task').strip().rstrip('.')
-        deadline = (m.group('deadline') or "").strip()
-        if task_text:
-            tasks.append({
-                "task_name": task_text,
-                "assigned_to": speaker,
-                "due_date": parse_deadline(deadline) if deadline else "",
-                "status": "pending"
-            })
-    # Pattern 2: "Assign <Name> to <task> (by <deadline>)"
-    pattern2 = re.compile(r'assign(?:ed)?\s+(?:to\s+)?(?P<name>[A-Z][a-z]+)\s+(?:to\s+)?(?P<task>.*?)(?:\s+by\s+(?P<deadline>[\w\s\d,/-]+))?[.\n]', re.IGNORECASE)
-    for m in pattern2.finditer(transcript + "\n"):
-        name = m.group('name').strip()
-        task_text = m.group('task').strip().rstrip('.')
-        deadline = (m.group('deadline') or "").strip()
-        if task_text:
-            tasks.append({
-                "task_name": task_text,
-                "assigned_to": name,
-                "due_date": parse_deadline(deadline) if deadline else "",
-                "status": "pending"
-            })
-    # Pattern 3: "Can you <task>, <Name>?" or "<Name>, can you <task>?"
-    pattern3 = re.compile(r'(?:(?P<name1>[A-Z][a-z]+),\s*can you\s*(?P<task1>.*?)[.\n])|(?:(?:can you)\s*(?P<task2>.*?)\s*,\s*(?P<name2>[A-Z][a-z]+)[.\n])', re.IGNORECASE)
-    for m in pattern3.finditer(transcript + "\n"):
-        name = (m.group('name1') or m.group('name2') or "").strip()
-        task_text = (m.group('task1') or m.group('task2') or "").strip().rstrip('.')
-        if task_text and name:
-            tasks.append({
-                "task_name": task_text,
-                "assigned_to": name,
-                "due_date": "",
-                "status": "pending"
-            })
-    # deduplicate by (assigned_to, task_name)
-    seen = set()
-    deduped = []
-    for t in tasks:
-        key = (t.get("assigned_to", "").lower(), t.get("task_name", "").lower())
-        if key not in seen:
-            deduped.append(t)
-            seen.add(key)
-    return deduped
+    return extract_tasks_regex(transcript, deadline_parser=lambda d: parse_deadline(d, meeting_date))
 
 # -----------------------------
 # API Blueprint & AI Models
@@ -235,6 +369,15 @@ _phi3_model = None
 # ============================================================
 #  FAST & WINDOWS-SAFE TRANSCRIPTION USING FASTER-WHISPER
 # ============================================================
+def asr_settings():
+    """Faster-Whisper settings: defaults, overridden by the tuned runtime profile."""
+    return runtime_profile.asr_settings({
+        "compute_type": "int8",
+        "cpu_threads": 0,  # 0 = CTranslate2 default
+        "num_workers": 1,
+        "beam_size": 5,
+    })
+
 def get_faster_whisper_model():
     """Load Faster-Whisper ASR model once and reuse it."""
     global _faster_whisper_model
@@ -245,29 +388,36 @@ def get_faster_whisper_model():
             os.path.dirname(__file__),
             "models", "MinuteMind", "faster-whisper"
         )
-        print(f"Loading Faster-Whisper model from: {model_dir}")
+        settings = asr_settings()
+        log.info("Loading Faster-Whisper model", extra={"model_dir": model_dir, "settings": settings})
         _faster_whisper_model = WhisperModel(
             model_dir,
             device="cpu",          # ALWAYS works on Windows
-            compute_type="int8"    # Fast + memory efficient
+            compute_type=settings["compute_type"],  # int8 unless tuned: fast + memory efficient
+            cpu_threads=settings["cpu_threads"],
+            num_workers=settings["num_workers"]
         )
-        print("Faster-Whisper model loaded.")
+        log.info("Faster-Whisper model loaded")
     return _faster_whisper_model
 
-def transcribe_audio_faster_whisper(audio_path):
+def transcribe_audio_faster_whisper(audio, time_offset=0.0):
     """
     Transcribe audio using Faster-Whisper.
     - No diarization
     - No WhisperX
-    - Returns segments with timestamps
+    - Accepts a file path or pre-processed 16 kHz mono PCM
+    - Returns segments with timestamps (shifted by `time_offset` seconds)
     - Fully Windows compatible
     """
+    if not isinstance(audio, str) and len(audio) == 0:
+        return {"segments": [], "full_text": "", "duration": 0.0}
     try:
         model = get_faster_whisper_model()
-        print("Transcribing audio with Faster-Whisper...")
+        log.info("Transcribing audio with Faster-Whisper")
+        asr_start = time.perf_counter()
         segments_iter, info = model.transcribe(
-            audio_path,
-            beam_size=5,
+            audio,
+            beam_size=asr_settings()["beam_size"],
             vad_filter=True,           # Helps segment clarity
             vad_parameters={"min_silence_duration_ms": 500}
         )
@@ -275,70 +425,240 @@ def transcribe_audio_faster_whisper(audio_path):
         full_text = ""
         for seg in segments_iter:
             data = {
-                "start": round(float(seg.start), 3),
-                "end": round(float(seg.end), 3),
+                "start": round(float(seg.start) + time_offset, 3),
+                "end": round(float(seg.end) + time_offset, 3),
                 "speaker": "UNKNOWN",      # No diarization in Windows
                 "text": seg.text.strip()
             }
             full_text += seg.text.strip() + " "
             final_segments.append(data)
+        audio_seconds = float(getattr(info, "duration", 0.0) or 0.0)
+        asr_seconds = time.perf_counter() - asr_start
+        if audio_seconds > 0:
+            metrics.ASR_RTF.observe(asr_seconds / audio_seconds)
+            metrics.ASR_AUDIO_SECONDS.inc(audio_seconds)
+        log.info("Transcription finished", extra={
+            "audio_seconds": round(audio_seconds, 2),
+            "asr_seconds": round(asr_seconds, 2),
+            "segments": len(final_segments)
+        })
         return {
             "segments": final_segments,
-            "full_text": full_text.strip()
+            "full_text": full_text.strip(),
+            "duration": audio_seconds
         }
-    except Exception as e:
-        print(f"Faster-Whisper transcription error: {e}")
-        traceback.print_exc()
+    except Exception:
+        log.exception("Faster-Whisper transcription error")
         raise
 
 # ============================================================
 #   LLM (Phi-3) MODEL LOADER
 # ============================================================
+LLM_POOL_SIZE = int(os.environ.get("MOM_LLM_POOL_SIZE", "1"))
+# Prompt-lookup speculative decoding per call site ("extraction", "summarization",
+# "all" or site names such as "tasks,conflicts"); off when empty
+SPECULATIVE = SpeculativeDecoding(
+    parse_sites(os.environ.get("MOM_SPECULATIVE_SITES", "")),
+    site_fn=metrics.current_llm_site,
+    num_pred_tokens=int(os.environ.get("MOM_SPECULATIVE_TOKENS", "10")),
+)
+
+def llm_settings():
+    """
+    llama-cpp settings: defaults, overridden by the tuned runtime profile.
+    Tuned thread counts are for the whole host, so they are split between
+    the pooled instances like the default.
+    """
+    settings = runtime_profile.llm_settings({
+        "model_file": "phi3-finetuned-Q4_K_M.gguf",
+        "n_ctx": 4096,
+        "n_threads": None,
+        "n_threads_batch": None,  # None = llama-cpp default
+        "n_batch": 512,
+    })
+    # Split the cores between pooled instances
+    if settings["n_threads"] is None:
+        settings["n_threads"] = max(4, (os.cpu_count() or 4) // LLM_POOL_SIZE)
+    else:
+        settings["n_threads"] = max(1, settings["n_threads"] // LLM_POOL_SIZE)
+    if settings["n_threads_batch"]:
+        settings["n_threads_batch"] = max(1, settings["n_threads_batch"] // LLM_POOL_SIZE)
+    return settings
+
+def load_phi3_instance():
+    """Load one Phi-3 LLaMA instance (called by the inference pool)."""
+    if Llama is None:
+        raise RuntimeError("llama-cpp-python is not installed.")
+    settings = llm_settings()
+    gguf_path = os.path.join(
+        os.path.dirname(__file__),
+        "models",
+        os.path.basename(settings["model_file"])
+    )
+    if not os.path.exists(gguf_path):
+        raise RuntimeError(f"Phi-3 GGUF model not found at: {gguf_path}")
+    log.info("Loading Phi-3 model", extra={"model_path": gguf_path, "settings": settings})
+    instance = Llama(
+        model_path=gguf_path,
+        n_ctx=settings["n_ctx"],
+        n_threads=settings["n_threads"],
+        n_threads_batch=settings["n_threads_batch"],
+        n_batch=settings["n_batch"],
+        # Draft verification needs logits for every position
+        logits_all=SPECULATIVE.enabled,
+        verbose=False
+    )
+    log.info("Phi-3 model loaded successfully")
+    return instance
+
 def get_phi3_model():
-    """Load the Phi-3 LLaMA model for summarization + extraction."""
+    """
+    Return the Phi-3 model for summarization + extraction.
+    Calls are leased from an inference pool of MOM_LLM_POOL_SIZE instances,
+    so concurrent pipeline stages never share a llama-cpp context.
+    """
     global _phi3_model
     if _phi3_model is None:
-        if Llama is None:
-            raise RuntimeError("llama-cpp-python is not installed.")
-        gguf_path = os.path.join(
-            os.path.dirname(__file__),
-            "models",
-            "phi3-finetuned-Q4_K_M.gguf"
-        )
-        if not os.path.exists(gguf_path):
-            raise RuntimeError(f"Phi-3 GGUF model not found at: {gguf_path}")
-        print(f"Loading Phi-3 model from {gguf_path} ...")
-        _phi3_model = Llama(
-            model_path=gguf_path,
-            n_ctx=4096,
-            n_threads=max(4, os.cpu_count() or 4),
-            verbose=False
-        )
-        print("Phi-3 model loaded successfully.")
+        pool = InferencePool(load_phi3_instance, size=LLM_POOL_SIZE)
+        pool.warm()
+        _phi3_model = PooledLLM(pool, observer=observe_llm_call, speculative=SPECULATIVE)
     return _phi3_model
 
+def observe_llm_call(response, seconds):
+    site = metrics.current_llm_site()
+    metrics.observe_llm_call(response, seconds, site)
+    request_profiler.record_llm_call(response, seconds, site)
+
+def observe_pipeline(pipeline, run):
+    """Export a StageRun to the metrics registry and any active request profile."""
+    metrics.observe_stage_run(pipeline, run)
+    request_profiler.record_stage_run(pipeline, run)
+
+def _llm_pool_gauge(attr):
+    def read():
+        if _phi3_model is None:
+            return {}
+        return {(): getattr(_phi3_model.pool, attr)}
+    return read
+
+def _deadline_cache_gauge():
+    info = DEADLINES.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        ("hits",): info.hits,
+        ("misses",): info.misses,
+        ("hit_ratio",): (info.hits / lookups) if lookups else 0.0,
+    }
+
+metrics.REGISTRY.gauge("mom_llm_pool_waiting", "Callers waiting for an LLM instance.",
+                       callback=_llm_pool_gauge("waiting"))
+metrics.REGISTRY.gauge("mom_llm_pool_in_use", "LLM instances currently leased.",
+                       callback=_llm_pool_gauge("in_use"))
+metrics.REGISTRY.gauge("mom_deadline_cache", "Deadline normalizer cache statistics.", ("stat",),
+                       callback=_deadline_cache_gauge)
+
 # -----------------------------
 # AI Endpoints
 # -----------------------------
+def spool_request_audio():
+    """
+    Spool the request's "audio" part to disk (hashed) and pre-process it once
+    into trimmed, memory-mapped 16 kHz mono PCM.
+    """
+    if "audio" not in request.files:
+        raise UploadRejected("audio file missing")
+    upload = spool_upload(request.files["audio"])
+    try:
+        prepared = prepare_upload(upload)
+    except Exception:
+        upload.remove()
+        raise
+    return upload, prepared
+
+def prepare_upload(upload):
+    from utils.audio_preprocess import preprocess_audio
+    check_audio_duration(upload.path)
+    return preprocess_audio(upload.path, upload.sha256)
+
+@app.teardown_request
+def cleanup_spooled_uploads(exc=None):
+    if isinstance(request, SpoolingRequest):
+        request.cleanup_spool_files()
+
+@app.before_request
+def start_request_timer():
+    g.request_id = new_request_id(request.headers.get(REQUEST_ID_HEADER))
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def compress_large_responses(response):
+    # Registered first so it runs last, after hooks that read the body
+    return compress_response(response)
+
+@app.after_request
+def record_request_metrics(response):
+    response.headers[REQUEST_ID_HEADER] = g.get("request_id", "")
+    start = g.get("request_start")
+    if start is not None:
+        endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+        elapsed = time.perf_counter() - start
+        metrics.HTTP_SECONDS.observe(
+            elapsed, endpoint=endpoint, method=request.method, status=response.status_code
+        )
+        log.info("request", extra={
+            "method": request.method, "path": request.path,
+            "status": response.status_code, "duration_ms": round(elapsed * 1000, 1)
+        })
+    return response
+
+@app.before_request
+def start_request_profile():
+    if request_profiler.should_profile(
+        request.headers, app.config['PROFILE_REQUESTS'], app.config['PROFILE_ALLOW_HEADER'] and is_admin()
+    ):
+        g.profile_token = request_profiler.start(g.request_id, request.method, request.path, db.engine)
+
+def finish_request_profile(status, response=None):
+    token = g.pop("profile_token", None)
+    if token is None:
+        return None
+    meeting_id = (request.view_args or {}).get("meeting_id")
+    if meeting_id is None and response is not None and not response.is_streamed and response.is_json:
+        body = response.get_json(silent=True)
+        if isinstance(body, dict):
+            meeting_id = body.get("meeting_id")
+    try:
+        return request_profiler.finish(token, status, meeting_id)
+    except Exception as e:
+        log.warning("Could not write request profile", extra={"error": str(e)})
+        return None
+
+@app.after_request
+def store_request_profile(response):
+    profile_id = finish_request_profile(response.status_code, response)
+    if profile_id:
+        response.headers[request_profiler.PROFILE_ID_HEADER] = profile_id
+    return response
+
+@app.teardown_request
+def discard_request_profile(exc=None):
+    # Unhandled errors skip after_request; still stop the profiler
+    if "profile_token" in g:
+        finish_request_profile(500)
+
+@app.errorhandler(RequestEntityTooLarge)
+@app.errorhandler(UnsupportedMediaType)
+def upload_limit_error(e):
+    return jsonify({"error": e.description}), e.code
+
 @api_bp.route("/transcribe", methods=["POST"])
 def transcribe_audio():
-    audio_path = None
+    upload = None
     try:
-        if "audio" not in request.files:
-            return jsonify({"error": "audio file missing"}), 400
-        audio_file = request.files["audio"]
-        if not audio_file.filename:
-            return jsonify({"error": "empty filename"}), 400
-        # Save uploaded file to a temp location
-        with NamedTemporaryFile(
-            delete=False,
-            suffix=os.path.splitext(secure_filename(audio_file.filename))[1]
-        ) as tmp:
-            audio_path = tmp.name
-            audio_file.save(audio_path)
-        print("Starting Faster-Whisper transcription...")
+        upload, prepared = spool_request_audio()
+        log.info("Starting Faster-Whisper transcription")
         # 👉 NEW: Use Faster-Whisper instead of WhisperX
-        result = transcribe_audio_faster_whisper(audio_path)
+        result = transcribe_audio_faster_whisper(prepared.pcm(), time_offset=prepared.offset)
         # Temporal normalization (same as before)
         from utils.temporal_normalization import normalize_temporal_segments
         normalized_segments = normalize_temporal_segments(
@@ -349,36 +669,82 @@ def transcribe_audio():
         unique_speakers = list(
             set(seg.get("speaker", "UNKNOWN") for seg in normalized_segments)
         )
-        print(
-            f"Transcription complete. Segments={len(normalized_segments)}, "
-            f"Speakers={len(unique_speakers)}"
-        )
+        log.info("Transcription complete", extra={
+            "segments": len(normalized_segments), "speakers": len(unique_speakers)
+        })
         return jsonify({
             "segments": normalized_segments,
             "full_text": result["full_text"],
-            "speakers": unique_speakers
+            "speakers": unique_speakers,
+            "audio_sha256": upload.sha256
         })
+    except UploadRejected as e:
+        return jsonify({"error": str(e)}), e.status_code
     except Exception as e:
-        print(f"Transcription error: {str(e)}")
-        traceback.print_exc()
+        log.exception("Transcription error")
         return jsonify({"error": str(e)}), 500
     finally:
-        if audio_path and os.path.exists(audio_path):
-            try:
-                os.remove(audio_path)
-            except Exception:
-                pass
+        if upload:
+            upload.remove()
 
 # -----------------------------
 # Internal helper function for transcript processing
 # -----------------------------
-def process_transcript_internal(transcript, llm):
-    """Internal function to process transcript and extract tasks/conflicts."""
+def extract_llm_text(llm_out):
+    """Normalize the different llama-cpp return shapes into plain text."""
+    if not llm_out:
+        return ""
+    if isinstance(llm_out, dict):
+        if "choices" in llm_out and llm_out["choices"]:
+            return (llm_out["choices"][0].get("text") or "").strip()
+        if "text" in llm_out:
+            return (llm_out["text"] or "").strip()
+        return ""
+    if hasattr(llm_out, "text"):
+        return str(llm_out.text).strip()
+    if isinstance(llm_out, str):
+        return llm_out.strip()
+    return str(llm_out)
+
+def complete_json_array(llm, prompt, max_tokens, temperature, on_item=None):
+    """
+    Run a completion that should produce a JSON array and return
+    (list or None, raw text). With a streaming-capable llm (PooledLLM) the
+    output goes through an incremental parser: `on_item(item)` sees each
+    element as soon as it closes, and generation is cancelled when the
+    top-level array closes, so latency follows the useful output rather than
+    max_tokens of trailing commentary. Output that never closes an array
+    (non-JSON, or cut off at max_tokens) falls back to safe_json_parse.
+    """
+    on_item = on_item or (lambda item: None)
+    stream = getattr(llm, "stream", None)
+    if stream is not None:
+        parser = JsonArrayStream()
+        chunks = stream(prompt, max_tokens=max_tokens, temperature=temperature)
+        try:
+            for chunk in chunks:
+                for item in parser.feed(chunk["choices"][0].get("text") or ""):
+                    on_item(item)
+                if parser.done:
+                    break
+        finally:
+            chunks.close()
+        raw_text = parser.text.strip()
+        # A closed array, or the elements that completed before max_tokens cut it off
+        if parser.is_array and (parser.done or parser.items):
+            return parser.items, raw_text
+    else:
+        raw_text = extract_llm_text(llm(prompt=prompt, max_tokens=max_tokens, temperature=temperature))
+    parsed = safe_json_parse(raw_text)
+    items = parsed if isinstance(parsed, list) else None
+    for item in items or ():
+        on_item(item)
+    return items, raw_text
+
+def extract_tasks_internal(transcript, llm, meeting_date=None):
+    """Run the task-extraction prompt and return normalized task dicts."""
     tasks = []
-    conflicts = []
-    try:
-        # Task extraction
-        task_prompt = f"""
+    task_prompt = f"""
 You are an AI assistant specialized in extracting ACTIONABLE TASKS from meeting transcripts.
 Extract every task that was assigned or volunteered during the meeting. For each task provide:
 - task_name : short description of the action to be taken
@@ -395,30 +761,31 @@ IMPORTANT: Output MUST be valid JSON array only (no extra commentary). Example o
 Transcript:
 {transcript}
 """
-        response = llm(prompt=task_prompt, max_tokens=1024, temperature=0.2)
-        raw_text = ""
-        if isinstance(response, dict):
-            raw_text = response.get("choices", [{}])[0].get("text", "") if response.get("choices") else response.get("text", "") or ""
-        elif isinstance(response, str):
-            raw_text = response
-        raw_text = (raw_text or "").strip()
-        parsed = safe_json_parse(raw_text)
-        if parsed and isinstance(parsed, list):
-            for item in parsed:
-                if isinstance(item, dict):
-                    task_name = item.get("task_name") or item.get("task") or ""
-                    assigned_to = item.get("assigned_to") or item.get("assignee") or ""
-                    due_date = item.get("due_date") or ""
-                    status = item.get("status") or "pending"
-                    if task_name:
-                        tasks.append({
-                            "task_name": task_name.strip(),
-                            "assigned_to": assigned_to.strip(),
-                            "due_date": parse_deadline(due_date) if due_date else "",
-                            "status": status.strip()
-                        })
-        # Conflict extraction with stance analysis
-        conflict_prompt = f"""
+    parsed, _ = complete_json_array(llm, task_prompt, max_tokens=1024, temperature=0.2)
+    if parsed and isinstance(parsed, list):
+        for item in parsed:
+            if isinstance(item, dict):
+                task_name = item.get("task_name") or item.get("task") or ""
+                assigned_to = item.get("assigned_to") or item.get("assignee") or ""
+                due_date = item.get("due_date") or ""
+                status = item.get("status") or "pending"
+                if task_name:
+                    tasks.append({
+                        "task_name": task_name.strip(),
+                        "assigned_to": assigned_to.strip(),
+                        "due_date": due_date,
+                        "status": status.strip()
+                    })
+    # Batch deadline normalization: each distinct phrase is parsed once
+    with metrics.STAGE_SECONDS.time(pipeline="extraction", stage="deadlines"):
+        due_dates = DEADLINES.normalize_many([t["due_date"] for t in tasks], meeting_date)
+    for t, due in zip(tasks, due_dates):
+        t["due_date"] = due
+    return tasks
+
+def extract_conflicts_internal(transcript, llm):
+    """Run the stance-analysis conflict prompt and return the parsed list."""
+    conflict_prompt = f"""
 Analyze this meeting transcript for conflicts/disagreements using stance analysis.
 
 For each conflict provide:
@@ -444,20 +811,346 @@ Return STRICT JSON array:
 Transcript:
 {transcript}
 """
-        response_conflict = llm(prompt=conflict_prompt, max_tokens=1024, temperature=0.3)
-        raw_conflict_text = ""
-        if isinstance(response_conflict, dict):
-            raw_conflict_text = response_conflict.get("choices", [{}])[0].get("text", "") if response_conflict.get("choices") else response_conflict.get("text", "") or ""
-        elif isinstance(response_conflict, str):
-            raw_conflict_text = response_conflict
-        raw_conflict_text = (raw_conflict_text or "").strip()
-        parsed_conflicts = safe_json_parse(raw_conflict_text)
-        if isinstance(parsed_conflicts, list):
-            conflicts = parsed_conflicts
+    parsed_conflicts, _ = complete_json_array(llm, conflict_prompt, max_tokens=1024, temperature=0.3)
+    return parsed_conflicts if isinstance(parsed_conflicts, list) else []
+
+def process_transcript_internal(transcript, llm, meeting_date=None):
+    """Internal function to process transcript and extract tasks/conflicts."""
+    run = run_llm_stages(transcript, llm, meeting_date, stages=("tasks", "conflicts"), normalize=False)
+    return {"tasks": run.results.get("tasks", []), "conflicts": run.results.get("conflicts", [])}
+
+def normalize_extracted_tasks(extracted_tasks):
+    """Coerce extracted tasks into the shape stored on Task rows."""
+    normalized_tasks = []
+    for t in extracted_tasks:
+        normalized_tasks.append({
+            "task_name": t.get("task_name") or t.get("task") or "",
+            "assigned_to": t.get("assigned_to") or "",
+            "due_date": t.get("due_date") or "",
+            "status": t.get("status", "Pending")
+        })
+    return [t for t in normalized_tasks if t["task_name"]]
+
+def normalize_extracted_conflicts(extracted_conflicts):
+    """Coerce extracted conflicts into the shape stored on Conflict rows."""
+    normalized_conflicts = []
+    for c in extracted_conflicts:
+        if not isinstance(c, dict):
+            continue
+        participants = c.get("participants", [])
+        normalized_conflicts.append({
+            "issue": c.get("issue", ""),
+            "raised_by": c.get("raised_by", ""),
+            "participants": participants if isinstance(participants, list) else [str(participants)],
+            "severity": c.get("severity", "Medium"),
+            "resolution": c.get("resolution", ""),
+            "stance": c.get("stance", ""),
+            "topic": c.get("topic", "")
+        })
+    return normalized_conflicts
+
+def build_speaker_transcript(segments, full_transcript=""):
+    """
+    Build the "SPEAKER: text" transcript fed to the LLM.
+    Falls back to the plain transcript when diarization produced no speakers.
+    """
+    segments = segments or []
+    speaker_transcript = "\n".join([
+        f"{seg.get('speaker')}: {seg.get('text')}" for seg in segments if seg.get("text")
+    ])
+    if not full_transcript:
+        full_transcript = " ".join(seg.get("text", "") for seg in segments if seg.get("text")).strip()
+    # If all speakers are UNKNOWN → force fallback
+    if all(seg.get("speaker") == "UNKNOWN" for seg in segments):
+        speaker_transcript = full_transcript
+    # If speaker transcript is empty, fallback before extraction
+    if not speaker_transcript.strip():
+        speaker_transcript = full_transcript or ""
+    return speaker_transcript, full_transcript
+
+SUMMARY_CHUNK_CHARS = 1200  # safe for Q4 model
+
+def summary_chunks(transcript):
+    return [transcript[i:i+SUMMARY_CHUNK_CHARS] for i in range(0, len(transcript), SUMMARY_CHUNK_CHARS)]
+
+def summary_prompt(chunk):
+    return f"""
+        Summarize this part of the meeting into 2 concise sentences:
+        {chunk}
+        """
+
+def summarize_transcript_internal(transcript, llm):
+    """Chunked Phi-3 summarization; returns the merged chunk summaries."""
+    chunk_summaries = []
+    for chunk in summary_chunks(transcript):
+        prompt = summary_prompt(chunk)
+        try:
+            out = llm(prompt=prompt, max_tokens=180, temperature=0.3)
+            part_summary = extract_llm_text(out)
+            if part_summary:
+                chunk_summaries.append(part_summary)
+        except Exception as e:
+            log.warning("Chunk summary failed", extra={"error": str(e)})
+    return " ".join(chunk_summaries).strip()
+
+def stream_transcript_summary(transcript, llm):
+    """
+    Token-streaming variant of summarize_transcript_internal: yields
+    (chunk_index, text) as the model writes. Closing the generator closes the
+    current llama-cpp stream, which stops generation and releases the instance.
+    """
+    stream = getattr(llm, "stream", None)
+    for index, chunk in enumerate(summary_chunks(transcript)):
+        prompt = summary_prompt(chunk)
+        try:
+            if stream is None:
+                yield index, extract_llm_text(llm(prompt=prompt, max_tokens=180, temperature=0.3))
+                continue
+            pieces = stream(prompt, max_tokens=180, temperature=0.3)
+            try:
+                for piece in pieces:
+                    text = piece["choices"][0].get("text")
+                    if text:
+                        yield index, text
+            finally:
+                pieces.close()
+        except Exception as e:
+            log.warning("Chunk summary failed", extra={"error": str(e)})
+
+def fallback_summary(full_transcript, tasks, conflicts):
+    """Summary used when the LLM returns nothing."""
+    log.info("LLM returned empty summary — building fallback summary")
+    fallback = ""
+    if full_transcript:
+        sentences = re.split(r'(?<=[.!?])\s+', full_transcript.strip())
+        fallback = " ".join(sentences[:4]).strip()
+    if not fallback and tasks:
+        fallback = "Action items assigned: " + ", ".join([t.get("task_name","") for t in tasks[:3]])
+    if not fallback and conflicts:
+        fallback = "Conflicts were raised regarding " + ", ".join([c.get("issue","") for c in conflicts[:3]])
+    if not fallback:
+        fallback = "Summary unavailable — transcript and extracted content are attached."
+    return fallback
+
+def run_llm_stages(transcript, llm, meeting_date=None, stages=("tasks", "conflicts", "summary"),
+                   run=None, normalize=True):
+    """
+    Run the independent LLM stages (tasks, conflicts, summary) concurrently
+    through the stage DAG. Each stage only needs the transcript, so they fan out
+    across the inference pool; results land in `run.results` with timings.
+    Stages that raised get an empty result and are listed in run.results["failed"].
+    """
+    failed = []
+
+    def guarded(stage_name, fn):
+        def stage(_deps):
+            try:
+                with metrics.llm_site(stage_name):
+                    return fn()
+            except Exception:
+                log.exception("LLM stage failed", extra={"stage": stage_name})
+                failed.append(stage_name)
+                return "" if stage_name == "summary" else []
+        return stage
+
+    graph = StageGraph()
+    if "tasks" in stages:
+        def tasks_stage():
+            tasks = extract_tasks_internal(transcript, llm, meeting_date)
+            return normalize_extracted_tasks(tasks) if normalize else tasks
+        graph.add("tasks", guarded("tasks", tasks_stage))
+    if "conflicts" in stages:
+        def conflicts_stage():
+            conflicts = extract_conflicts_internal(transcript, llm)
+            return normalize_extracted_conflicts(conflicts) if normalize else conflicts
+        graph.add("conflicts", guarded("conflicts", conflicts_stage))
+    if "summary" in stages:
+        graph.add("summary", guarded("summary", lambda: summarize_transcript_internal(transcript, llm)))
+    run = graph.run(run=run)
+    run.results["failed"] = failed
+    return run
+
+def save_meeting_tasks(meeting, tasks):
+    """Add normalized tasks to the session linked to `meeting` (caller commits)."""
+    saved_tasks = [
+        Task(
+            person=t["assigned_to"],
+            task=t["task_name"],
+            deadline=t["due_date"],
+            status=t["status"],
+            notes="",
+            meeting_id=meeting.id
+        )
+        for t in tasks
+    ]
+    saved_tasks = mark_near_duplicates("tasks", saved_tasks)
+    db.session.add_all(saved_tasks)
+    return saved_tasks
+
+def save_meeting_conflicts(meeting, conflicts):
+    """Add normalized conflicts to the session linked to `meeting` (caller commits)."""
+    saved_conflicts = [
+        Conflict(
+            issue=c["issue"],
+            raised_by=c["raised_by"],
+            severity=c["severity"],
+            participants=", ".join(str(p) for p in c["participants"]),
+            stance=str(c["stance"]),
+            resolution=c["resolution"],
+            topic=c["topic"],
+            meeting_id=meeting.id
+        )
+        for c in conflicts
+    ]
+    saved_conflicts = mark_near_duplicates("conflicts", saved_conflicts)
+    db.session.add_all(saved_conflicts)
+    return saved_conflicts
+
+# -----------------------------
+# Near-duplicate tasks/conflicts across meetings (see utils.near_duplicates)
+# -----------------------------
+# flag: store the row with duplicate_of set; merge: don't store it; off: no lookups
+DEDUP_MODE = os.environ.get("MOM_DEDUP_MODE", "flag").lower()
+DEDUP_THRESHOLD = float(os.environ.get("MOM_DEDUP_THRESHOLD", "0.6"))
+# collection -> (index, model, text columns, row -> (scope, text))
+DEDUP_INDEXES = {
+    "tasks": (NearDuplicateIndex(DEDUP_THRESHOLD), Task, (Task.person, Task.task),
+              lambda row: (normalize_text(row.person), row.task)),
+    "conflicts": (NearDuplicateIndex(DEDUP_THRESHOLD), Conflict, (Conflict.issue,),
+                  lambda row: ("", row.issue)),
+}
+
+def sync_dedup_index(name):
+    """
+    Catch the in-memory index up with committed rows: everything on first
+    use, then only rows and tombstones after the change-feed version it last
+    saw. Rows already marked as duplicates are left out so every match points
+    at the canonical row.
+    """
+    from sqlalchemy import select
+    index, model, text_columns, key = DEDUP_INDEXES[name]
+    # A separate connection sees committed rows only, never this request's pending ones
+    with db.engine.connect() as conn:
+        current = conn.execute(select(ChangeSequence.value)).scalar() or 0
+        if index.version is not None and current <= index.version:
+            return index
+        query = select(model.id, model.meeting_id, model.duplicate_of, *text_columns)
+        if index.version is not None:
+            query = query.where(model.version > index.version, model.version <= current)
+            tomb = ChangeTombstone
+            for (row_id,) in conn.execute(select(tomb.row_id).where(
+                tomb.collection == name, tomb.version > index.version, tomb.version <= current
+            )):
+                index.remove(row_id)
+        for row in conn.execute(query):
+            if row.duplicate_of is None:
+                index.add(row.id, *key(row), meeting_id=row.meeting_id)
+            else:
+                index.remove(row.id)
+    index.version = max(current, index.version or 0)
+    return index
+
+def delete_meeting_rows(model, meeting_id):
+    """Delete a meeting's tasks/conflicts (caller commits); see delete_rows."""
+    return delete_rows(model, model.meeting_id == meeting_id)
+
+def delete_rows(model, *criteria):
+    """
+    Delete matching tasks/conflicts (caller commits). Duplicates that pointed
+    at a deleted row are re-linked to the oldest of them, which becomes the
+    new canonical row.
+    """
+    doomed = db.session.query(model.id).filter(*criteria)
+    orphans = {}
+    for row_id, target in (
+        db.session.query(model.id, model.duplicate_of)
+        .filter(model.duplicate_of.in_(doomed), ~model.id.in_(doomed))
+        .order_by(model.id)
+    ):
+        orphans.setdefault(target, []).append(row_id)
+    for ids in orphans.values():
+        CHANGES.update_ids(db.session, model, ids[:1], {"duplicate_of": None})
+        CHANGES.update_ids(db.session, model, ids[1:], {"duplicate_of": ids[0]})
+    return CHANGES.delete_where(db.session, model, *criteria)
+
+def mark_near_duplicates(name, rows):
+    """
+    Point new (not yet added) rows at a near-identical row from another
+    meeting via duplicate_of, or drop them in "merge" mode. Returns the rows
+    the caller should add.
+    """
+    if DEDUP_MODE not in ("flag", "merge") or not rows:
+        return rows
+    try:
+        index = sync_dedup_index(name)
     except Exception as e:
-        print(f"Error in process_transcript_internal: {e}")
-        traceback.print_exc()
-    return {"tasks": tasks, "conflicts": conflicts}
+        log.warning("Near-duplicate index unavailable", extra={"error": str(e)})
+        return rows
+    key = DEDUP_INDEXES[name][3]
+    kept = []
+    for row in rows:
+        match = index.best_match(*key(row), exclude_meeting=row.meeting_id)
+        if match is None:
+            kept.append(row)
+            continue
+        metrics.NEAR_DUPLICATES.inc(collection=name, action=DEDUP_MODE)
+        if DEDUP_MODE == "flag":
+            row.duplicate_of = match[0]
+            kept.append(row)
+    if len(kept) < len(rows) or any(r.duplicate_of for r in kept):
+        log.info("Near-duplicates found", extra={
+            "collection": name, "mode": DEDUP_MODE, "rows": len(rows), "kept": len(kept)
+        })
+    return kept
+
+def mom_is_current(meeting, content_hash):
+    return (
+        meeting.mom_content_hash == content_hash
+        and bool(meeting.mom_file_path)
+        and os.path.exists(meeting.mom_file_path)
+    )
+
+def generate_meeting_mom(meeting, force=False):
+    """
+    Render the MoM document from the saved DB values and store its path.
+    Skipped when the meeting, tasks and conflicts hash to the same content as
+    the existing file (unless `force`).
+    """
+    from utils.mom_generator import generate_mom_document, snapshot_mom_inputs, mom_content_hash
+    meeting_tasks = Task.query.filter_by(meeting_id=meeting.id).all()
+    meeting_conflicts = Conflict.query.filter_by(meeting_id=meeting.id).all()
+    content_hash = mom_content_hash(snapshot_mom_inputs(meeting, meeting_tasks, meeting_conflicts))
+    if not force and mom_is_current(meeting, content_hash):
+        return meeting.mom_file_path, meeting_tasks, meeting_conflicts
+    mom_file_path = generate_mom_document(
+        meeting_data=meeting,
+        tasks=meeting_tasks,
+        conflicts=meeting_conflicts,
+        transcript_segments=None  # Only summary is used
+    )
+    meeting.mom_file_path = mom_file_path
+    meeting.mom_content_hash = content_hash
+    db.session.commit()
+    return mom_file_path, meeting_tasks, meeting_conflicts
+
+def mom_download_name(meeting_id, stored_name):
+    """Friendly attachment name for a content-addressed MoM file."""
+    if meeting_id and is_content_addressed(stored_name):
+        return f"MoM_{meeting_id}{os.path.splitext(stored_name)[1]}"
+    return stored_name
+
+def mom_file_info(mom_file_path, meeting_id=None):
+    if not mom_file_path:
+        return None
+    stored_name = os.path.basename(mom_file_path)
+    filename = mom_download_name(meeting_id, stored_name)
+    download_url = f"/api/download/{stored_name}"
+    if filename != stored_name:
+        download_url += f"?name={filename}"
+    return {
+        "filename": filename,
+        "download_url": download_url
+    }
 
 # -----------------------------
 # Process Transcript
@@ -469,9 +1162,12 @@ def process_transcript():
         transcript = data.get("transcript", "")
         if not transcript:
             return jsonify({"error": "No transcript provided"}), 400
+        # Relative deadlines resolve against the meeting date when one is given
+        meeting_date = parse_meeting_date(data.get("meeting_date") or data.get("date"))
         llm = get_phi3_model()
+        run = StageRun()
         # --- Task Extraction ---
-        print("Extracting tasks with Phi-3...")
+        log.info("Extracting tasks with Phi-3")
         # Stronger instruction prompt with examples; ask for strict JSON
         task_prompt = f"""
 You are an AI assistant specialized in extracting ACTIONABLE TASKS from meeting transcripts.
@@ -491,21 +1187,10 @@ Transcript:
 {transcript}
 """
         # Call the model
-        response = llm(prompt=task_prompt, max_tokens=1024, temperature=0.2)
-        raw_text = ""
-        # Llama/other runtimes may return different structures — try to normalize
-        if isinstance(response, dict):
-            raw_text = response.get("choices", [{}])[0].get("text", "") if response.get("choices") else response.get("text", "") or ""
-        elif isinstance(response, str):
-            raw_text = response
-        else:
-            # attempt attribute access
-            raw_text = getattr(response, "text", "") or ""
-        raw_text = (raw_text or "").strip()
-        print("🧠 Raw Phi-3 Task Output (first 1000 chars):")
-        print(raw_text[:1000])
-        # Try robust JSON parse
-        parsed = safe_json_parse(raw_text)
+        # Streamed through the incremental JSON parser; stops once the array closes
+        with run.time("llm_tasks"), metrics.llm_site("tasks"):
+            parsed, raw_text = complete_json_array(llm, task_prompt, max_tokens=1024, temperature=0.2)
+        log.debug("Raw Phi-3 task output", extra={"raw": raw_text[:1000]})
         tasks = []
         if parsed and isinstance(parsed, list):
             # Normalize parsed entries to expected keys
@@ -520,7 +1205,7 @@ Transcript:
                     tasks.append({
                         "task_name": task_name.strip(),
                         "assigned_to": assigned_to.strip() if isinstance(assigned_to, str) else assigned_to,
-                        "due_date": parse_deadline(due_date) if isinstance(due_date, str) else due_date,
+                        "due_date": parse_deadline(due_date, meeting_date) if isinstance(due_date, str) else due_date,
                         "status": status.strip() if isinstance(status, str) else status
                     })
         else:
@@ -548,18 +1233,19 @@ Transcript:
                             tasks.append({
                                 "task_name": task_name.strip(),
                                 "assigned_to": assigned_to.strip() if isinstance(assigned_to, str) else assigned_to,
-                                "due_date": parse_deadline(due_date) if isinstance(due_date, str) else due_date,
+                                "due_date": parse_deadline(due_date, meeting_date) if isinstance(due_date, str) else due_date,
                                 "status": status.strip() if isinstance(status, str) else status
                             })
         # Fallback 2: if still no tasks, use regex heuristics on the transcript
         if not tasks:
-            print("No tasks from LLM JSON parse — trying regex heuristics on transcript.")
-            heuristic_tasks = extract_tasks_from_transcript_regex(transcript)
+            log.info("No tasks from LLM JSON parse — trying regex heuristics on transcript")
+            with run.time("regex_tasks", deps=("llm_tasks",)):
+                heuristic_tasks = extract_tasks_from_transcript_regex(transcript, meeting_date)
             if heuristic_tasks:
                 tasks.extend(heuristic_tasks)
         # Fallback 3: retry LLM with a simplified explicit format request (if still empty)
         if not tasks:
-            print("Retrying LLM with simplified prompt.")
+            log.info("Retrying LLM with simplified prompt")
             retry_prompt = f"""
 List tasks from the transcript. For each line output EXACTLY as CSV:
 task_name ||| assigned_to ||| due_date
@@ -570,14 +1256,15 @@ Transcript:
 Example:
 Prepare quarterly budget ||| Rahul ||| 2025-10-20
 """
-            retry_resp = llm(prompt=retry_prompt, max_tokens=512, temperature=0.1)
+            with run.time("llm_tasks_retry", deps=("llm_tasks",)), metrics.llm_site("tasks_retry"):
+                retry_resp = llm(prompt=retry_prompt, max_tokens=512, temperature=0.1)
             retry_text = ""
             if isinstance(retry_resp, dict):
                 retry_text = retry_resp.get("choices", [{}])[0].get("text", "") if retry_resp.get("choices") else retry_resp.get("text", "") or ""
             elif isinstance(retry_resp, str):
                 retry_text = retry_resp
             retry_text = (retry_text or "").strip()
-            print("Retry raw output:", retry_text[:800])
+            log.debug("Retry raw output", extra={"raw": retry_text[:800]})
             # parse retry CSV-like lines
             for ln in retry_text.splitlines():
                 ln = ln.strip()
@@ -591,12 +1278,13 @@ Prepare quarterly budget ||| Rahul ||| 2025-10-20
                     tasks.append({
                         "task_name": task_name,
                         "assigned_to": assigned_to,
-                        "due_date": parse_deadline(due_date) if due_date else "",
+                        "due_date": parse_deadline(due_date, meeting_date) if due_date else "",
                         "status": "pending"
                     })
-        print(f"✅ Tasks extracted: {len(tasks)}")
+        log.info("Tasks extracted", extra={"tasks": len(tasks)})
         # --- Save tasks to DB ---
         saved_tasks = []
+        persist_start = time.perf_counter()
         for t in tasks:
             new_task = Task(
                 person=(t.get("assigned_to", "Unassigned") or "Unassigned"),
@@ -605,11 +1293,13 @@ Prepare quarterly budget ||| Rahul ||| 2025-10-20
                 status=(t.get("status", "Pending") or "Pending"),
                 notes=""
             )
-            db.session.add(new_task)
             saved_tasks.append(new_task)
+        saved_tasks = mark_near_duplicates("tasks", saved_tasks)
+        db.session.add_all(saved_tasks)
         db.session.commit()
+        run.record("persist_tasks", persist_start, time.perf_counter(), deps=("llm_tasks",))
         # --- Conflict Extraction with Stance Analysis ---
-        print("Extracting conflicts with stance analysis...")
+        log.info("Extracting conflicts with stance analysis")
         conflict_prompt = f"""
 Analyze this meeting transcript for conflicts and disagreements using stance analysis.
 For each conflict, identify:
@@ -624,17 +1314,12 @@ Return JSON format:
 Transcript:
 {transcript}
 """
-        response_conflict = llm(prompt=conflict_prompt, max_tokens=1024, temperature=0.3)
-        raw_conflict_text = ""
-        if isinstance(response_conflict, dict):
-            raw_conflict_text = response_conflict.get("choices", [{}])[0].get("text", "") if response_conflict.get("choices") else response_conflict.get("text", "") or ""
-        elif isinstance(response_conflict, str):
-            raw_conflict_text = response_conflict
-        raw_conflict_text = (raw_conflict_text or "").strip()
-        print(f"Raw conflict output: {raw_conflict_text[:300]}")
+        with run.time("llm_conflicts", deps=("persist_tasks",)), metrics.llm_site("conflicts"):
+            parsed_conflicts, raw_conflict_text = complete_json_array(
+                llm, conflict_prompt, max_tokens=1024, temperature=0.3)
+        log.debug("Raw conflict output", extra={"raw": raw_conflict_text[:300]})
         conflicts = []
         if raw_conflict_text:
-            parsed_conflicts = safe_json_parse(raw_conflict_text)
             if isinstance(parsed_conflicts, list):
                 conflicts = parsed_conflicts
             else:
@@ -646,6 +1331,7 @@ Transcript:
                 conflicts = [{"issue": m.strip(), "raised_by": "", "participants": [], "stance": "", "severity": "Medium", "topic": ""} for m in conflict_matches]
         # --- Save conflicts to DB ---
         saved_conflicts = []
+        persist_start = time.perf_counter()
         for c in conflicts:
             # Fix stance handling
             stance_value = c.get("stance", "")
@@ -661,18 +1347,22 @@ Transcript:
                 stance=stance_str,
                 topic=c.get("topic", "") if isinstance(c, dict) else ""
             )
-            db.session.add(new_conflict)
             saved_conflicts.append(new_conflict)
+        saved_conflicts = mark_near_duplicates("conflicts", saved_conflicts)
+        db.session.add_all(saved_conflicts)
         db.session.commit()
+        run.record("persist_conflicts", persist_start, time.perf_counter(), deps=("llm_conflicts",))
+        observe_pipeline("process_transcript", run)
         return jsonify({
             "message": "Transcript processed successfully",
             "tasks_extracted": len(saved_tasks),
             "conflicts_extracted": len(saved_conflicts),
             "tasks": [task_to_dict(t) for t in Task.query.order_by(Task.created_at.desc()).limit(10).all()],
-            "conflicts": [conflict_to_dict(c) for c in Conflict.query.order_by(Conflict.created_at.desc()).limit(10).all()]
+            "conflicts": [conflict_to_dict(c) for c in Conflict.query.order_by(Conflict.created_at.desc()).limit(10).all()],
+            "timings": run.to_dict()
         }), 201
     except Exception as e:
-        traceback.print_exc()
+        log.exception("process_transcript failed")
         return jsonify({"error": str(e)}), 500
 
 # -----------------------------
@@ -711,16 +1401,12 @@ def find_meeting_by_details(all_data):
     # fallback: return most recent candidate
     return candidates[0]
 
-def create_meeting_from_data(all_data, summary, normalized_segments, unique_speakers):
+def create_meeting_from_data(all_data, summary, normalized_segments, unique_speakers, commit=True):
     """
-    Create a Meeting record using provided fields and return it (committed).
+    Create a Meeting record using provided fields and return it (committed,
+    or only flushed when not `commit`).
     """
-    meeting_date = date.today()
-    if all_data.get("date"):
-        try:
-            meeting_date = datetime.strptime(all_data["date"], "%Y-%m-%d").date()
-        except Exception:
-            meeting_date = date.today()
+    meeting_date = parse_meeting_date(all_data.get("date"), date.today())
     new_title = all_data.get("title") or f"Meeting {datetime.now(timezone.utc).isoformat()}"
     meeting = Meeting(
         title=new_title,
@@ -734,233 +1420,767 @@ def create_meeting_from_data(all_data, summary, normalized_segments, unique_spea
         agenda=all_data.get("agenda", ""),
         start_time=all_data.get("start_time", "") if all_data.get("start_time") else None,
         end_time=all_data.get("end_time", "") if all_data.get("end_time") else None,
-        transcript_segments=normalized_segments,
+        transcript_segments=SegmentTable.from_dicts(normalized_segments),
         speakers=", ".join(unique_speakers)
     )
     db.session.add(meeting)
-    db.session.commit()
+    if commit:
+        db.session.commit()
+    else:
+        db.session.flush()
     return meeting
 
 
-@api_bp.route("/transcribe_and_summarize", methods=["POST"])
-def transcribe_and_summarize():
-    if "audio" not in request.files:
-        return jsonify({"error": "audio file missing"}), 400
-
-    audio_file = request.files["audio"]
-    if not audio_file.filename:
-        return jsonify({"error": "empty filename"}), 400
-
-    audio_path = None
+def run_meeting_pipeline(upload, prepared, all_data, run, on_persist=None):
+    """
+    ASR -> tasks/conflicts/summary -> persist -> MoM for one spooled and
+    pre-processed upload. Shared by POST /transcribe_and_summarize and the
+    "transcribe" worker job; returns the response body. The meeting and its
+    rows are committed together; `on_persist(meeting)` runs just before that
+    commit, inside the same transaction.
+    """
+    # ---------------------------------------------------
+    # STEP 2 — Transcribe using Faster-Whisper
+    # ---------------------------------------------------
+    with run.time("asr", deps=("upload",)):
+        result = transcribe_audio_faster_whisper(prepared.pcm(), time_offset=prepared.offset)
+
+    from utils.temporal_normalization import normalize_temporal_segments
+    normalized_segments = normalize_temporal_segments(
+        result["segments"], merge_threshold=0.5
+    )
+    # Build usable transcript (speaker-based)
+    speaker_transcript, full_transcript = build_speaker_transcript(
+        normalized_segments, result["full_text"]
+    )
+    unique_speakers = list(set(seg.get("speaker") for seg in normalized_segments))
+
+    # ---------------------------------------------------
+    # STEP 3+4 — Tasks, conflicts and the chunked SUMMARY are independent
+    # given the transcript, so they run concurrently on the inference pool
+    # ---------------------------------------------------
+    meeting_date = parse_meeting_date(all_data.get("date"), date.today())
+    llm = get_phi3_model()
+    run_llm_stages(speaker_transcript, llm, meeting_date, run=run)
+    extracted_tasks = run.results["tasks"]
+    extracted_conflicts = run.results["conflicts"]
+    summary = run.results["summary"]
+    # Fallback summary can use the extracted tasks/conflicts after the join
+    if not summary:
+        summary = fallback_summary(full_transcript, extracted_tasks, extracted_conflicts)
+    summary = summary.strip()
+
+    # ---------------------------------------------------
+    # STEP 5 — Create / Update Meeting in Database
+    # ---------------------------------------------------
+    # Always create a NEW meeting for every audio upload
+    with run.time("persist", deps=("tasks", "conflicts", "summary")):
+        meeting = create_meeting_from_data(all_data, summary, normalized_segments, unique_speakers, commit=False)
 
-    try:
         # ---------------------------------------------------
-        # STEP 1 — Save uploaded audio temporarily
+        # STEP 6 — Store Tasks and Conflicts in Database
         # ---------------------------------------------------
-        with NamedTemporaryFile(delete=False, suffix=os.path.splitext(secure_filename(audio_file.filename))[1]) as tmp:
-            audio_path = tmp.name
-            audio_file.save(audio_path)
+        save_meeting_tasks(meeting, extracted_tasks)
+        save_meeting_conflicts(meeting, extracted_conflicts)
+        if on_persist is not None:
+            on_persist(meeting)
+        db.session.commit()
 
-        # ---------------------------------------------------
-        # STEP 2 — Transcribe using Faster-Whisper
-        # ---------------------------------------------------
-        result = transcribe_audio_faster_whisper(audio_path)
+    # ---------------------------------------------------
+    # STEP 7 — Generate MOM USING SAVED DB VALUES
+    # ---------------------------------------------------
+    with run.time("mom", deps=("persist",)):
+        mom_file_path, meeting_tasks, meeting_conflicts = generate_meeting_mom(meeting)
+    observe_pipeline("transcribe_and_summarize", run)
 
-        from utils.temporal_normalization import normalize_temporal_segments
-        normalized_segments = normalize_temporal_segments(
-            result["segments"], merge_threshold=0.5
-        )
-        # Build usable transcript (speaker-based)
-        speaker_transcript = "\n".join([
-            f"{seg.get('speaker')}: {seg.get('text')}" for seg in normalized_segments if seg.get("text")
-        ])
-        full_transcript = result["full_text"]
-        # 🔥 Restore missing unique_speakers
-        unique_speakers = list(set(seg.get("speaker") for seg in normalized_segments))
-        # 🔥 If all speakers are UNKNOWN → force fallback
-        if all(seg.get("speaker") == "UNKNOWN" for seg in normalized_segments):
-            speaker_transcript = full_transcript
-        # 🔥 FIX: If speaker transcript is empty, fallback before extraction
-        if not speaker_transcript.strip():
-            speaker_transcript = full_transcript or ""
+    # ---------------------------------------------------
+    # STEP 8 — Return structured response
+    # ---------------------------------------------------
+    return {
+        "transcript": full_transcript,
+        "full_text": full_transcript,
+        "segments": normalized_segments,
+        "speakers": unique_speakers,
+        "summary": summary,
+        # frontend expects these names in your code — keep them consistent
+        "extracted_tasks": [task_to_dict(t) for t in meeting_tasks],
+        "extracted_conflicts": [conflict_to_dict(c) for c in meeting_conflicts],
+        "meeting_id": meeting.id,
+        "mom_file": mom_file_info(mom_file_path, meeting.id),
+        "audio_sha256": upload.sha256,
+        "timings": run.to_dict()
+    }
 
-        # ---------------------------------------------------
-        # STEP 3 — Extract tasks & conflicts first (so fallback summary can use them)
-        # ---------------------------------------------------
-        llm = get_phi3_model()
-        extraction = process_transcript_internal(speaker_transcript, llm)
-        extracted_tasks = extraction.get("tasks", [])
-        extracted_conflicts = extraction.get("conflicts", [])
-
-        # Normalize tasks early (so summary fallback can use them)
-        normalized_tasks = []
-        for t in extracted_tasks:
-            normalized_tasks.append({
-                "task_name": t.get("task_name") or t.get("task") or "",
-                "assigned_to": t.get("assigned_to") or "",
-                "due_date": t.get("due_date") or "",
-                "status": t.get("status", "Pending")
-            })
-        extracted_tasks = [t for t in normalized_tasks if t["task_name"]]
-
-        # Normalize conflicts early
-        normalized_conflicts = []
-        for c in extracted_conflicts:
-            normalized_conflicts.append({
-                "issue": c.get("issue", ""),
-                "raised_by": c.get("raised_by", ""),
-                "participants": c.get("participants", []),
-                "severity": c.get("severity", "Medium"),
-                "resolution": c.get("resolution", ""),
-                "stance": c.get("stance", ""),
-                "topic": c.get("topic", "")
-            })
-        extracted_conflicts = normalized_conflicts
-        # ---------------------------------------------------
-        # STEP 4 — Generate SUMMARY (CHUNKED FOR PHI-3)
-        # ---------------------------------------------------
-        def extract_llm_text(llm_out):
-            if not llm_out:
-                return ""
-            if isinstance(llm_out, dict):
-                if "choices" in llm_out and llm_out["choices"]:
-                    return (llm_out["choices"][0].get("text") or "").strip()
-                if "text" in llm_out:
-                    return llm_out["text"].strip()
-                return ""
-            if hasattr(llm_out, "text"):
-                return str(llm_out.text).strip()
-            if isinstance(llm_out, str):
-                return llm_out.strip()
-            return str(llm_out)
-        # ---------- CHUNK TRANSCRIPT FOR PHI-3 ----------
-        MAX_CHARS = 1200  # safe for Q4 model
-        chunks = [speaker_transcript[i:i+MAX_CHARS] for i in range(0, len(speaker_transcript), MAX_CHARS)]
-
-        chunk_summaries = []
-
-        for chunk in chunks:
-            prompt = f"""
-        Summarize this part of the meeting into 2 concise sentences:
-        {chunk}
-        """
-            try:
-                out = llm(prompt=prompt, max_tokens=180, temperature=0.3)
-                part_summary = extract_llm_text(out)
-                if part_summary:
-                    chunk_summaries.append(part_summary)
-            except Exception as e:
-                print("Chunk summary failed:", e)
-        # ---------- Merge partial summaries ----------
-        summary_text = " ".join(chunk_summaries).strip()
-        # If still empty → fallback logic
-        if not summary_text:
-            print("LLM returned empty summary — building fallback summary.")
-            fallback = ""
-            if full_transcript:
-                sentences = re.split(r'(?<=[.!?])\s+', full_transcript.strip())
-                fallback = " ".join(sentences[:4]).strip()
-            if not fallback and extracted_tasks:
-                fallback = "Action items assigned: " + ", ".join([t.get("task_name","") for t in extracted_tasks[:3]])
-            if not fallback and extracted_conflicts:
-                fallback = "Conflicts were raised regarding " + ", ".join([c.get("issue","") for c in extracted_conflicts[:3]])
-            if not fallback:
-                fallback = "Summary unavailable — transcript and extracted content are attached."
-
-            summary_text = fallback
-        summary = summary_text.strip()
+@api_bp.route("/transcribe_and_summarize", methods=["POST"])
+def transcribe_and_summarize():
+    upload = None
+    queued = False
 
-        # ---------------------------------------------------
-        # STEP 5 — Create / Update Meeting in Database
-        # ---------------------------------------------------
+    try:
         form_data = request.form if request.form else {}
         json_data = request.get_json(silent=True) or {}
         all_data = {**form_data, **json_data}
-        # Always create a NEW meeting for every audio upload
-        meeting = create_meeting_from_data(all_data, summary, normalized_segments, unique_speakers)
-
-        # Ensure summary is saved
-        meeting.summary = summary
-        db.session.commit()
+        if run_async():
+            upload = spool_job_audio()
+            job_id = JOBS.enqueue(db.session, "transcribe", {
+                "audio_path": upload.path,
+                "audio_sha256": upload.sha256,
+                "size": upload.size,
+                "filename": upload.filename,
+                "data": all_data,
+            })
+            queued = True
+            return job_accepted(job_id)
 
         # ---------------------------------------------------
-        # STEP 6 — Store Tasks and Conflicts in Database
+        # STEP 1 — Spool uploaded audio to disk and pre-process it once
         # ---------------------------------------------------
-        saved_tasks = []
-        for t in extracted_tasks:
-            task = Task(
-                person=t["assigned_to"],
-                task=t["task_name"],
-                deadline=t["due_date"],
-                status=t["status"],
-                notes="",
-                meeting_id=meeting.id
-            )
-            db.session.add(task)
-            saved_tasks.append(task)
+        run = StageRun()
+        with run.time("upload"):
+            upload, prepared = spool_request_audio()
+        return jsonify(run_meeting_pipeline(upload, prepared, all_data, run))
 
-        saved_conflicts = []
-        for c in extracted_conflicts:
-            conflict = Conflict(
-                issue=c["issue"],
-                raised_by=c["raised_by"],
-                severity=c["severity"],
-                participants=", ".join(c["participants"]),
-                stance=str(c["stance"]),
-                resolution=c["resolution"],
-                topic=c["topic"],
-                meeting_id=meeting.id
-            )
-            db.session.add(conflict)
-            saved_conflicts.append(conflict)
+    except UploadRejected as e:
+        return jsonify({"error": str(e)}), e.status_code
+
+    except Exception as e:
+        log.exception("Request failed")
+        return jsonify({"error": str(e)}), 500
+
+    finally:
+        if upload and not queued:
+            upload.remove()
 
+# -----------------------------
+# Reprocess a stored meeting (no audio re-upload)
+# -----------------------------
+REPROCESS_STAGES = ("tasks", "conflicts", "summary", "mom")
+
+def reprocess_meeting_internal(meeting, stages, segments):
+    """
+    Re-run `stages` for a stored meeting; returns the response body (raises on
+    failure). LLM stages that failed keep the meeting's stored rows/summary
+    and are listed under "failed_stages".
+    """
+    speaker_transcript, full_transcript = build_speaker_transcript(segments)
+    llm_stages = [s for s in ("tasks", "conflicts", "summary") if s in stages]
+    run = StageRun()
+    failed = []
+    if llm_stages:
+        log.info("Reprocessing meeting", extra={"meeting_id": meeting.id, "stages": llm_stages})
+        run_llm_stages(speaker_transcript, get_phi3_model(), meeting.date, stages=llm_stages, run=run)
+        failed = run.results["failed"]
+        if failed:
+            log.warning("Reprocess stages failed; stored results kept",
+                        extra={"meeting_id": meeting.id, "stages": failed})
+    with run.time("persist", deps=llm_stages):
+        if "tasks" in stages and "tasks" not in failed:
+            delete_meeting_rows(Task, meeting.id)
+            save_meeting_tasks(meeting, run.results["tasks"])
+        if "conflicts" in stages and "conflicts" not in failed:
+            delete_meeting_rows(Conflict, meeting.id)
+            save_meeting_conflicts(meeting, run.results["conflicts"])
+        if "summary" in stages and "summary" not in failed:
+            summary = run.results["summary"]
+            if not summary:
+                summary = fallback_summary(full_transcript, run.results.get("tasks", []), run.results.get("conflicts", []))
+            meeting.summary = summary.strip()
         db.session.commit()
+    mom_file_path = meeting.mom_file_path
+    if "mom" in stages:
+        with run.time("mom", deps=("persist",)):
+            mom_file_path, _, _ = generate_meeting_mom(meeting)
+    observe_pipeline("reprocess", run)
+    return {
+        "meeting": meeting_to_dict(meeting),
+        "stages": stages,
+        "failed_stages": failed,
+        "tasks": [task_to_dict(t) for t in Task.query.filter_by(meeting_id=meeting.id).all()],
+        "conflicts": [conflict_to_dict(c) for c in Conflict.query.filter_by(meeting_id=meeting.id).all()],
+        "mom_file": mom_file_info(mom_file_path, meeting.id),
+        "timings": run.to_dict()
+    }
 
-        # ---------------------------------------------------
-        # STEP 7 — Generate MOM USING SAVED DB VALUES
-        # ---------------------------------------------------
-        from utils.mom_generator import generate_mom_document
+@api_bp.route("/meetings/<int:meeting_id>/reprocess", methods=["POST"])
+def reprocess_meeting(meeting_id):
+    """
+    Re-run selected pipeline stages from the stored transcript segments.
+    Body: {"stages": ["tasks", "conflicts", "summary", "mom"]} (default: all)
+    """
+    meeting = Meeting.query.get_or_404(meeting_id)
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({"error": "body must be a JSON object"}), 400
+    stages = data.get("stages") or request.args.get("stages") or list(REPROCESS_STAGES)
+    if isinstance(stages, str):
+        stages = [s.strip() for s in stages.split(",") if s.strip()]
+    if not isinstance(stages, list) or not all(isinstance(s, str) for s in stages):
+        return jsonify({"error": "stages must be a list of strings", "allowed": list(REPROCESS_STAGES)}), 400
+    unknown = [s for s in stages if s not in REPROCESS_STAGES]
+    if unknown:
+        return jsonify({"error": f"unknown stages: {', '.join(unknown)}", "allowed": list(REPROCESS_STAGES)}), 400
+    segments = segments_as_dicts(meeting.transcript_segments) or []
+    if not segments and any(s in stages for s in ("tasks", "conflicts", "summary")):
+        return jsonify({"error": "meeting has no stored transcript"}), 400
+    if run_async():
+        return job_accepted(JOBS.enqueue(db.session, "reprocess", {"stages": stages}, meeting_id=meeting.id))
+    try:
+        return jsonify(reprocess_meeting_internal(meeting, stages, segments))
+    except Exception as e:
+        db.session.rollback()
+        log.exception("Request failed")
+        return jsonify({"error": str(e)}), 500
 
-        meeting_tasks = Task.query.filter_by(meeting_id=meeting.id).all()
-        meeting_conflicts = Conflict.query.filter_by(meeting_id=meeting.id).all()
+# -----------------------------
+# Transcript edits (incremental re-extraction per window)
+# -----------------------------
+# Bump when prompts or normalization change so cached window results are not reused
+WINDOW_EXTRACTION_VERSION = 1
+# Shingle Jaccard above which a re-extracted item updates an existing row instead of replacing it
+WINDOW_MATCH_THRESHOLD = 0.5
+SEGMENT_EDIT_FIELDS = ("text", "speaker")
+
+def meeting_window_hash(meeting, speaker_transcript):
+    from utils.transcript_windows import window_hash
+    # Deadlines resolve against the meeting date, so it is part of the key
+    return window_hash(speaker_transcript, f"v{WINDOW_EXTRACTION_VERSION}:{meeting.date}")
+
+def extract_window(meeting, window, speaker_transcript, pipeline):
+    """
+    Tasks, conflicts and summary of one transcript window: the stored
+    WindowExtraction with the same content hash, else one run of the LLM
+    stages, stored unless a stage failed. Returns (extraction, cached, failed
+    stage names); a failed stage's result in the extraction is empty.
+    """
+    content_hash = meeting_window_hash(meeting, speaker_transcript)
+    extraction = (
+        WindowExtraction.query.filter_by(content_hash=content_hash)
+        .order_by(WindowExtraction.id.desc()).first()
+    )
+    metrics.CACHE_REQUESTS.inc(cache="window_extraction", result="hit" if extraction else "miss")
+    if extraction is not None:
+        return extraction, True, []
+    run = run_llm_stages(speaker_transcript, get_phi3_model(), meeting.date)
+    observe_pipeline(pipeline, run)
+    extraction = WindowExtraction(
+        content_hash=content_hash,
+        meeting_id=meeting.id,
+        window_index=window,
+        tasks=run.results["tasks"],
+        conflicts=run.results["conflicts"],
+        summary=(run.results["summary"] or "").strip(),
+    )
+    if not run.results["failed"]:
+        db.session.add(extraction)
+    return extraction, False, run.results["failed"]
+
+def summary_revision_prompt(summary, corrected):
+    parts = "\n".join(f"- {text.strip()}" for text in corrected)
+    return f"""
+        Summarize the meeting into at most 6 concise sentences, using its
+        earlier summary and the summaries of transcript parts corrected since
+        (the corrected parts take precedence):
+        Earlier summary: {summary}
+        Corrected parts:
+        {parts}
+        """
 
-        mom_file_path = generate_mom_document(
-            meeting_data=meeting,
-            tasks=meeting_tasks,
-            conflicts=meeting_conflicts,
-            transcript_segments=None  # Only summary is used
-        )
+def revise_summary(summary, corrected, llm):
+    """
+    Fold the summaries of corrected windows into a stored whole-meeting
+    summary with one LLM call; None if the model fails or returns nothing.
+    """
+    try:
+        with metrics.llm_site("summary_revision"):
+            out = llm(prompt=summary_revision_prompt(summary, corrected), max_tokens=360, temperature=0.3)
+        return extract_llm_text(out).strip() or None
+    except Exception as e:
+        log.warning("Summary revision failed", extra={"error": str(e)})
+        return None
 
-        meeting.mom_file_path = mom_file_path
-        db.session.commit()
+def _apply_task(row, item):
+    row.person = item["assigned_to"]
+    row.task = item["task_name"]
+    row.deadline = item["due_date"]
+
+def _apply_conflict(row, item):
+    row.issue = item["issue"]
+    row.raised_by = item["raised_by"]
+    row.severity = item["severity"]
+    row.participants = ", ".join(str(p) for p in item["participants"])
+    row.stance = str(item["stance"])
+    row.topic = item["topic"]
+    if not row.resolution:
+        row.resolution = item["resolution"]
+
+# collection -> (model, row text, item text, update row from item, save new items)
+WINDOW_MERGE = {
+    "tasks": (Task, lambda row: row.task, lambda item: item["task_name"], _apply_task, save_meeting_tasks),
+    "conflicts": (Conflict, lambda row: row.issue, lambda item: item["issue"], _apply_conflict,
+                  save_meeting_conflicts),
+}
+
+def tag_untagged_rows(meeting, windows):
+    """
+    Assign rows from a whole-transcript pass (window_index NULL) to the window
+    of `windows` ({index: speaker transcript}) whose text contains most of the
+    row's shingles, so a later window edit can update or retire them (caller
+    commits). Rows with less than WINDOW_MATCH_THRESHOLD of their shingles in
+    any window (e.g. added by hand) stay untagged.
+    """
+    from utils.near_duplicates import shingles
+    window_shingles = {idx: shingles(text) for idx, text in windows.items()}
+    for model, row_text, _, _, _ in WINDOW_MERGE.values():
+        for row in model.query.filter(model.meeting_id == meeting.id, model.window_index.is_(None)):
+            a = shingles(row_text(row))
+            if not a:
+                continue
+            best, best_score = None, 0.0
+            for idx in sorted(window_shingles):
+                score = len(a & window_shingles[idx]) / len(a)
+                if score > best_score:
+                    best, best_score = idx, score
+            if best_score >= WINDOW_MATCH_THRESHOLD:
+                row.window_index = best
+
+def merge_window_rows(name, meeting, window, items):
+    """
+    Merge one window's re-extracted items into the meeting's rows (caller
+    commits). Each item updates the most similar existing row of that window,
+    which keeps its id, status and notes; other rows of the window are
+    deleted and unmatched items are added. Run tag_untagged_rows first so
+    rows from a whole-transcript pass belong to a window.
+    """
+    from utils.near_duplicates import shingles
+    model, row_text, item_text, apply_item, save = WINDOW_MERGE[name]
+    rows = model.query.filter(
+        model.meeting_id == meeting.id, model.window_index == window,
+    ).order_by(model.id).all()
+    row_shingles = [shingles(row_text(r)) for r in rows]
+    pairs = []
+    for i, item in enumerate(items):
+        a = shingles(item_text(item))
+        for j, b in enumerate(row_shingles):
+            if a and b:
+                score = len(a & b) / len(a | b)
+                if score >= WINDOW_MATCH_THRESHOLD:
+                    pairs.append((score, i, j))
+    matched_items, matched_rows = set(), set()
+    updated = []
+    for _, i, j in sorted(pairs, key=lambda p: (-p[0], p[1], p[2])):
+        if i in matched_items or j in matched_rows:
+            continue
+        matched_items.add(i)
+        matched_rows.add(j)
+        apply_item(rows[j], items[i])
+        updated.append(rows[j])
+    stale = [r.id for j, r in enumerate(rows) if j not in matched_rows]
+    if stale:
+        delete_rows(model, model.id.in_(stale))
+    created = save(meeting, [item for i, item in enumerate(items) if i not in matched_items])
+    for row in created:
+        row.window_index = window
+    return {"created": created, "updated": updated, "deleted": stale}
+
+@api_bp.route("/meetings/<int:meeting_id>/segments", methods=["PATCH"])
+def edit_meeting_segments(meeting_id):
+    """
+    Correct transcript segments and re-extract only the windows that changed.
+    Body: {"edits": [{"index": 12, "text": "...", "speaker": "..."}]}
+    Windows are cut by time, so an edit changes one window's content hash;
+    only those windows go through the LLM (or reuse a stored extraction for
+    the same content), and their tasks/conflicts are merged into the
+    meeting's rows. The summary is rebuilt from per-window summaries once
+    every window has one; otherwise (meetings from the upload or reprocess
+    pipeline, summarized as a whole) the stored summary is revised with the
+    changed windows' summaries in one extra LLM call. If an LLM stage fails
+    for a changed window nothing is saved (500 with "failed_windows"), so the
+    edit can be retried without losing that window's rows.
+    """
+    from utils.transcript_windows import group_segments_into_windows
+    meeting = Meeting.query.get_or_404(meeting_id)
+    edits = (request.get_json(silent=True) or {}).get("edits")
+    segments = segments_as_dicts(meeting.transcript_segments) or []
+    if not isinstance(edits, list) or not edits:
+        return jsonify({"error": "edits must be a non-empty list"}), 400
+    for i, edit in enumerate(edits):
+        index = edit.get("index") if isinstance(edit, dict) else None
+        if not isinstance(index, int) or not 0 <= index < len(segments):
+            return jsonify({"error": f"edits[{i}]: index must be a segment index below {len(segments)}"}), 400
+        values = {k: edit[k] for k in SEGMENT_EDIT_FIELDS if k in edit}
+        if not values or not all(isinstance(v, str) for v in values.values()):
+            return jsonify({"error": f"edits[{i}]: give text and/or speaker as strings"}), 400
 
-        # ---------------------------------------------------
-        # STEP 8 — Return structured response
-        # ---------------------------------------------------
+    try:
+        run = StageRun()
+        old_windows = {
+            idx: build_speaker_transcript(segs)[0] for idx, segs in group_segments_into_windows(segments)
+        }
+        edited = [dict(seg) for seg in segments]
+        for edit in edits:
+            edited[edit["index"]].update({k: edit[k] for k in SEGMENT_EDIT_FIELDS if k in edit})
+        table = SegmentTable.from_dicts(edited)
+        meeting.transcript_segments = table
+        flag_modified(meeting, "transcript_segments")
+        meeting.speakers = ", ".join(table.unique_speakers())
+
+        # Rows from the upload/reprocess pipeline are placed by the pre-edit text
+        tag_untagged_rows(meeting, old_windows)
+        changes = {"tasks": {"created": [], "updated": [], "deleted": []},
+                   "conflicts": {"created": [], "updated": [], "deleted": []}}
+        changed_windows, llm_windows, summaries, failed_windows = [], 0, {}, []
+        with run.time("windows"):
+            for idx, window_segments in group_segments_into_windows(edited):
+                speaker_transcript, _ = build_speaker_transcript(window_segments)
+                if speaker_transcript == old_windows.get(idx):
+                    if speaker_transcript.strip():
+                        extraction = WindowExtraction.query.filter_by(
+                            content_hash=meeting_window_hash(meeting, speaker_transcript)).first()
+                        summaries[idx] = extraction.summary if extraction else None
+                    continue
+                changed_windows.append(idx)
+                if speaker_transcript.strip():
+                    log.info("Re-extracting edited window", extra={"meeting_id": meeting.id, "window": idx})
+                    extraction, cached, failed = extract_window(meeting, idx, speaker_transcript, "segment_edit")
+                    if failed:
+                        failed_windows.append(idx)
+                        break
+                    llm_windows += 0 if cached else 1
+                    summaries[idx] = extraction.summary
+                    tasks, conflicts = extraction.tasks or [], extraction.conflicts or []
+                else:
+                    # Text removed: the window's rows go, nothing to summarize
+                    summaries.pop(idx, None)
+                    tasks, conflicts = [], []
+                for name, items in (("tasks", tasks), ("conflicts", conflicts)):
+                    merged = merge_window_rows(name, meeting, idx, items)
+                    for kind, rows in merged.items():
+                        changes[name][kind].append(rows)
+        if failed_windows:
+            # An empty result from a failed stage would delete the window's rows
+            db.session.rollback()
+            log.warning("Segment edit not saved: window extraction failed",
+                        extra={"meeting_id": meeting_id, "windows": failed_windows})
+            return jsonify({"error": "extraction failed for an edited window; nothing was changed",
+                            "failed_windows": failed_windows}), 500
+        summary = None
+        with run.time("summary", deps=("windows",)):
+            corrected = [summaries[idx] for idx in changed_windows if summaries.get(idx)]
+            if summaries and all(summaries.values()):
+                summary = " ".join(summaries[idx].strip() for idx in sorted(summaries)).strip()
+            elif corrected and meeting.summary:
+                summary = revise_summary(meeting.summary, corrected, get_phi3_model())
+        with run.time("persist", deps=("summary",)):
+            summary_updated = bool(summary)
+            if summary_updated:
+                meeting.summary = summary
+            db.session.commit()
+        observe_pipeline("segment_edit", run)
+        for name in changes:
+            for kind in ("created", "updated"):
+                changes[name][kind] = [row.id for rows in changes[name][kind] for row in rows]
+            changes[name]["deleted"] = [row_id for ids in changes[name]["deleted"] for row_id in ids]
+        return jsonify({
+            "meeting": meeting_to_dict(meeting),
+            "changed_windows": changed_windows,
+            "llm_windows": llm_windows,
+            "tasks": changes["tasks"],
+            "conflicts": changes["conflicts"],
+            "summary_updated": summary_updated,
+            "timings": run.to_dict()
+        })
+    except Exception as e:
+        db.session.rollback()
+        log.exception("Request failed")
+        return jsonify({"error": str(e)}), 500
+
+# -----------------------------
+# Pipeline jobs (multi-node worker mode)
+# -----------------------------
+def run_async():
+    """?async=1|0 overrides MOM_PIPELINE_MODE for one request."""
+    value = request.args.get("async")
+    if value is None:
+        return PIPELINE_MODE == "queue"
+    return value.lower() in ("1", "true", "yes")
+
+def spool_job_audio():
+    """Spool the "audio" part into JOB_SPOOL_DIR for a worker; duration is checked up front."""
+    if "audio" not in request.files:
+        raise UploadRejected("audio file missing")
+    upload = spool_upload(request.files["audio"], spool_dir=JOB_SPOOL_DIR)
+    try:
+        check_audio_duration(upload.path)
+    except Exception:
+        upload.remove()
+        raise
+    return upload
+
+def job_accepted(job_id):
+    response = jsonify({"job": job_to_dict(db.session.get(Job, job_id))})
+    response.status_code = 202
+    response.headers["Location"] = f"/api/jobs/{job_id}"
+    return response
+
+def attach_job_meeting(job, meeting):
+    """Record the new meeting on the job row in the meeting's own transaction."""
+    if not JOBS.attach_meeting(db.session, job, meeting.id):
+        raise RuntimeError(f"job {job.id} lost its lease before the meeting was saved")
+
+def run_transcribe_job(job):
+    """
+    Run the upload pipeline for a spooled upload. The meeting id is stored on
+    the job in the same commit as the meeting, so a retry after a failed MoM
+    render or a lost lease finishes that meeting instead of creating another.
+    """
+    payload = job.payload
+    upload = SpooledUpload(payload["audio_path"], payload["audio_sha256"], payload.get("size"), payload.get("filename"))
+    meeting = db.session.get(Meeting, job.meeting_id) if job.meeting_id else None
+    if meeting is None and not os.path.exists(upload.path):
+        raise JobRejected(f"audio file missing: {upload.path}")
+    try:
+        run = StageRun()
+        if meeting is not None:
+            log.info("Resuming transcribe job", extra={"job_id": job.id, "meeting_id": meeting.id})
+            with run.time("mom"):
+                mom_file_path, meeting_tasks, meeting_conflicts = generate_meeting_mom(meeting)
+            result = {
+                "meeting_id": meeting.id,
+                "summary": meeting.summary,
+                "tasks": len(meeting_tasks),
+                "conflicts": len(meeting_conflicts),
+                "mom_file": mom_file_info(mom_file_path, meeting.id),
+            }
+        else:
+            with run.time("upload"):
+                prepared = prepare_upload(upload)
+            body = run_meeting_pipeline(upload, prepared, payload.get("data") or {}, run,
+                                        on_persist=lambda meeting: attach_job_meeting(job, meeting))
+            # The full transcript and rows live on the meeting; keep the job row small
+            result = {
+                "meeting_id": body["meeting_id"],
+                "summary": body["summary"],
+                "tasks": len(body["extracted_tasks"]),
+                "conflicts": len(body["extracted_conflicts"]),
+                "mom_file": body["mom_file"],
+            }
+    except UploadRejected as e:
+        upload.remove()
+        raise JobRejected(str(e))
+    except Exception:
+        db.session.rollback()
+        if job.last_attempt:
+            upload.remove()
+        raise
+    upload.remove()
+    result.update(audio_sha256=upload.sha256, timings=run.to_dict())
+    return result
+
+def run_reprocess_job(job):
+    meeting = db.session.get(Meeting, job.meeting_id)
+    if meeting is None:
+        raise JobRejected(f"meeting {job.meeting_id} not found")
+    stages = job.payload.get("stages") or list(REPROCESS_STAGES)
+    segments = segments_as_dicts(meeting.transcript_segments) or []
+    if not segments and any(s in stages for s in ("tasks", "conflicts", "summary")):
+        raise JobRejected("meeting has no stored transcript")
+    try:
+        body = reprocess_meeting_internal(meeting, stages, segments)
+    except Exception:
+        db.session.rollback()
+        raise
+    return {
+        "meeting_id": meeting.id,
+        "stages": stages,
+        "failed_stages": body["failed_stages"],
+        "tasks": len(body["tasks"]),
+        "conflicts": len(body["conflicts"]),
+        "mom_file": body["mom_file"],
+        "timings": body["timings"],
+    }
+
+def discard_job_audio(payload):
+    """Remove the spooled audio of a transcribe job that was reaped (no handler will see it again)."""
+    SpooledUpload(payload.get("audio_path"), payload.get("audio_sha256"), payload.get("size"), payload.get("filename")).remove()
+
+JOB_HANDLERS = {
+    "transcribe": run_transcribe_job,
+    "reprocess": run_reprocess_job,
+}
+JOBS.on_reap["transcribe"] = discard_job_audio
+
+@api_bp.route("/jobs", methods=["GET"])
+def list_jobs():
+    """Newest jobs first; filter with ?status=, ?kind=, ?meeting_id= (limit via ?limit=, max 500)."""
+    query = db.session.query(*JOB_SCHEMA.columns(Job))
+    for key in ("status", "kind"):
+        if request.args.get(key):
+            query = query.filter(getattr(Job, key) == request.args[key])
+    meeting_id = request.args.get("meeting_id", type=int)
+    if meeting_id is not None:
+        query = query.filter(Job.meeting_id == meeting_id)
+    limit = min(request.args.get("limit", default=100, type=int), 500)
+    rows = [JOB_SCHEMA.row_dict(r) for r in query.order_by(Job.id.desc()).limit(limit)]
+    return Response(dumps(rows), mimetype="application/json")
+
+@api_bp.route("/jobs/<int:job_id>", methods=["GET"])
+def get_job(job_id):
+    """Status of a queued pipeline job; `result` is set once it succeeded."""
+    return jsonify(job_to_dict(Job.query.get_or_404(job_id)))
+
+# -----------------------------
+# Live meeting sessions (chunked audio ingestion)
+# -----------------------------
+def live_session_to_dict(s):
+    return {
+        "id": s.id,
+        "meeting_id": s.meeting_id,
+        "status": s.status,
+        "chunk_count": s.chunk_count or 0,
+        "audio_seconds": round(s.audio_offset or 0.0, 3),
+        "processed_until": round(s.processed_until or 0.0, 3),
+        "window_summaries": len(s.chunk_summaries or []),
+        "created_at": s.created_at.isoformat() if s.created_at else None,
+        "finalized_at": s.finalized_at.isoformat() if s.finalized_at else None
+    }
+
+def process_live_windows(session, meeting, until_seconds=None):
+    """
+    Run task/conflict extraction and the chunk summary on transcript windows
+    that closed since the last call. Returns the newly saved tasks/conflicts.
+    """
+    from utils.transcript_windows import WINDOW_SECONDS, windows_between
+    segments = segments_as_dicts(meeting.transcript_segments) or []
+    windows = windows_between(segments, session.processed_until or 0.0, until_seconds)
+    if not windows:
+        return [], []
+    summaries = list(session.chunk_summaries or [])
+    new_tasks, new_conflicts = [], []
+    for idx, window_segments in windows:
+        speaker_transcript, _ = build_speaker_transcript(window_segments)
+        if not speaker_transcript.strip():
+            continue
+        log.info("Live session window extraction", extra={
+            "session_id": session.id, "window": idx, "segments": len(window_segments)
+        })
+        # Cached per window so later transcript edits only re-extract what changed
+        extraction, _, _ = extract_window(meeting, idx, speaker_transcript, "live_window")
+        window_tasks = save_meeting_tasks(meeting, extraction.tasks or [])
+        window_conflicts = save_meeting_conflicts(meeting, extraction.conflicts or [])
+        for row in window_tasks + window_conflicts:
+            row.window_index = idx
+        new_tasks += window_tasks
+        new_conflicts += window_conflicts
+        part_summary = extraction.summary
+        if part_summary:
+            summaries.append(part_summary)
+    session.chunk_summaries = summaries
+    session.processed_until = (windows[-1][0] + 1) * WINDOW_SECONDS
+    db.session.commit()
+    return new_tasks, new_conflicts
+
+@api_bp.route("/live_sessions", methods=["POST"])
+def start_live_session():
+    """Create the meeting row up front and open a session that accepts audio chunks."""
+    form_data = request.form if request.form else {}
+    json_data = request.get_json(silent=True) or {}
+    all_data = {**form_data, **json_data}
+    meeting = create_meeting_from_data(all_data, "", [], [])
+    session = LiveSession(meeting_id=meeting.id, chunk_summaries=[])
+    db.session.add(session)
+    db.session.commit()
+    return jsonify(live_session_to_dict(session)), 201
+
+@api_bp.route("/live_sessions/<int:session_id>", methods=["GET"])
+def get_live_session(session_id):
+    session = LiveSession.query.get_or_404(session_id)
+    return jsonify(live_session_to_dict(session))
+
+@api_bp.route("/live_sessions/<int:session_id>/chunks", methods=["POST"])
+def add_live_chunk(session_id):
+    """
+    Transcribe one audio chunk, append it to the meeting's segments and run
+    extraction on any transcript windows the chunk closed.
+    """
+    session = LiveSession.query.get_or_404(session_id)
+    if session.status != "active":
+        return jsonify({"error": f"session is {session.status}"}), 409
+    upload = None
+    try:
+        upload, prepared = spool_request_audio()
+        offset = session.audio_offset or 0.0
+        result = transcribe_audio_faster_whisper(prepared.pcm(), time_offset=offset + prepared.offset)
+        chunk_segments = result["segments"]
+        from utils.temporal_normalization import normalize_temporal_segments
+        chunk_segments = normalize_temporal_segments(chunk_segments, merge_threshold=0.5)
+        meeting = Meeting.query.get(session.meeting_id)
+        table = SegmentTable.coerce(meeting.transcript_segments)
+        table.extend(chunk_segments)
+        meeting.transcript_segments = table
+        flag_modified(meeting, "transcript_segments")
+        meeting.speakers = ", ".join(table.unique_speakers())
+        # Advance by the untrimmed chunk length so the session timeline matches wall-clock audio
+        session.audio_offset = offset + prepared.source_duration
+        session.chunk_count = (session.chunk_count or 0) + 1
+        db.session.commit()
+        new_tasks, new_conflicts = process_live_windows(session, meeting, until_seconds=session.audio_offset)
         return jsonify({
+            "session": live_session_to_dict(session),
+            "segments": chunk_segments,
+            "new_tasks": [task_to_dict(t) for t in new_tasks],
+            "new_conflicts": [conflict_to_dict(c) for c in new_conflicts]
+        })
+    except UploadRejected as e:
+        return jsonify({"error": str(e)}), e.status_code
+    except Exception as e:
+        db.session.rollback()
+        log.exception("Request failed")
+        return jsonify({"error": str(e)}), 500
+    finally:
+        if upload:
+            upload.remove()
+
+@api_bp.route("/live_sessions/<int:session_id>/finalize", methods=["POST"])
+def finalize_live_session(session_id):
+    """Extract the trailing window, merge window summaries and render the MoM."""
+    session = LiveSession.query.get_or_404(session_id)
+    if session.status != "active":
+        return jsonify({"error": f"session is {session.status}"}), 409
+    try:
+        meeting = Meeting.query.get(session.meeting_id)
+        process_live_windows(session, meeting, until_seconds=None)
+        segments = segments_as_dicts(meeting.transcript_segments) or []
+        _, full_transcript = build_speaker_transcript(segments)
+        # Reduce step: merge the per-window summaries
+        summary = " ".join(session.chunk_summaries or []).strip()
+        if not summary:
+            tasks = [{"task_name": t.task} for t in Task.query.filter_by(meeting_id=meeting.id).all()]
+            conflicts = [{"issue": c.issue} for c in Conflict.query.filter_by(meeting_id=meeting.id).all()]
+            summary = fallback_summary(full_transcript, tasks, conflicts)
+        meeting.summary = summary.strip()
+        db.session.commit()
+        # Finalize only once the MoM exists, so a failed render can be retried
+        mom_file_path, meeting_tasks, meeting_conflicts = generate_meeting_mom(meeting)
+        session.status = "finalized"
+        session.finalized_at = datetime.now(timezone.utc)
+        db.session.commit()
+        return jsonify({
+            "session": live_session_to_dict(session),
             "transcript": full_transcript,
             "full_text": full_transcript,
-            "segments": normalized_segments,
-            "speakers": unique_speakers,
-            "summary": summary,
-            # frontend expects these names in your code — keep them consistent
+            "segments": segments,
+            "speakers": SegmentTable.coerce(meeting.transcript_segments).unique_speakers(),
+            "summary": meeting.summary,
             "extracted_tasks": [task_to_dict(t) for t in meeting_tasks],
             "extracted_conflicts": [conflict_to_dict(c) for c in meeting_conflicts],
             "meeting_id": meeting.id,
-            "mom_file": {
-                "filename": os.path.basename(mom_file_path),
-                "download_url": f"/api/download/{os.path.basename(mom_file_path)}"
-            }
+            "mom_file": mom_file_info(mom_file_path, meeting.id)
         })
-
     except Exception as e:
-        traceback.print_exc()
+        db.session.rollback()
+        log.exception("Request failed")
         return jsonify({"error": str(e)}), 500
 
-    finally:
-        if audio_path and os.path.exists(audio_path):
-            os.remove(audio_path)
-
 # # -----------------------------
 # # Meeting Summary + Key Decisions Endpoint (POST)
 # # -----------------------------
@@ -1249,6 +2469,7 @@ def transcribe_and_summarize():
 # 🔽🔽🔽 GET /api/summary (aggregated highlights & decisions)
 # ------------------------------------------------------------------
 @api_bp.route("/summary", methods=["GET"])
+@etag_from_version(lambda *a, **kw: collection_version(db.session, Meeting))
 def get_summary_data():
     """
     Provides aggregated highlights and key decisions from ALL meetings.
@@ -1268,7 +2489,7 @@ def get_summary_data():
             'decisions': all_decisions
         })
     except Exception as e:
-        traceback.print_exc()
+        log.exception("Request failed")
         return jsonify({"error": str(e)}), 500
 
 # ------------------------------------------------------------------
@@ -1278,9 +2499,9 @@ def get_summary_data():
 # Meeting CRUD Endpoints
 # -----------------------------
 @api_bp.route("/meetings", methods=["GET"])
+@etag_from_version(lambda *a, **kw: collection_version(db.session, Meeting))
 def get_meetings():
-    meetings = Meeting.query.order_by(Meeting.created_at.desc()).all()
-    return jsonify([meeting_to_dict(m) for m in meetings])
+    return list_or_changes_response("meetings", Meeting.created_at.desc())
 
 @api_bp.route("/meetings", methods=["POST"])
 def create_meeting():
@@ -1314,9 +2535,9 @@ def create_meeting():
 # Task CRUD Endpoints
 # -----------------------------
 @api_bp.route("/tasks", methods=["GET"])
+@etag_from_version(lambda *a, **kw: collection_version(db.session, Task))
 def get_tasks():
-    tasks = Task.query.order_by(Task.created_at.desc()).all()
-    return jsonify([task_to_dict(t) for t in tasks])
+    return list_or_changes_response("tasks", Task.created_at.desc())
 
 @api_bp.route("/tasks", methods=["POST"])
 def create_task():
@@ -1331,24 +2552,35 @@ def create_task():
     db.session.commit()
     return jsonify(task_to_dict(task)), 201
 
+TASK_CREATE_DEFAULTS = {"person": "", "task": "", "deadline": "Not Mentioned", "notes": ""}
+TASK_EDITABLE = ("person", "task", "deadline", "status", "notes")
+
 @api_bp.route("/tasks/<int:id>", methods=["PATCH"])
 def update_task(id):
     task = Task.query.get_or_404(id)
     data = request.get_json(silent=True) or {}
-    for key in ["person", "task", "deadline", "status", "notes"]:
+    for key in TASK_EDITABLE:
         if key in data:
             setattr(task, key, data[key])
     db.session.commit()
     return jsonify(task_to_dict(task))
 
+@api_bp.route("/tasks/bulk", methods=["POST"])
+def bulk_tasks():
+    """
+    Body: {"create": [{...}, ...], "update": [{"id": 1, "status": "Done"}, ...]}
+    Everything is applied in one transaction; see apply_bulk.
+    """
+    return apply_bulk(Task, TASK_SCHEMA, TASK_CREATE_DEFAULTS, TASK_EDITABLE)
+
 
 # -----------------------------
 # Conflict CRUD Endpoints
 # -----------------------------
 @api_bp.route("/conflicts", methods=["GET"])
+@etag_from_version(lambda *a, **kw: collection_version(db.session, Conflict))
 def get_conflicts():
-    conflicts = Conflict.query.order_by(Conflict.created_at.desc()).all()
-    return jsonify([conflict_to_dict(c) for c in conflicts])
+    return list_or_changes_response("conflicts", Conflict.created_at.desc())
 
 @api_bp.route("/conflicts", methods=["POST"])
 def create_conflict():
@@ -1363,21 +2595,215 @@ def create_conflict():
     db.session.commit()
     return jsonify(conflict_to_dict(conflict)), 201
 
+CONFLICT_CREATE_DEFAULTS = {"issue": "", "raised_by": "", "resolution": "", "severity": "Medium"}
+CONFLICT_EDITABLE = ("issue", "raised_by", "resolution", "severity")
+
 @api_bp.route("/conflicts/<int:id>", methods=["PATCH"])
 def update_conflict(id):
     conflict = Conflict.query.get_or_404(id)
     data = request.get_json(silent=True) or {}
-    for key in ["issue", "raised_by", "resolution", "severity"]:
+    for key in CONFLICT_EDITABLE:
         if key in data:
             setattr(conflict, key, data[key])
     db.session.commit()
     return jsonify(conflict_to_dict(conflict))
 
+@api_bp.route("/conflicts/bulk", methods=["POST"])
+def bulk_conflicts():
+    """Same body and response shape as /tasks/bulk."""
+    return apply_bulk(Conflict, CONFLICT_SCHEMA, CONFLICT_CREATE_DEFAULTS, CONFLICT_EDITABLE)
+
+# -----------------------------
+# Bulk create/update
+# -----------------------------
+BULK_MAX_ITEMS = int(os.environ.get("MOM_BULK_MAX_ITEMS", "1000"))
+
+def bulk_item_error(index, status, error, row_id=None):
+    result = {"index": index, "status": status, "error": error}
+    if row_id is not None:
+        result["id"] = row_id
+    return result
+
+def apply_bulk(model, schema, create_defaults, editable):
+    """
+    Apply an array of creates and an array of patches in one transaction.
+    Creates are inserted in one flush; patches are merged per id and grouped
+    by identical values, so each group is a single UPDATE ... WHERE id IN.
+    Returns {"created": [...], "updated": [...]} with one result per input
+    item, in input order; invalid items or unknown ids fail on their own.
+    """
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({"error": "body must be a JSON object"}), 400
+    creates = data.get("create") or []
+    updates = data.get("update") or []
+    if not isinstance(creates, list) or not isinstance(updates, list):
+        return jsonify({"error": "create and update must be arrays"}), 400
+    if len(creates) + len(updates) > BULK_MAX_ITEMS:
+        return jsonify({"error": f"at most {BULK_MAX_ITEMS} items per request"}), 413
+
+    def invalid_value(item):
+        return next((k for k in editable if k in item and not isinstance(item[k], (str, type(None)))), None)
+
+    created, new_rows = [], []
+    for i, item in enumerate(creates):
+        if not isinstance(item, dict):
+            created.append(bulk_item_error(i, 400, "item must be an object"))
+        elif invalid_value(item):
+            created.append(bulk_item_error(i, 400, f"{invalid_value(item)} must be a string"))
+        else:
+            row = model(**{k: item.get(k, default) for k, default in create_defaults.items()})
+            new_rows.append(row)
+            created.append({"index": i, "status": 201, "row": row})
+
+    updated, patches = [], {}
+    for i, item in enumerate(updates):
+        row_id = item.get("id") if isinstance(item, dict) else None
+        if not isinstance(row_id, int) or isinstance(row_id, bool):
+            updated.append(bulk_item_error(i, 400, "id must be an integer"))
+        elif invalid_value(item):
+            updated.append(bulk_item_error(i, 400, f"{invalid_value(item)} must be a string", row_id))
+        else:
+            # Later patches to the same id win, field by field
+            patches.setdefault(row_id, {}).update({k: item[k] for k in editable if k in item})
+            updated.append({"index": i, "status": 200, "id": row_id})
+
+    try:
+        existing = set()
+        if patches:
+            existing = {row_id for (row_id,) in db.session.query(model.id).filter(model.id.in_(list(patches)))}
+        groups = {}
+        for row_id, values in patches.items():
+            if row_id in existing and values:
+                key = json.dumps(values, sort_keys=True)
+                groups.setdefault(key, (values, []))[1].append(row_id)
+        db.session.add_all(new_rows)
+        db.session.flush()
+        # Take the new ids now; after commit each access would reload the row
+        new_ids = []
+        for result in created:
+            if "row" in result:
+                result["id"] = result.pop("row").id
+                new_ids.append(result["id"])
+        for values, ids in groups.values():
+            CHANGES.update_ids(db.session, model, ids, values)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        log.exception("Bulk update failed")
+        return jsonify({"error": str(e)}), 500
+
+    ids = new_ids + list(existing)
+    rows = {}
+    if ids:
+        query = db.session.query(*schema.columns(model)).filter(model.id.in_(ids))
+        rows = {d["id"]: d for d in (schema.row_dict(r) for r in query)}
+    for result in created:
+        if result["status"] == 201:
+            result["data"] = rows.get(result["id"])
+    for i, result in enumerate(updated):
+        if result["status"] == 200:
+            if result["id"] in existing:
+                result["data"] = rows.get(result["id"])
+            else:
+                updated[i] = bulk_item_error(result["index"], 404, "not found", result["id"])
+    return Response(dumps({"created": created, "updated": updated}), mimetype="application/json")
+
+# -----------------------------
+# Change feed (replaces polling the list endpoints)
+# -----------------------------
+def requested_collections():
+    names = request.args.get("collections")
+    if not names:
+        return list(CHANGES.collections)
+    return [n.strip() for n in names.split(",") if n.strip() in CHANGES.collections]
+
+@api_bp.route("/changes", methods=["GET"])
+def get_changes():
+    """
+    Rows inserted/updated and ids deleted after ?since=<version>, for
+    ?collections=meetings,tasks,conflicts (default: all). Start from the
+    X-Change-Version header of a full list request.
+    """
+    since = request.args.get("since", default=0, type=int)
+    return changes_response(since, requested_collections())
+
+@api_bp.route("/changes/stream", methods=["GET"])
+def stream_changes():
+    """
+    Server-Sent Events push of the change feed. Resumes from ?since= or the
+    Last-Event-ID header that EventSource sends when it reconnects.
+    """
+    since = request.headers.get("Last-Event-ID", type=int)
+    if since is None:
+        since = request.args.get("since", type=int)
+    if since is None:
+        since = CHANGES.current_version(db.session)
+    stream = CHANGES.stream(db.session, since, requested_collections())
+    response = Response(stream_with_context(stream), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"  # don't let nginx buffer the stream
+    return response
+
+# -----------------------------
+# Token-streamed meeting summary
+# -----------------------------
+def sse_event(event, data):
+    return f"event: {event}\ndata: {dumps(data).decode('utf-8')}\n\n"
+
+@api_bp.route("/meetings/<int:meeting_id>/summary/stream", methods=["GET"])
+def stream_meeting_summary(meeting_id):
+    """
+    Server-Sent Events: summarize the stored transcript with token streaming.
+    Emits "token" {"chunk", "text"} as the model writes, then "done"
+    {"meeting_id", "summary", "version"} once Meeting.summary is saved (or
+    "error"). Close the EventSource on "done" so it does not reconnect and
+    summarize again. A client that disconnects stops the generation.
+    """
+    meeting = Meeting.query.get_or_404(meeting_id)
+    segments = segments_as_dicts(meeting.transcript_segments) or []
+    if not segments:
+        return jsonify({"error": "meeting has no stored transcript"}), 400
+    speaker_transcript, full_transcript = build_speaker_transcript(segments)
+    llm = get_phi3_model()
+    # Don't hold the read transaction open while the model runs
+    db.session.close()
+
+    def events():
+        parts = {}
+        try:
+            with metrics.llm_site("summary"):
+                for index, text in stream_transcript_summary(speaker_transcript, llm):
+                    parts[index] = parts.get(index, "") + text
+                    yield sse_event("token", {"chunk": index, "text": text})
+            summary = " ".join(p.strip() for _, p in sorted(parts.items()) if p.strip())
+            if not summary:
+                summary = fallback_summary(full_transcript, [], [])
+            meeting = db.session.get(Meeting, meeting_id)
+            if meeting is None:
+                yield sse_event("error", {"error": "meeting was deleted"})
+                return
+            meeting.summary = summary.strip()
+            db.session.commit()
+            yield sse_event("done", {"meeting_id": meeting_id, "summary": meeting.summary,
+                                     "version": meeting.version})
+        except Exception as e:
+            db.session.rollback()
+            log.exception("Summary stream failed")
+            yield sse_event("error", {"error": str(e)})
+
+    log.info("Streaming meeting summary", extra={"meeting_id": meeting_id})
+    response = Response(stream_with_context(events()), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
 # -----------------------------
 # SUMMARY ROUTES — CLEANED
 # -----------------------------
 # Old /summary(GET) & /summary(POST) SPLIT INTO UNIQUE ROUTES
 @api_bp.route("/summary/all", methods=["GET"])
+@etag_from_version(lambda *a, **kw: collection_version(db.session, Meeting))
 def get_all_summary():
     """Return aggregated highlights and decisions from ALL meetings."""
     try:
@@ -1394,10 +2820,11 @@ def get_all_summary():
             "decisions": all_decisions
         })
     except Exception as e:
-        traceback.print_exc()
+        log.exception("Request failed")
         return jsonify({"error": str(e)}), 500
 
 @api_bp.route("/summary/latest", methods=["GET"])
+@etag_from_version(lambda *a, **kw: collection_version(db.session, MeetingSummary))
 def get_latest_summary():
     """Return the most recent meeting summary."""
     latest = MeetingSummary.query.order_by(MeetingSummary.created_at.desc()).first()
@@ -1439,40 +2866,244 @@ def add_dummy_summary():
 def generate_mom(meeting_id):
     try:
         meeting = Meeting.query.get_or_404(meeting_id)
-        tasks = Task.query.filter_by(meeting_id=meeting_id).all()
-        conflicts = Conflict.query.filter_by(meeting_id=meeting_id).all()
-        transcript_segments = meeting.transcript_segments if hasattr(meeting, 'transcript_segments') and meeting.transcript_segments else None
-        from utils.mom_generator import generate_mom_document
-        mom_file_path = generate_mom_document(
-            meeting_data=meeting,
-            tasks=tasks,
-            conflicts=conflicts,
-            transcript_segments=transcript_segments
-        )
-        meeting.mom_file_path = mom_file_path
-        db.session.commit()
-        mom_filename = os.path.basename(mom_file_path)
-        mom_download_url = f"/api/download/{mom_filename}"
-        return jsonify({"message": "MoM document generated successfully", "file_path": mom_file_path, "download_url": mom_download_url, "filename": mom_filename}), 200
+        previous_hash = meeting.mom_content_hash
+        had_file = bool(meeting.mom_file_path) and os.path.exists(meeting.mom_file_path)
+        force = request.args.get("force", "").lower() in ("1", "true", "yes")
+        mom_file_path, _, _ = generate_meeting_mom(meeting, force=force)
+        info = mom_file_info(mom_file_path, meeting.id)
+        mom_filename = info["filename"]
+        mom_download_url = info["download_url"]
+        return jsonify({
+            "message": "MoM document generated successfully",
+            "file_path": mom_file_path,
+            "download_url": mom_download_url,
+            "filename": mom_filename,
+            "regenerated": force or not had_file or meeting.mom_content_hash != previous_hash
+        }), 200
     except Exception as e:
-        traceback.print_exc()
+        log.exception("Request failed")
         return jsonify({"error": str(e)}), 500
 
-FILES_DIR = os.path.join(os.getcwd(), "files")
-os.makedirs(FILES_DIR, exist_ok=True)
+@api_bp.route("/meetings/<int:meeting_id>/export", methods=["GET"])
+def export_meeting(meeting_id):
+    """
+    Render the MoM on demand as ?format=markdown|html|json|pdf|docx.
+    Nothing is written to files/; output is cached by content hash and the
+    ETag lets clients revalidate with If-None-Match for a 304.
+    """
+    from utils.exporters import get_exporter, export_formats, export_etag, render_export
+    from utils.mom_generator import snapshot_mom_inputs, mom_content_hash
+    exporter = get_exporter(request.args.get("format", "markdown"))
+    if exporter is None:
+        return jsonify({"error": "Unsupported format", "formats": export_formats()}), 400
+    meeting = Meeting.query.get_or_404(meeting_id)
+    tasks = Task.query.filter_by(meeting_id=meeting_id).order_by(Task.id).all()
+    conflicts = Conflict.query.filter_by(meeting_id=meeting_id).order_by(Conflict.id).all()
+    snapshot = snapshot_mom_inputs(meeting, tasks, conflicts)
+    content_hash = mom_content_hash(snapshot)
+    etag = export_etag(exporter, content_hash)
+    # Weak comparison: compression turns the ETag weak on the way out
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        data, cache_hit = render_export(exporter, snapshot, content_hash)
+        metrics.CACHE_REQUESTS.inc(cache="export", result="hit" if cache_hit else "miss")
+        response = Response(data, content_type=exporter.mimetype)
+        response.headers["Content-Disposition"] = (
+            f'attachment; filename="MoM_{meeting_id}.{exporter.extension}"'
+        )
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+from concurrent.futures.process import BrokenProcessPool
+
+MOM_BATCH_WORKERS = int(os.environ.get("MOM_BATCH_WORKERS", str(min(4, os.cpu_count() or 1))))
+MOM_BATCH_LIMIT = 500
+_mom_pool = None
+
+def get_mom_pool():
+    """Process pool for batch DOCX rendering (rendering is CPU-bound)."""
+    global _mom_pool
+    if _mom_pool is None:
+        from concurrent.futures import ProcessPoolExecutor
+        _mom_pool = ProcessPoolExecutor(max_workers=MOM_BATCH_WORKERS)
+    return _mom_pool
+
+@api_bp.route("/generate_mom/batch", methods=["POST"])
+def generate_mom_batch():
+    """
+    Regenerate MoMs for many meetings at once.
+    Body: {"meeting_ids": [...], "force": false}; omit meeting_ids for all meetings.
+    Meetings whose content hash is unchanged are skipped; the rest are rendered
+    in a process pool from plain snapshots of the DB rows.
+    """
+    global _mom_pool
+    from utils.mom_generator import snapshot_mom_inputs, mom_content_hash, render_snapshot, FILES_DIR as MOM_DIR
+    data = request.get_json(silent=True) or {}
+    force = bool(data.get("force"))
+    ids = data.get("meeting_ids")
+    query = Meeting.query
+    if ids is not None:
+        if not isinstance(ids, list) or not all(isinstance(i, int) for i in ids):
+            return jsonify({"error": "meeting_ids must be a list of integers"}), 400
+        query = query.filter(Meeting.id.in_(ids))
+    meetings = query.order_by(Meeting.id).limit(MOM_BATCH_LIMIT).all()
+    meeting_ids = [m.id for m in meetings]
+    # Two queries for all tasks/conflicts instead of two per meeting
+    tasks_by_meeting, conflicts_by_meeting = {}, {}
+    for t in Task.query.filter(Task.meeting_id.in_(meeting_ids)).order_by(Task.id).all():
+        tasks_by_meeting.setdefault(t.meeting_id, []).append(t)
+    for c in Conflict.query.filter(Conflict.meeting_id.in_(meeting_ids)).order_by(Conflict.id).all():
+        conflicts_by_meeting.setdefault(c.meeting_id, []).append(c)
+
+    results = {i: "missing" for i in (ids or [])}
+    pending = {}
+    by_id = {}
+    for m in meetings:
+        by_id[m.id] = m
+        snapshot = snapshot_mom_inputs(m, tasks_by_meeting.get(m.id, []), conflicts_by_meeting.get(m.id, []))
+        content_hash = mom_content_hash(snapshot)
+        if not force and mom_is_current(m, content_hash):
+            results[m.id] = "unchanged"
+        else:
+            pending[m.id] = (snapshot, content_hash)
+
+    if pending:
+        pool = get_mom_pool()
+        futures = {pool.submit(render_snapshot, snap, MOM_DIR): mid for mid, (snap, _) in pending.items()}
+        for future, mid in futures.items():
+            try:
+                _, path = future.result()
+            except BrokenProcessPool as e:
+                _mom_pool = None
+                log.warning("MoM render pool crashed", extra={"meeting_id": mid, "error": str(e)})
+                results[mid] = "error"
+                continue
+            except Exception as e:
+                log.warning("MoM render failed", extra={"meeting_id": mid, "error": str(e)})
+                results[mid] = "error"
+                continue
+            by_id[mid].mom_file_path = path
+            by_id[mid].mom_content_hash = pending[mid][1]
+            results[mid] = "generated"
+        db.session.commit()
+
+    counts = {}
+    for status in results.values():
+        counts[status] = counts.get(status, 0) + 1
+    return jsonify({
+        "results": [{"meeting_id": mid, "status": status} for mid, status in sorted(results.items())],
+        "counts": counts,
+        "truncated": len(meetings) == MOM_BATCH_LIMIT and ids is None
+    })
+
+FILES_DIR = ARTIFACTS.root
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+def referenced_artifacts():
+    """Basenames of files still referenced by Meeting rows (the store's refcount)."""
+    with app.app_context():
+        rows = db.session.query(Meeting.mom_file_path).filter(Meeting.mom_file_path.isnot(None)).all()
+    return {os.path.basename(path) for (path,) in rows if path}
+
+def rebuild_evicted_mom(filename):
+    """Re-render a MoM whose content-addressed file was evicted by the store."""
+    meeting = Meeting.query.filter(Meeting.mom_file_path.like(f"%{filename}")).first()
+    if meeting is None:
+        return None, None
+    mom_file_path, _, _ = generate_meeting_mom(meeting, force=True)
+    return mom_file_path, meeting.id
 
 @api_bp.route("/download/<filename>", methods=["GET"])
 def download_file(filename):
+    """
+    Serve a generated file. send_file streams it with the WSGI file wrapper
+    (sendfile where available), honours Range and If-None-Match, and
+    content-addressed files are cached as immutable.
+    """
     try:
-        # Safe path join
-        filepath = os.path.join(FILES_DIR, filename)
-        if not os.path.exists(filepath):
+        filepath = safe_join(FILES_DIR, filename)
+        if filepath is None or filename in (".gitkeep",) or filename.endswith(".tmp"):
             return jsonify({"error": "File not found"}), 404
-        return send_from_directory(FILES_DIR, filename, as_attachment=True)
+        download_name = secure_filename(request.args.get("name", "")) or filename
+        immutable = is_content_addressed(filename)
+        try:
+            response = send_file(
+                filepath, as_attachment=True, download_name=download_name, conditional=True,
+                etag=filename.split(".")[0] if immutable else True,
+                max_age=IMMUTABLE_MAX_AGE if immutable else 0,
+            )
+        except FileNotFoundError:
+            if not immutable:
+                return jsonify({"error": "File not found"}), 404
+            rebuilt_path, meeting_id = rebuild_evicted_mom(filename)
+            if not rebuilt_path:
+                return jsonify({"error": "File not found"}), 404
+            # A newer render may have a different hash; send the client there
+            info = mom_file_info(rebuilt_path, meeting_id)
+            return Response(status=307, headers={"Location": info["download_url"]})
+        if immutable:
+            response.headers["Cache-Control"] = f"public, max-age={IMMUTABLE_MAX_AGE}, immutable"
+            ARTIFACTS.touch(filepath)
+        return response
     except Exception as e:
-        traceback.print_exc()
+        log.exception("Request failed")
         return jsonify({"error": str(e)}), 500
 
+@api_bp.route("/admin/artifacts", methods=["GET"])
+def artifact_stats():
+    require_admin()
+    return jsonify(ARTIFACTS.stats(referenced_artifacts()))
+
+@api_bp.route("/admin/artifacts/gc", methods=["POST"])
+def artifact_gc():
+    require_admin()
+    return jsonify(ARTIFACTS.collect(referenced_artifacts()))
+
+# -----------------------------
+# Admin: request profiles
+# -----------------------------
+def is_admin():
+    token = request.headers.get("X-Admin-Token") or ""
+    return bool(ADMIN_TOKEN) and hmac.compare_digest(token.encode("utf-8"), ADMIN_TOKEN.encode("utf-8"))
+
+def require_admin():
+    if not is_admin():
+        abort(403)
+
+@api_bp.route("/admin/profiles", methods=["GET"])
+def list_request_profiles():
+    require_admin()
+    meeting_id = request.args.get("meeting_id", type=int)
+    return jsonify(request_profiler.list_profiles(meeting_id))
+
+@api_bp.route("/admin/profiles/<profile_id>", methods=["GET"])
+def get_request_profile(profile_id):
+    """Timeline (stages, LLM calls, SQL) and top functions of a stored profile."""
+    require_admin()
+    found = request_profiler.find_profile(profile_id)
+    if not found:
+        return jsonify({"error": "Profile not found"}), 404
+    return send_file(os.path.join(found[0], f"{profile_id}.json"), mimetype="application/json")
+
+@api_bp.route("/admin/profiles/<profile_id>/download", methods=["GET"])
+def download_request_profile(profile_id):
+    """Raw cProfile dump (open with pstats or snakeviz)."""
+    require_admin()
+    found = request_profiler.find_profile(profile_id)
+    if not found or not os.path.exists(os.path.join(found[0], f"{profile_id}.prof")):
+        return jsonify({"error": "Profile not found"}), 404
+    return send_file(os.path.join(found[0], f"{profile_id}.prof"), as_attachment=True,
+                     download_name=f"{profile_id}.prof", mimetype="application/octet-stream")
+
+# -----------------------------
+# Prometheus metrics
+# -----------------------------
+@app.route("/metrics")
+def prometheus_metrics():
+    return Response(metrics.REGISTRY.render(), content_type=metrics.CONTENT_TYPE)
+
 # -----------------------------
 # Serve frontend SPA static files
 # -----------------------------
@@ -1487,8 +3118,39 @@ def serve_frontend(path):
 # Register Blueprint & init DB
 # -----------------------------
 app.register_blueprint(api_bp, url_prefix="/api")
+def ensure_columns():
+    """
+    Add columns declared on the models but missing from existing tables.
+    create_all() only creates new tables, so databases from older versions
+    would otherwise fail on the first query that touches a new column.
+    """
+    from sqlalchemy import inspect, text
+    inspector = inspect(db.engine)
+    for table in db.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {c["name"] for c in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            col_type = column.type.compile(dialect=db.engine.dialect)
+            with db.engine.begin() as conn:
+                conn.execute(text(f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {col_type}'))
+            log.info("Added missing column", extra={"table": table.name, "column": column.name})
+        for index in table.indexes:
+            index.create(db.engine, checkfirst=True)
+
 with app.app_context():
     db.create_all()
+    ensure_columns()
+    CHANGES.ensure_sequence(db.session)
+    JOBS.bind(db.engine)
+    metrics.instrument_sqlalchemy(db.engine)
+ARTIFACTS.start_gc(referenced_artifacts)
+try:
+    DEADLINES.preload()
+except Exception as e:
+    log.warning("Deadline parser preload failed", extra={"error": str(e)})
 
 # -----------------------------
 # Run server
@@ -0,0 +1,267 @@
+"""
+Runtime auto-tuner for llama-cpp and Faster-Whisper.
+
+Sweeps LLM threads, batch size and GGUF quantization, and Whisper compute
+type, cpu_threads, num_workers and beam_size on this host against a fixed
+sample transcript and audio file. The fastest configuration whose output is
+still usable (the LLM must return a parseable JSON task list; Whisper must
+stay within --max-wer of the current production settings) is written to the
+runtime profile that app.py's model loaders read at startup.
+
+The sweep is coordinate-wise (threads first, then batch / beam size /
+workers at the best threads), which keeps it to a few dozen runs.
+
+    python -m benchmarks.autotune --audio sample.wav --transcript sample.txt
+    python -m benchmarks.autotune --skip-asr --models models/phi3-*.gguf --dry-run
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime, timezone
+
+from benchmarks.bench_task_extraction import synthetic_transcript
+from utils import runtime_profile
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODELS_DIR = os.path.join(REPO_DIR, "models")
+DEFAULT_GGUF = "phi3-finetuned-Q4_K_M.gguf"
+WHISPER_DIR = os.path.join(MODELS_DIR, "MinuteMind", "faster-whisper")
+# The settings the loaders use without a profile; Whisper quality is measured against these
+BASELINE_ASR = {"compute_type": "int8", "cpu_threads": 0, "num_workers": 1, "beam_size": 5}
+
+EXTRACTION_PROMPT = """Extract ACTIONABLE TASKS from this meeting transcript.
+Return ONLY a JSON array of objects with keys "task_name", "assigned_to", "due_date".
+
+Transcript:
+{transcript}
+"""
+
+
+def thread_candidates(cpu_count):
+    cpu_count = cpu_count or 4
+    return sorted({max(1, cpu_count // 4), max(1, cpu_count // 2), max(1, (cpu_count * 3) // 4), cpu_count})
+
+
+def best(results, key="seconds"):
+    ok = [r for r in results if r.get("ok")]
+    return min(ok, key=lambda r: r[key]) if ok else None
+
+
+# -----------------------------
+# llama-cpp
+# -----------------------------
+def parses_as_list(text):
+    match = re.search(r"\[.*\]", text or "", re.DOTALL)
+    if not match:
+        return False
+    try:
+        return isinstance(json.loads(match.group(0)), list)
+    except Exception:
+        return False
+
+
+def measure_llm(model_path, prompt, n_ctx, n_threads, n_batch, max_tokens, repeat):
+    from llama_cpp import Llama
+
+    config = {"model_file": os.path.basename(model_path), "n_ctx": n_ctx,
+              "n_threads": n_threads, "n_threads_batch": n_threads, "n_batch": n_batch}
+    t0 = time.perf_counter()
+    llm = Llama(model_path=model_path, n_ctx=n_ctx, n_threads=n_threads, n_threads_batch=n_threads,
+                n_batch=n_batch, verbose=False)
+    load_seconds = time.perf_counter() - t0
+    runs = []
+    text = ""
+    for _ in range(repeat):
+        llm.reset()  # no KV-cache reuse between runs: every run evaluates the full prompt
+        start = time.perf_counter()
+        out = llm(prompt=prompt, max_tokens=max_tokens, temperature=0.0)
+        runs.append((time.perf_counter() - start, out.get("usage") or {}))
+        text = out["choices"][0]["text"]
+    seconds, usage = min(runs, key=lambda r: r[0])
+    del llm
+    return dict(
+        config,
+        seconds=round(seconds, 3),
+        load_seconds=round(load_seconds, 3),
+        prompt_tokens=usage.get("prompt_tokens", 0),
+        completion_tokens=usage.get("completion_tokens", 0),
+        tokens_per_second=round((usage.get("completion_tokens") or 0) / seconds, 2) if seconds else 0.0,
+        ok=parses_as_list(text),
+    )
+
+
+def tune_llm(model_paths, transcript, args):
+    prompt = EXTRACTION_PROMPT.format(transcript=transcript)
+    results = []
+
+    def run(model_path, n_threads, n_batch):
+        result = measure_llm(model_path, prompt, args.n_ctx, n_threads, n_batch, args.max_tokens, args.repeat)
+        results.append(result)
+        print(f"llm {result['model_file']} threads={n_threads} batch={n_batch}: "
+              f"{result['seconds']}s ok={result['ok']}", flush=True)
+        return result
+
+    for model_path in model_paths:
+        by_threads = [run(model_path, t, 512) for t in thread_candidates(os.cpu_count())]
+        top = best(by_threads)
+        if top is None:
+            continue
+        for n_batch in (128, 256, 1024):
+            if n_batch <= args.n_ctx:
+                run(model_path, top["n_threads"], n_batch)
+    winner = best(results)
+    if winner is None:
+        return None, results
+    settings = {k: winner[k] for k in runtime_profile.LLM_KEYS}
+    settings.update(seconds=winner["seconds"], tokens_per_second=winner["tokens_per_second"])
+    return settings, results
+
+
+# -----------------------------
+# Faster-Whisper
+# -----------------------------
+def word_error_rate(reference, hypothesis):
+    ref, hyp = reference.lower().split(), hypothesis.lower().split()
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    previous = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, start=1):
+        current = [i] + [0] * len(hyp)
+        for j, h in enumerate(hyp, start=1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (r != h))
+        previous = current
+    return previous[-1] / len(ref)
+
+
+def measure_asr(audio_path, compute_type, cpu_threads, num_workers, beam_size, repeat):
+    """Seconds for `num_workers` concurrent transcriptions of the sample (best of `repeat`)."""
+    from faster_whisper import WhisperModel
+
+    model = WhisperModel(WHISPER_DIR, device="cpu", compute_type=compute_type,
+                         cpu_threads=cpu_threads, num_workers=num_workers)
+    texts, duration = [], 0.0
+
+    def transcribe():
+        nonlocal duration
+        segments, info = model.transcribe(audio_path, beam_size=beam_size, vad_filter=True,
+                                          vad_parameters={"min_silence_duration_ms": 500})
+        texts.append(" ".join(s.text.strip() for s in segments))
+        duration = float(info.duration or 0.0)
+
+    best_seconds = None
+    for _ in range(repeat):
+        texts.clear()
+        start = time.perf_counter()
+        workers = [threading.Thread(target=transcribe) for _ in range(num_workers)]
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+        seconds = time.perf_counter() - start
+        best_seconds = seconds if best_seconds is None else min(best_seconds, seconds)
+    audio_seconds = duration * num_workers
+    return {
+        "compute_type": compute_type, "cpu_threads": cpu_threads,
+        "num_workers": num_workers, "beam_size": beam_size,
+        "seconds": round(best_seconds, 3),
+        # Throughput measure comparable across worker counts
+        "rtf": round(best_seconds / audio_seconds, 4) if audio_seconds else None,
+        "text": texts[0] if texts else "",
+    }
+
+
+def tune_asr(audio_path, args):
+    results = []
+
+    def run(compute_type, cpu_threads, num_workers, beam_size):
+        result = measure_asr(audio_path, compute_type, cpu_threads, num_workers, beam_size, args.repeat)
+        result["wer"] = round(word_error_rate(reference, result.pop("text")), 4)
+        result["ok"] = result["rtf"] is not None and result["wer"] <= args.max_wer
+        results.append(result)
+        print(f"asr {compute_type} threads={cpu_threads} workers={num_workers} beam={beam_size}: "
+              f"rtf={result['rtf']} wer={result['wer']} ok={result['ok']}", flush=True)
+        return result
+
+    reference = measure_asr(audio_path, repeat=1, **BASELINE_ASR)["text"]
+    for compute_type in ("int8", "int8_float32", "float32"):
+        for cpu_threads in thread_candidates(os.cpu_count()):
+            run(compute_type, cpu_threads, 1, BASELINE_ASR["beam_size"])
+    top = best(results, key="rtf")
+    if top is None:
+        return None, results
+    for beam_size in (1, 2, 3):
+        run(top["compute_type"], top["cpu_threads"], 1, beam_size)
+    top = best(results, key="rtf")
+    if (os.cpu_count() or 1) >= 4:
+        run(top["compute_type"], max(1, top["cpu_threads"] // 2), 2, top["beam_size"])
+    winner = best(results, key="rtf")
+    settings = {k: winner[k] for k in runtime_profile.ASR_KEYS}
+    settings.update(rtf=winner["rtf"], wer=winner["wer"])
+    return settings, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--transcript", help="sample transcript file (default: synthetic 3 KB transcript)")
+    parser.add_argument("--audio", help="sample audio file for the Whisper sweep")
+    parser.add_argument("--models", nargs="*",
+                        help="GGUF files to compare (quantization choice); default: models/phi3*.gguf")
+    parser.add_argument("--n-ctx", type=int, default=4096)
+    parser.add_argument("--max-tokens", type=int, default=256)
+    parser.add_argument("--max-wer", type=float, default=0.05,
+                        help="max word error rate vs. the untuned Whisper settings")
+    parser.add_argument("--repeat", type=int, default=2)
+    parser.add_argument("--skip-llm", action="store_true")
+    parser.add_argument("--skip-asr", action="store_true")
+    parser.add_argument("-o", "--output", default=runtime_profile.PROFILE_PATH)
+    parser.add_argument("--dry-run", action="store_true", help="print the profile without writing it")
+    args = parser.parse_args()
+
+    # Start from the existing profile so a partial sweep keeps the other section
+    profile = {}
+    if os.path.exists(args.output):
+        with open(args.output, encoding="utf-8") as fh:
+            profile = json.load(fh)
+    profile["created_at"] = datetime.now(timezone.utc).isoformat()
+    measurements = profile.setdefault("measurements", {})
+
+    if not args.skip_llm:
+        model_paths = args.models or sorted(glob.glob(os.path.join(MODELS_DIR, "phi3*.gguf")))
+        if not model_paths:
+            parser.error(f"no GGUF models found (expected {os.path.join(MODELS_DIR, DEFAULT_GGUF)})")
+        if args.transcript:
+            with open(args.transcript, encoding="utf-8") as fh:
+                transcript = fh.read()
+        else:
+            transcript = synthetic_transcript(3 * 1024)
+        settings, results = tune_llm(model_paths, transcript, args)
+        measurements["llm"] = results
+        if settings:
+            profile["llm"] = settings
+        else:
+            print("No LLM configuration produced a parseable task list; llm section not updated")
+
+    if not args.skip_asr:
+        if not args.audio:
+            print("No --audio given; skipping the Whisper sweep")
+        else:
+            settings, results = tune_asr(args.audio, args)
+            measurements["asr"] = results
+            if settings:
+                profile["asr"] = settings
+
+    if args.dry_run:
+        print(json.dumps(profile, indent=2))
+        return
+    path = runtime_profile.write_profile(profile, args.output)
+    print(json.dumps({k: profile.get(k) for k in ("llm", "asr")}, indent=2))
+    print(f"Wrote {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark: draining the pipeline job queue with several worker processes.
+
+Seeds meetings, enqueues one "reprocess" job per meeting and starts
+--workers processes running utils.job_queue.Worker with the stub models from
+benchmarks.stub_models. With --kill-after one worker is SIGKILLed mid-run; its
+leased job is picked up again once the (short) visibility timeout expires.
+Reports wall time, jobs/sec, jobs per worker and attempts, and checks every
+job succeeded. Uses a throwaway SQLite database unless --database-url is given
+(e.g. postgresql://localhost/mom_bench).
+
+    python -m benchmarks.bench_jobs --jobs 200 --workers 4
+    python -m benchmarks.bench_jobs --jobs 50 --workers 3 --kill-after 1 --visibility 3
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import signal
+import tempfile
+import time
+from collections import Counter
+
+from benchmarks.bench_pipeline import install_stub_models, seed_database, setup_environment
+
+
+def worker_process(args):
+    import app as app_module
+    from utils.job_queue import QUEUED, RUNNING, Worker
+
+    install_stub_models(app_module, args)
+    worker = Worker(app_module.JOBS, app_module.JOB_HANDLERS, poll=0.2, context=app_module.app.app_context)
+    Job = app_module.Job
+    while True:
+        worker.run(exit_when_idle=True)
+        # Stay around while another worker's lease may still expire and need a retry
+        with app_module.app.app_context():
+            pending = Job.query.filter(Job.status.in_([QUEUED, RUNNING])).count()
+        if not pending:
+            return
+        time.sleep(0.2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--visibility", type=float, default=5.0, help="lease seconds (MOM_JOB_VISIBILITY_SECONDS)")
+    parser.add_argument("--kill-after", type=float, help="SIGKILL the first worker after this many seconds")
+    parser.add_argument("--database-url", help="default: SQLite file in a temp dir")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--asr-rtf", type=float, default=0.05)
+    parser.add_argument("--llm-latency", type=float, default=0.02)
+    parser.add_argument("--llm-tokens-per-second", type=float, default=500.0)
+    parser.add_argument("--llm-commentary-tokens", type=int, default=0)
+    parser.add_argument("--llm-pool-size", type=int, default=1)
+    parser.add_argument("-o", "--output")
+    args = parser.parse_args()
+
+    setup_environment(tempfile.mkdtemp(prefix="mom-bench-jobs-"))
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    os.environ["MOM_JOB_VISIBILITY_SECONDS"] = str(args.visibility)
+    os.environ["MOM_JOB_RETRY_BACKOFF_SECONDS"] = "0.5"
+
+    import app as app_module
+    from utils.job_queue import SUCCEEDED
+
+    Job = app_module.Job
+    with app_module.app.app_context():
+        first_job = (app_module.db.session.query(app_module.db.func.max(Job.id)).scalar() or 0) + 1
+        seed_database(app_module, args.jobs, 2, seed=args.seed)
+        meeting_ids = [m.id for m in app_module.Meeting.query.order_by(app_module.Meeting.id.desc()).limit(args.jobs)]
+        for meeting_id in meeting_ids:
+            app_module.JOBS.enqueue(app_module.db.session, "reprocess",
+                                    {"stages": ["tasks", "conflicts", "summary"]}, meeting_id=meeting_id)
+
+    ctx = multiprocessing.get_context("spawn")
+    workers = [ctx.Process(target=worker_process, args=(args,)) for _ in range(args.workers)]
+    start = time.perf_counter()
+    for p in workers:
+        p.start()
+    killed = None
+    if args.kill_after is not None:
+        time.sleep(args.kill_after)
+        killed = workers[0].pid
+        os.kill(killed, signal.SIGKILL)
+    for p in workers:
+        p.join()
+    seconds = time.perf_counter() - start
+
+    with app_module.app.app_context():
+        jobs = Job.query.filter(Job.id >= first_job).all()
+        statuses = Counter(j.status for j in jobs)
+        report = {
+            "benchmark": "job_queue",
+            "database": app_module.db.engine.dialect.name,
+            "jobs": len(jobs),
+            "workers": args.workers,
+            "killed_worker_pid": killed,
+            "seconds": round(seconds, 3),
+            "jobs_per_second": round(len(jobs) / seconds, 2) if seconds else 0.0,
+            "statuses": dict(statuses),
+            "attempts": dict(Counter(j.attempts for j in jobs)),
+            "jobs_per_worker": dict(Counter(j.lease_owner for j in jobs if j.status == SUCCEEDED)),
+            "ok": statuses.get(SUCCEEDED, 0) == len(jobs),
+        }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            fh.write(text + "\n")
+    print(text)
+    return 0 if report["ok"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
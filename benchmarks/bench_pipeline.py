@@ -0,0 +1,258 @@
+"""
+Benchmark: end-to-end MoM pipeline with stub models.
+
+Drives /api/transcribe_and_summarize, /api/process_transcript, the list
+endpoints, normalize_temporal_segments, extract_tasks_from_transcript_regex
+and generate_mom_document against a throwaway SQLite database. WhisperModel and
+Llama are replaced by the deterministic stand-ins in benchmarks.stub_models, so
+no model files are needed. The JSON report is meant to be diffed between commits.
+
+    python -m benchmarks.bench_pipeline --transcript-kb 8 32 --audio-seconds 60 -o report.json
+    python -m benchmarks.bench_pipeline --baseline old.json
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+
+from benchmarks.bench_task_extraction import NAMES, synthetic_transcript
+from benchmarks.stub_models import SAMPLE_RATE, StubLlama, StubWhisperModel
+
+
+def setup_environment(workdir):
+    """Point the DB, spool, artifact and profile dirs at `workdir`; must run before importing app."""
+    os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(workdir, "bench.db")
+    os.environ["MOM_SPOOL_DIR"] = os.path.join(workdir, "spool")
+    os.environ["MOM_FILES_DIR"] = os.path.join(workdir, "files")
+    os.environ["MOM_PROFILE_DIR"] = os.path.join(workdir, "profiles")
+    os.environ["MOM_ARTIFACT_GC_INTERVAL"] = "0"
+    os.environ.setdefault("MOM_LOG_LEVEL", "WARNING")
+    os.chdir(workdir)
+
+
+def install_stub_models(app_module, args):
+    from utils import metrics
+    from utils.inference_pool import InferencePool, PooledLLM
+
+    lines = synthetic_transcript(64 * 1024, seed=args.seed).splitlines()
+    app_module._faster_whisper_model = StubWhisperModel(lines, rtf=args.asr_rtf)
+    pool = InferencePool(
+        lambda: StubLlama(args.llm_latency, args.llm_tokens_per_second, seed=args.seed,
+                          commentary_tokens=args.llm_commentary_tokens),
+        size=args.llm_pool_size,
+    )
+    pool.warm()
+    app_module._phi3_model = PooledLLM(pool, observer=metrics.observe_llm_call)
+
+
+def synthetic_wav(seconds):
+    """Mono 16-bit WAV of a quiet tone (loud enough not to be trimmed as silence)."""
+    import numpy as np
+
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    samples = (0.1 * np.sin(2 * np.pi * 220 * t) * 32767).astype("<i2")
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(SAMPLE_RATE)
+        w.writeframes(samples.tobytes())
+    return buf.getvalue()
+
+
+def synthetic_segments(n, seed=0):
+    lines = synthetic_transcript(n * 80, seed=seed).splitlines()
+    segments = []
+    t = 0.0
+    for i in range(n):
+        speaker, _, text = lines[i % len(lines)].partition(": ")
+        # Every third segment continues the previous speaker so merging has work to do
+        if i % 3 == 2 and segments:
+            speaker = segments[-1]["speaker"]
+        segments.append({"start": t, "end": t + 3.0, "speaker": speaker, "text": text})
+        t += 3.2
+    return segments
+
+
+def seed_database(app_module, meetings, tasks_per_meeting, seed=0):
+    db, Meeting, Task, Conflict = app_module.db, app_module.Meeting, app_module.Task, app_module.Conflict
+    from utils.segment_table import SegmentTable
+
+    segments = SegmentTable.from_dicts(synthetic_segments(40, seed))
+    for m in range(meetings):
+        meeting = Meeting(title=f"Bench meeting {m}", summary="Synthetic meeting.",
+                          transcript_segments=segments, speakers=", ".join(NAMES))
+        db.session.add(meeting)
+        db.session.flush()
+        for i in range(tasks_per_meeting):
+            db.session.add(Task(person=NAMES[i % len(NAMES)], task=f"Task {m}.{i}",
+                                deadline="next week", status="Pending", notes="", meeting_id=meeting.id))
+        db.session.add(Conflict(issue=f"Issue {m}", raised_by=NAMES[m % len(NAMES)], severity="Low",
+                                participants=", ".join(NAMES[:2]), stance="", resolution="",
+                                topic="Planning", meeting_id=meeting.id))
+    db.session.commit()
+
+
+def measure(fn, repeat, warmup=1):
+    for _ in range(warmup):
+        fn()
+    samples = []
+    extra = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        extra = fn()
+        samples.append(time.perf_counter() - t0)
+    row = {
+        "runs": repeat,
+        "mean_s": round(statistics.fmean(samples), 5),
+        "median_s": round(statistics.median(samples), 5),
+        "min_s": round(min(samples), 5),
+        "max_s": round(max(samples), 5),
+    }
+    if isinstance(extra, dict):
+        row.update(extra)
+    return row
+
+
+def _check(resp):
+    if resp.status_code >= 400:
+        raise RuntimeError(f"{resp.request.path} -> {resp.status_code}: {resp.get_data(as_text=True)[:300]}")
+    return resp
+
+
+def run(args):
+    workdir = tempfile.mkdtemp(prefix="mom_bench_")
+    setup_environment(workdir)
+    import app as app_module
+    from utils.mom_generator import generate_mom_document
+    from utils.temporal_normalization import normalize_temporal_segments
+
+    install_stub_models(app_module, args)
+    client = app_module.app.test_client()
+    results = {}
+
+    # --- Pure functions ---
+    for n in args.segments:
+        segs = synthetic_segments(n, args.seed)
+        results[f"normalize_temporal_segments[{n}]"] = measure(
+            lambda: normalize_temporal_segments(segs, merge_threshold=0.5), args.repeat)
+    for kb in args.transcript_kb:
+        text = synthetic_transcript(kb * 1024, seed=args.seed)
+        results[f"extract_tasks_from_transcript_regex[{kb}kb]"] = measure(
+            lambda: {"tasks": len(app_module.extract_tasks_from_transcript_regex(text))}, args.repeat)
+
+    # --- Endpoints ---
+    with app_module.app.app_context():
+        for kb in args.transcript_kb:
+            text = synthetic_transcript(kb * 1024, seed=args.seed)
+            results[f"POST /api/process_transcript[{kb}kb]"] = measure(
+                lambda: _check(client.post("/api/process_transcript",
+                                           json={"transcript": text, "date": "2025-01-06"})) and None,
+                args.repeat)
+
+        for seconds in args.audio_seconds:
+            audio = synthetic_wav(seconds)
+            stage_samples = {}
+
+            def transcribe_and_summarize():
+                resp = _check(client.post(
+                    "/api/transcribe_and_summarize",
+                    data={"audio": (io.BytesIO(audio), "bench.wav"), "date": "2025-01-06"},
+                    content_type="multipart/form-data",
+                ))
+                for stage, timing in resp.get_json()["timings"]["stages"].items():
+                    stage_samples.setdefault(stage, []).append(timing["duration"])
+
+            row = measure(transcribe_and_summarize, args.repeat)
+            row["stages_mean_s"] = {k: round(statistics.fmean(v), 5) for k, v in sorted(stage_samples.items())}
+            results[f"POST /api/transcribe_and_summarize[{seconds}s]"] = row
+
+        meeting = app_module.Meeting.query.order_by(app_module.Meeting.id.desc()).first()
+        if meeting is not None:
+            tasks = app_module.Task.query.filter_by(meeting_id=meeting.id).all()
+            conflicts = app_module.Conflict.query.filter_by(meeting_id=meeting.id).all()
+            results["generate_mom_document"] = measure(
+                lambda: generate_mom_document(meeting, tasks, conflicts) and None, args.repeat)
+
+        seed_database(app_module, args.list_meetings, args.tasks_per_meeting, args.seed)
+        for path in ("/api/meetings", "/api/tasks", "/api/conflicts", "/api/summary/all"):
+            results[f"GET {path}"] = measure(
+                lambda: {"bytes": len(_check(client.get(path)).get_data())}, args.repeat)
+
+    return {
+        "benchmark": "pipeline",
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "config": {k: v for k, v in vars(args).items() if k not in ("output", "baseline")},
+        "results": results,
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            stderr=subprocess.DEVNULL, text=True,
+        ).strip()
+    except Exception:
+        return None
+
+
+def compare(report, baseline):
+    """Per-benchmark mean ratio (current / baseline); >1 means slower."""
+    out = {}
+    for name, row in report["results"].items():
+        old = baseline.get("results", {}).get(name)
+        if old and old.get("mean_s"):
+            out[name] = round(row["mean_s"] / old["mean_s"], 3)
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--transcript-kb", nargs="+", type=int, default=[8, 64], help="transcript sizes in KB")
+    parser.add_argument("--audio-seconds", nargs="+", type=float, default=[60], help="synthetic audio lengths")
+    parser.add_argument("--segments", nargs="+", type=int, default=[1000, 10000], help="segment counts")
+    parser.add_argument("--list-meetings", type=int, default=200, help="meetings seeded for list endpoints")
+    parser.add_argument("--tasks-per-meeting", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--asr-rtf", type=float, default=0.05, help="stub ASR seconds per audio second")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="stub LLM fixed latency per call")
+    parser.add_argument("--llm-tokens-per-second", type=float, default=200.0)
+    parser.add_argument("--llm-commentary-tokens", type=int, default=0,
+                        help="stub LLM prose tokens after each JSON answer (cut short by streamed extraction)")
+    parser.add_argument("--llm-pool-size", type=int, default=int(os.environ.get("MOM_LLM_POOL_SIZE", "1")))
+    parser.add_argument("-o", "--output", help="write the JSON report here as well as stdout")
+    parser.add_argument("--baseline", help="previous report to compare against")
+    args = parser.parse_args()
+
+    # Paths are resolved before run() changes into the scratch directory
+    output = os.path.abspath(args.output) if args.output else None
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as fh:
+            baseline = json.load(fh)
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    report = run(args)
+    if baseline is not None:
+        report["vs_baseline"] = {"baseline_commit": baseline.get("git_commit"), "mean_ratio": compare(report, baseline)}
+    text = json.dumps(report, indent=2)
+    if output:
+        with open(output, "w", encoding="utf-8") as fh:
+            fh.write(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
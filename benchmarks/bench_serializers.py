@@ -0,0 +1,165 @@
+"""
+Benchmark: list-endpoint serialization.
+
+Compares the old per-object *_to_dict helpers + stdlib json (what jsonify did)
+with the schema encoders in utils.serializers working on row tuples, in both
+buffered and streaming modes.
+
+    python -m benchmarks.bench_serializers --rows 100000
+"""
+
+import argparse
+import json
+import time
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+from utils import serializers
+from utils.serializers import Schema, Field, iso, or_empty
+
+TASK_SCHEMA = Schema(
+    Field("id"), Field("person"), Field("task"), Field("deadline"), Field("status"), Field("notes"),
+    iso("created_at"), Field("meeting_id"), Field("speaker_id"),
+)
+CONFLICT_SCHEMA = Schema(
+    Field("id"), Field("issue"), Field("raised_by"), Field("resolution"), Field("severity"),
+    iso("created_at"), Field("stance", convert=or_empty), Field("participants", convert=or_empty),
+    Field("topic", convert=or_empty), Field("meeting_id"),
+)
+MEETING_SCHEMA = Schema(
+    Field("id"), Field("title"), Field("summary"), iso("date"), Field("host"), iso("created_at"),
+    Field("speakers", convert=or_empty),
+)
+
+
+def legacy_task_to_dict(t):
+    return {
+        "id": t.id,
+        "person": t.person,
+        "task": t.task,
+        "deadline": t.deadline,
+        "status": t.status,
+        "notes": t.notes,
+        "created_at": t.created_at.isoformat() if t.created_at else None,
+        "meeting_id": t.meeting_id,
+        "speaker_id": t.speaker_id
+    }
+
+
+def legacy_conflict_to_dict(c):
+    return {
+        "id": c.id,
+        "issue": c.issue,
+        "raised_by": c.raised_by,
+        "resolution": c.resolution,
+        "severity": c.severity,
+        "created_at": c.created_at.isoformat() if c.created_at else None,
+        "stance": c.stance or "",
+        "participants": c.participants or "",
+        "topic": c.topic or "",
+        "meeting_id": c.meeting_id
+    }
+
+
+def legacy_meeting_to_dict(m):
+    return {
+        "id": m.id,
+        "title": m.title,
+        "summary": m.summary,
+        "date": m.date.isoformat() if m.date else None,
+        "host": m.host,
+        "created_at": m.created_at.isoformat() if m.created_at else None,
+        "speakers": m.speakers or "",
+    }
+
+
+def task_rows(n):
+    base = datetime(2025, 1, 1, 9, 30, 0, 123456)
+    return [
+        (i, f"Person {i % 50}", f"Prepare deliverable number {i} for the client review", "next week",
+         "Pending", "" if i % 3 else "Follow up with finance", base + timedelta(minutes=i), i // 20, None)
+        for i in range(n)
+    ]
+
+
+def conflict_rows(n):
+    base = datetime(2025, 1, 1, 9, 30, 0, 123456)
+    return [
+        (i, f"Disagreement on timeline estimate {i}", f"Person {i % 50}", None, "Medium",
+         base + timedelta(minutes=i), "optimistic vs cautious", "A, B", None, i // 20)
+        for i in range(n)
+    ]
+
+
+def meeting_rows(n):
+    base = datetime(2025, 1, 1, 9, 30, 0, 123456)
+    summary = "The team reviewed the quarterly plan and agreed on next steps. " * 4
+    return [
+        (i, f"Weekly sync {i}", summary, date(2025, 1, 1) + timedelta(days=i % 365), "Host",
+         base + timedelta(hours=i), "Rahul, Priya, Anita")
+        for i in range(n)
+    ]
+
+
+def as_objects(schema, rows):
+    return [SimpleNamespace(**dict(zip(schema.keys, r))) for r in rows]
+
+
+def legacy_dumps(objs, to_dict):
+    # Flask's default JSON provider: json.dumps with compact separators
+    return json.dumps([to_dict(o) for o in objs], separators=(",", ":")).encode("utf-8")
+
+
+def best_of(fn, repeat):
+    best = None
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run(rows, repeat):
+    report = {
+        "benchmark": "serializers",
+        "rows": rows,
+        "encoder": "orjson" if serializers.orjson is not None else "stdlib json",
+        "results": [],
+    }
+    cases = [
+        ("tasks", TASK_SCHEMA, task_rows, legacy_task_to_dict),
+        ("conflicts", CONFLICT_SCHEMA, conflict_rows, legacy_conflict_to_dict),
+        ("meetings", MEETING_SCHEMA, meeting_rows, legacy_meeting_to_dict),
+    ]
+    for name, schema, make_rows, legacy in cases:
+        data = make_rows(rows)
+        objs = as_objects(schema, data)
+        legacy_s, legacy_bytes = best_of(lambda: legacy_dumps(objs, legacy), repeat)
+        schema_s, schema_bytes = best_of(lambda: schema.dumps_rows(data), repeat)
+        stream_s, chunks = best_of(lambda: list(schema.stream_rows(data)), repeat)
+        # Same payload regardless of path
+        assert json.loads(legacy_bytes) == json.loads(schema_bytes) == json.loads(b"".join(chunks))
+        report["results"].append({
+            "endpoint": name,
+            "legacy_s": round(legacy_s, 4),
+            "schema_rows_s": round(schema_s, 4),
+            "schema_stream_s": round(stream_s, 4),
+            "speedup": round(legacy_s / schema_s, 2),
+            "bytes": len(schema_bytes),
+            "stream_chunks": len(chunks),
+        })
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    print(json.dumps(run(args.rows, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
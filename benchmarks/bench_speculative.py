@@ -0,0 +1,115 @@
+"""
+Benchmark: prompt-lookup speculative decoding on real transcripts.
+
+Runs the tasks / conflicts / summary LLM stages over each transcript file
+with the real Phi-3 GGUF, once with standard decoding and once with a draft
+attached at every site, and reports per-site tokens/sec, draft acceptance and
+the speedup. Needs llama-cpp-python and models/phi3-finetuned-Q4_K_M.gguf.
+Both runs use one instance created with logits_all=True so the only
+difference is the draft.
+
+    python -m benchmarks.bench_speculative transcripts/*.txt -o spec.json
+"""
+
+import argparse
+import json
+import os
+import tempfile
+from collections import defaultdict
+
+from benchmarks.bench_pipeline import setup_environment
+
+STAGES = ("tasks", "conflicts", "summary")
+
+
+def load_instance(model_path, n_ctx):
+    from llama_cpp import Llama
+
+    return Llama(model_path=model_path, n_ctx=n_ctx, n_threads=os.cpu_count() or 4,
+                 logits_all=True, verbose=False)
+
+
+def run_mode(app_module, instance, transcripts, sites):
+    from utils import metrics
+    from utils.inference_pool import InferencePool, PooledLLM
+    from utils.speculative import SpeculativeDecoding
+
+    calls = []
+
+    def observer(response, seconds):
+        usage = response.get("usage") or {}
+        calls.append({
+            "site": metrics.current_llm_site(),
+            "seconds": seconds,
+            "completion_tokens": usage.get("completion_tokens") or 0,
+            "speculative": response.get("speculative"),
+        })
+
+    speculative = SpeculativeDecoding(sites, site_fn=metrics.current_llm_site)
+    llm = PooledLLM(InferencePool(lambda: instance, size=1), observer=observer, speculative=speculative)
+    for transcript in transcripts:
+        app_module.run_llm_stages(transcript, llm, stages=STAGES)
+
+    by_site = defaultdict(lambda: {"calls": 0, "seconds": 0.0, "completion_tokens": 0,
+                                   "proposed_tokens": 0, "accepted_tokens": 0})
+    for call in calls:
+        site = by_site[call["site"]]
+        site["calls"] += 1
+        site["seconds"] += call["seconds"]
+        site["completion_tokens"] += call["completion_tokens"]
+        if call["speculative"]:
+            site["proposed_tokens"] += call["speculative"]["proposed_tokens"]
+            site["accepted_tokens"] += call["speculative"]["accepted_tokens"]
+    for site in by_site.values():
+        site["tokens_per_second"] = round(site["completion_tokens"] / site["seconds"], 2) if site["seconds"] else 0.0
+        site["acceptance_rate"] = (
+            round(site["accepted_tokens"] / site["proposed_tokens"], 4) if site["proposed_tokens"] else None
+        )
+        site["seconds"] = round(site["seconds"], 3)
+    return dict(by_site)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("transcripts", nargs="+", help="plain-text transcript files")
+    parser.add_argument("--model", default=os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models", "phi3-finetuned-Q4_K_M.gguf"))
+    parser.add_argument("--n-ctx", type=int, default=4096)
+    parser.add_argument("--sites", default="all", help="sites drafted in the speculative run")
+    parser.add_argument("-o", "--output")
+    args = parser.parse_args()
+
+    transcripts = []
+    for path in args.transcripts:
+        with open(path, encoding="utf-8") as fh:
+            transcripts.append(fh.read())
+    model_path = os.path.abspath(args.model)
+    instance = load_instance(model_path, args.n_ctx)
+
+    setup_environment(tempfile.mkdtemp(prefix="mom-bench-spec-"))
+    import app as app_module
+    from utils.speculative import parse_sites
+
+    standard = run_mode(app_module, instance, transcripts, frozenset())
+    speculative = run_mode(app_module, instance, transcripts, parse_sites(args.sites))
+    report = {
+        "benchmark": "speculative_decoding",
+        "model": os.path.basename(model_path),
+        "transcripts": len(transcripts),
+        "standard": standard,
+        "speculative": speculative,
+        "speedup": {
+            site: round(speculative[site]["tokens_per_second"] / standard[site]["tokens_per_second"], 2)
+            for site in standard
+            if site in speculative and standard[site]["tokens_per_second"]
+        },
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            fh.write(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
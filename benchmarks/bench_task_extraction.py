@@ -0,0 +1,111 @@
+"""
+Benchmark: regex task extraction on multi-megabyte transcripts.
+
+Compares the single-pass engine in utils.task_extraction with the legacy
+three-pattern implementation and checks that runtime scales linearly.
+
+    python -m benchmarks.bench_task_extraction --sizes 1 2 4 8
+"""
+
+import argparse
+import json
+import random
+import re
+import time
+
+from utils.task_extraction import TaskExtractionEngine
+
+NAMES = ["Rahul", "Priya", "Anita", "John", "Meera", "Karan"]
+LINES = [
+    "{a}: I will prepare the quarterly budget by Friday.",
+    "{a}: Let's assign {b} to review the vendor contract by next week.",
+    "{a}: {b}, can you schedule the client review.",
+    "{a}: can you share the deck with the team, {b}.",
+    "{a}: The numbers from last quarter look fine and we should keep going with the plan",
+    "{a}: I disagree with that estimate, it seems too optimistic for the timeline we have",
+]
+
+
+def synthetic_transcript(target_bytes, seed=0):
+    rng = random.Random(seed)
+    out, size = [], 0
+    while size < target_bytes:
+        a, b = rng.sample(NAMES, 2)
+        line = rng.choice(LINES).format(a=a, b=b)
+        out.append(line)
+        size += len(line) + 1
+    return "\n".join(out)
+
+
+def adversarial_transcript(target_bytes):
+    """One run-on line with many 'can you' and no terminator: worst case for lazy groups."""
+    unit = "can you maybe look at this thing and then "
+    return unit * (target_bytes // len(unit))
+
+
+def legacy_extract(transcript):
+    """The pre-engine implementation (patterns recompiled per call, three full scans)."""
+    tasks = []
+    p1 = re.compile(r'(?P<speaker>[A-Z][a-z]+):\s*(?:(?:I will|I\'ll|I am going to|I’ll)\s*)(?P<task>.*?)(?:\s+by\s+(?P<deadline>[\w\s\d,/-]+))?[.\n]', re.IGNORECASE)
+    for m in p1.finditer(transcript + "\n"):
+        if m.group('task').strip():
+            tasks.append((m.group('speaker'), m.group('task').strip().rstrip('.')))
+    p2 = re.compile(r'assign(?:ed)?\s+(?:to\s+)?(?P<name>[A-Z][a-z]+)\s+(?:to\s+)?(?P<task>.*?)(?:\s+by\s+(?P<deadline>[\w\s\d,/-]+))?[.\n]', re.IGNORECASE)
+    for m in p2.finditer(transcript + "\n"):
+        if m.group('task').strip():
+            tasks.append((m.group('name'), m.group('task').strip().rstrip('.')))
+    p3 = re.compile(r'(?:(?P<name1>[A-Z][a-z]+),\s*can you\s*(?P<task1>.*?)[.\n])|(?:(?:can you)\s*(?P<task2>.*?)\s*,\s*(?P<name2>[A-Z][a-z]+)[.\n])', re.IGNORECASE)
+    for m in p3.finditer(transcript + "\n"):
+        name = m.group('name1') or m.group('name2') or ""
+        task = (m.group('task1') or m.group('task2') or "").strip().rstrip('.')
+        if name and task:
+            tasks.append((name, task))
+    return tasks
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - t0, result
+
+
+def run(sizes_mb, include_legacy=True, legacy_adversarial_kb=64):
+    engine = TaskExtractionEngine()
+    report = {"benchmark": "task_extraction", "results": []}
+    for mb in sizes_mb:
+        text = synthetic_transcript(int(mb * 1024 * 1024))
+        secs, tasks = timed(engine.extract, text)
+        row = {"input": "synthetic", "mb": mb, "engine_s": round(secs, 4),
+               "engine_mb_per_s": round(mb / secs, 2), "tasks": len(tasks)}
+        if include_legacy:
+            legacy_secs, _ = timed(legacy_extract, text)
+            row["legacy_s"] = round(legacy_secs, 4)
+            row["speedup"] = round(legacy_secs / secs, 2)
+        report["results"].append(row)
+        adv = adversarial_transcript(int(mb * 1024 * 1024))
+        secs, _ = timed(engine.extract, adv)
+        report["results"].append({"input": "adversarial", "mb": mb, "engine_s": round(secs, 4),
+                                  "engine_mb_per_s": round(mb / secs, 2)})
+    if include_legacy and legacy_adversarial_kb:
+        # Legacy pattern 3 is quadratic here, so keep the input small
+        adv = adversarial_transcript(legacy_adversarial_kb * 1024)
+        secs, _ = timed(legacy_extract, adv)
+        report["legacy_adversarial"] = {"kb": legacy_adversarial_kb, "legacy_s": round(secs, 4)}
+    synthetic = [r for r in report["results"] if r["input"] == "synthetic"]
+    if len(synthetic) > 1:
+        # Throughput should stay flat as input grows if scaling is linear
+        rates = [r["engine_mb_per_s"] for r in synthetic]
+        report["throughput_ratio_largest_vs_smallest"] = round(rates[-1] / rates[0], 2)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", type=float, default=[1, 2, 4, 8], help="transcript sizes in MB")
+    parser.add_argument("--no-legacy", action="store_true", help="skip the legacy comparison")
+    args = parser.parse_args()
+    print(json.dumps(run(args.sizes, include_legacy=not args.no_legacy), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Deterministic stand-ins for WhisperModel and Llama.
+
+They mimic the call signatures and return shapes the app relies on, sleep for
+a configurable latency instead of running inference, and always produce the
+same output for the same input, so pipeline benchmarks run offline and are
+comparable between commits.
+"""
+
+import json
+import random
+import time
+from collections import namedtuple
+
+StubSegment = namedtuple("StubSegment", "start end text")
+StubInfo = namedtuple("StubInfo", "duration language")
+
+SAMPLE_RATE = 16000
+
+
+class StubWhisperModel:
+    """
+    Replaces faster_whisper.WhisperModel.
+    `rtf` is the simulated real-time factor: seconds of work per second of audio.
+    """
+
+    def __init__(self, lines, rtf=0.05, segment_seconds=4.0):
+        self.lines = list(lines) or ["(silence)"]
+        self.rtf = rtf
+        self.segment_seconds = segment_seconds
+
+    def transcribe(self, audio, **kwargs):
+        if isinstance(audio, str):
+            raise TypeError("StubWhisperModel expects pre-processed PCM, not a path")
+        duration = len(audio) / SAMPLE_RATE
+        if self.rtf:
+            time.sleep(duration * self.rtf)
+
+        def segments():
+            t, i = 0.0, 0
+            while t < duration:
+                end = min(t + self.segment_seconds, duration)
+                yield StubSegment(t, end, self.lines[i % len(self.lines)])
+                t, i = end, i + 1
+
+        return segments(), StubInfo(duration, "en")
+
+
+class StubLlama:
+    """
+    Replaces llama_cpp.Llama.
+    Latency is `base_latency` plus `completion_tokens / tokens_per_second`; the
+    response is chosen from the prompt (tasks / conflicts / summary) and derived
+    from the transcript text so the downstream parsing does real work.
+    `commentary_tokens` appends that many tokens of prose after JSON answers,
+    the way the real model often keeps talking after the closing bracket.
+    With stream=True the text is yielded as 4-character tokens at the same rate.
+    """
+
+    def __init__(self, base_latency=0.05, tokens_per_second=50.0, seed=0, commentary_tokens=0):
+        self.base_latency = base_latency
+        self.tokens_per_second = tokens_per_second
+        self.seed = seed
+        self.commentary_tokens = commentary_tokens
+
+    def _names(self, prompt):
+        rng = random.Random(f"{self.seed}:{len(prompt)}")
+        words = sorted({w.strip(":,.") for w in prompt.split() if w[:1].isupper() and w[1:].islower()})
+        names = [w for w in words if len(w) > 2][:12] or ["Alex", "Sam"]
+        rng.shuffle(names)
+        return names
+
+    def _respond(self, prompt):
+        names = self._names(prompt)
+        if "ACTIONABLE TASKS" in prompt or "Extract tasks" in prompt:
+            return json.dumps([
+                {"task_name": f"Follow up on item {i + 1}", "assigned_to": names[i % len(names)],
+                 "due_date": ("next week", "by Friday", "")[i % 3], "status": "pending"}
+                for i in range(min(len(names), 6))
+            ])
+        if "conflicts/disagreements" in prompt:
+            return json.dumps([
+                {"issue": "Timeline estimate", "raised_by": names[0],
+                 "participants": names[:2], "stance": "optimistic vs. cautious",
+                 "severity": "Medium", "topic": "Planning"}
+            ])
+        if "Summarize" in prompt:
+            return (f"{names[0]} reviewed progress with the team. "
+                    f"Action items were assigned and deadlines agreed.")
+        return "[]"
+
+    def tokenize(self, text, **kwargs):
+        return list(range(max(1, len(text) // 4)))
+
+    def _stream(self, text, max_tokens):
+        if self.base_latency:
+            time.sleep(self.base_latency)
+        tokens = [text[i:i + 4] for i in range(0, len(text), 4)][:max_tokens]
+        for token in tokens:
+            if self.tokens_per_second:
+                time.sleep(1.0 / self.tokens_per_second)
+            yield {"choices": [{"text": token, "index": 0, "finish_reason": None}]}
+        yield {"choices": [{"text": "", "index": 0, "finish_reason": "stop"}]}
+
+    def __call__(self, prompt="", max_tokens=256, temperature=0.0, stream=False, **kwargs):
+        text = self._respond(prompt)
+        if self.commentary_tokens and text.startswith("["):
+            text += "\n\n" + "etc " * self.commentary_tokens
+        if stream:
+            return self._stream(text, max_tokens)
+        prompt_tokens = max(1, len(prompt) // 4)
+        completion_tokens = min(max_tokens, max(1, len(text) // 4))
+        delay = self.base_latency + (completion_tokens / self.tokens_per_second if self.tokens_per_second else 0)
+        if delay:
+            time.sleep(delay)
+        return {
+            "choices": [{"text": text, "index": 0, "finish_reason": "stop"}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
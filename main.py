@@ -1,6 +1,81 @@
+"""
+MoM worker entry point.
+
+Workers lease pipeline jobs (audio transcription, meeting reprocessing) from
+the job table in DATABASE_URL, so ASR/LLM capacity scales with the number of
+worker processes and hosts. Run the web app with MOM_PIPELINE_MODE=queue so
+it only enqueues; every worker host needs the models and read access to
+MOM_JOB_SPOOL_DIR.
+
+    python main.py worker                      # one worker until SIGTERM / Ctrl-C
+    python main.py worker --processes 4        # four worker processes on this host
+    python main.py worker --kinds reprocess --exit-when-idle
+"""
+
+import argparse
+import multiprocessing
+import signal
+import threading
+
+
+def run_worker(kinds=None, poll=None, max_jobs=None, exit_when_idle=False):
+    """Run one worker in this process; SIGTERM/SIGINT finish the current job and stop."""
+    from app import JOB_HANDLERS, JOBS, app
+    from utils.job_queue import POLL_SECONDS, Worker
+
+    stop = threading.Event()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, lambda *_: stop.set())
+    worker = Worker(JOBS, JOB_HANDLERS, kinds=kinds, poll=poll or POLL_SECONDS, context=app.app_context)
+    return worker.run(stop, max_jobs=max_jobs, exit_when_idle=exit_when_idle)
+
+
+def run_workers(processes, **kwargs):
+    """Fork `processes` workers and wait for them; signals are forwarded as SIGTERM."""
+    workers = [
+        multiprocessing.Process(target=run_worker, kwargs=kwargs, name=f"mom-worker-{i}")
+        for i in range(processes)
+    ]
+
+    def forward(*_):
+        for p in workers:
+            if p.is_alive():
+                p.terminate()
+
+    signal.signal(signal.SIGTERM, forward)
+    signal.signal(signal.SIGINT, forward)
+    for p in workers:
+        p.start()
+    for p in workers:
+        p.join()
+    return sum(1 for p in workers if p.exitcode)
+
+
 def main():
-    print("Hello from mom-project!")
+    parser = argparse.ArgumentParser(description="MoM background workers")
+    commands = parser.add_subparsers(dest="command")
+    worker = commands.add_parser("worker", help="lease and run pipeline jobs")
+    worker.add_argument("--processes", type=int, default=1, help="worker processes to start on this host")
+    worker.add_argument("--kinds", help="comma-separated job kinds to run (default: all)")
+    worker.add_argument("--poll", type=float, help="seconds between polls of an empty queue")
+    worker.add_argument("--max-jobs", type=int, help="exit after this many jobs (per process)")
+    worker.add_argument("--exit-when-idle", action="store_true", help="exit once the queue is empty")
+    args = parser.parse_args()
+    if args.command != "worker":
+        parser.print_help()
+        return 0
+
+    kwargs = {
+        "kinds": [k.strip() for k in args.kinds.split(",") if k.strip()] if args.kinds else None,
+        "poll": args.poll,
+        "max_jobs": args.max_jobs,
+        "exit_when_idle": args.exit_when_idle,
+    }
+    if args.processes <= 1:
+        run_worker(**kwargs)
+        return 0
+    return 1 if run_workers(args.processes, **kwargs) else 0
 
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main())
@@ -0,0 +1,32 @@
+import argparse
+import os
+import tempfile
+
+import pytest
+
+# app reads these at import time; keep every test run on a throwaway database and spool
+_WORKDIR = tempfile.mkdtemp(prefix="mom-tests-")
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(_WORKDIR, "test.db")
+os.environ["MOM_SPOOL_DIR"] = os.path.join(_WORKDIR, "spool")
+os.environ["MOM_FILES_DIR"] = os.path.join(_WORKDIR, "files")
+os.environ["MOM_PROFILE_DIR"] = os.path.join(_WORKDIR, "profiles")
+os.environ["MOM_ARTIFACT_GC_INTERVAL"] = "0"
+os.environ.setdefault("MOM_LOG_LEVEL", "WARNING")
+
+
+@pytest.fixture(scope="session")
+def app_module():
+    """The Flask app module with the deterministic stub Whisper/LLM from benchmarks.stub_models."""
+    import app as app_module
+    from benchmarks.bench_pipeline import install_stub_models
+
+    install_stub_models(app_module, argparse.Namespace(
+        seed=0, asr_rtf=0.0, llm_latency=0.0, llm_tokens_per_second=0,
+        llm_commentary_tokens=0, llm_pool_size=1,
+    ))
+    return app_module
+
+
+@pytest.fixture
+def client(app_module):
+    return app_module.app.test_client()
@@ -0,0 +1,162 @@
+import time
+
+import pytest
+from sqlalchemy import JSON, Column, DateTime, Float, Integer, String, Text, create_engine, select
+from sqlalchemy.orm import Session, declarative_base
+
+from utils import job_queue
+from utils.job_queue import FAILED, QUEUED, RUNNING, SUCCEEDED, JobQueue
+
+Base = declarative_base()
+
+
+class Job(Base):
+    __tablename__ = "job"
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(50), nullable=False)
+    status = Column(String(20), default=QUEUED)
+    payload = Column(JSON)
+    result = Column(JSON)
+    error = Column(Text)
+    meeting_id = Column(Integer)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    available_at = Column(Float)
+    lease_owner = Column(String(120))
+    lease_expires_at = Column(Float)
+    created_at = Column(DateTime)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def queue(engine, monkeypatch):
+    monkeypatch.setattr(job_queue, "RETRY_BACKOFF_SECONDS", 0.0)
+    queue = JobQueue(Job, visibility=30.0, max_attempts=2)
+    queue.bind(engine)
+    return queue
+
+
+def enqueue(queue, engine, kind="transcribe", payload=None, **kwargs):
+    with Session(engine) as session:
+        return queue.enqueue(session, kind, payload or {}, **kwargs)
+
+
+def row(engine, job_id):
+    with Session(engine) as session:
+        return session.get(Job, job_id)
+
+
+def expire_lease(engine, job_id):
+    with engine.begin() as conn:
+        conn.execute(Job.__table__.update().where(Job.id == job_id).values(lease_expires_at=time.time() - 1))
+
+
+def test_lease_is_exclusive_and_complete_stores_result(queue, engine):
+    job_id = enqueue(queue, engine, payload={"a": 1})
+    job = queue.lease("w1")
+    assert job.id == job_id and job.attempts == 1 and job.payload == {"a": 1}
+    assert queue.lease("w2") is None
+    assert queue.complete(job, {"ok": True})
+    stored = row(engine, job_id)
+    assert stored.status == SUCCEEDED and stored.result == {"ok": True}
+
+
+def test_lease_filters_by_kind(queue, engine):
+    enqueue(queue, engine, kind="reprocess")
+    assert queue.lease("w1", kinds=["transcribe"]) is None
+    assert queue.lease("w1", kinds=["reprocess"]).kind == "reprocess"
+
+
+def test_expired_lease_is_taken_over_and_old_holder_is_fenced(queue, engine):
+    job_id = enqueue(queue, engine)
+    first = queue.lease("w1")
+    expire_lease(engine, job_id)
+    second = queue.lease("w2")
+    assert second.id == job_id and second.attempts == 2
+
+    assert not queue.heartbeat(first)
+    assert not queue.complete(first, {"from": "w1"})
+    assert not queue.fail(first, "late failure")
+    stored = row(engine, job_id)
+    assert stored.status == RUNNING and stored.lease_owner == "w2" and stored.error is None
+
+    assert queue.heartbeat(second)
+    assert queue.complete(second, {"from": "w2"})
+    assert row(engine, job_id).result == {"from": "w2"}
+
+
+def test_fail_requeues_until_the_last_attempt(queue, engine):
+    job_id = enqueue(queue, engine)
+    job = queue.lease("w1")
+    assert queue.fail(job, "boom")
+    assert row(engine, job_id).status == QUEUED
+
+    job = queue.lease("w1")
+    assert job.last_attempt
+    assert queue.fail(job, "boom again")
+    stored = row(engine, job_id)
+    assert stored.status == FAILED and stored.error == "boom again"
+    assert queue.lease("w1") is None
+
+
+def test_fail_without_retry_is_final(queue, engine):
+    job_id = enqueue(queue, engine)
+    assert queue.fail(queue.lease("w1"), "rejected", retry=False)
+    assert row(engine, job_id).status == FAILED
+
+
+def test_reap_fails_expired_last_attempt_and_runs_cleanup(queue, engine):
+    cleaned = []
+    queue.on_reap["transcribe"] = cleaned.append
+    job_id = enqueue(queue, engine, payload={"audio_path": "/spool/a.wav"}, max_attempts=1)
+    job = queue.lease("w1")
+    expire_lease(engine, job_id)
+
+    assert queue.lease("w2") is None  # lease() reaps first
+    stored = row(engine, job_id)
+    assert stored.status == FAILED and "lease expired" in stored.error
+    assert cleaned == [{"audio_path": "/spool/a.wav"}]
+    assert not queue.complete(job, {})
+    assert queue.reap() == 0 and len(cleaned) == 1
+
+
+def test_attach_meeting_is_fenced_by_the_lease(queue, engine):
+    job_id = enqueue(queue, engine)
+    first = queue.lease("w1")
+    with Session(engine) as session:
+        assert queue.attach_meeting(session, first, 7)
+        session.commit()
+    assert first.meeting_id == 7 and row(engine, job_id).meeting_id == 7
+
+    expire_lease(engine, job_id)
+    second = queue.lease("w2")
+    assert second.meeting_id == 7  # a retry sees the meeting the earlier attempt saved
+    with Session(engine) as session:
+        assert not queue.attach_meeting(session, first, 8)
+        session.commit()
+    assert row(engine, job_id).meeting_id == 7
+
+
+def test_worker_runs_handler_and_records_failures(queue, engine):
+    enqueue(queue, engine, payload={"n": 2})
+    enqueue(queue, engine, kind="reprocess", max_attempts=1)
+
+    def explode(job):
+        raise RuntimeError("no model")
+
+    worker = job_queue.Worker(queue, {"transcribe": lambda job: {"double": job.payload["n"] * 2},
+                                      "reprocess": explode}, worker_id="w1", poll=0.01)
+    assert worker.run(exit_when_idle=True) == 2
+    with Session(engine) as session:
+        jobs = {j.kind: j for j in session.execute(select(Job)).scalars()}
+    assert jobs["transcribe"].status == SUCCEEDED and jobs["transcribe"].result == {"double": 4}
+    assert jobs["reprocess"].status == FAILED and jobs["reprocess"].error == "no model"
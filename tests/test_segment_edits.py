@@ -0,0 +1,119 @@
+import pytest
+
+from benchmarks.bench_pipeline import synthetic_segments
+from utils.segment_table import SegmentTable
+
+
+class FailingLLM:
+    """Stands in for the pooled LLM when the model errors on every call."""
+
+    def __call__(self, *args, **kwargs):
+        raise RuntimeError("llm unavailable")
+
+    def stream(self, *args, **kwargs):
+        raise RuntimeError("llm unavailable")
+
+
+@pytest.fixture
+def meeting_id(app_module):
+    """A stored meeting of 40 segments: window 0 holds segments 0-37, window 1 the rest."""
+    with app_module.app.app_context():
+        meeting = app_module.Meeting(title="Edit me", summary="Stored summary.",
+                                     transcript_segments=SegmentTable.from_dicts(synthetic_segments(40)))
+        app_module.db.session.add(meeting)
+        app_module.db.session.commit()
+        return meeting.id
+
+
+def edit(client, meeting_id, *edits):
+    return client.patch(f"/api/meetings/{meeting_id}/segments", json={"edits": list(edits)})
+
+
+def segment_text(app_module, meeting_id, index):
+    with app_module.app.app_context():
+        meeting = app_module.db.session.get(app_module.Meeting, meeting_id)
+        return app_module.segments_as_dicts(meeting.transcript_segments)[index]["text"]
+
+
+def task_rows(app_module, meeting_id):
+    with app_module.app.app_context():
+        Task = app_module.Task
+        return {t.id: (t.task, t.status, t.window_index)
+                for t in Task.query.filter_by(meeting_id=meeting_id).order_by(Task.id)}
+
+
+def set_status(app_module, task_id, status):
+    with app_module.app.app_context():
+        app_module.db.session.get(app_module.Task, task_id).status = status
+        app_module.db.session.commit()
+
+
+def test_edit_re_extracts_only_the_changed_window(app_module, client, meeting_id):
+    original = segment_text(app_module, meeting_id, 1)
+    first = edit(client, meeting_id, {"index": 0, "text": segment_text(app_module, meeting_id, 0) + " okay"})
+    assert first.status_code == 200
+    body = first.get_json()
+    assert body["changed_windows"] == [0] and body["llm_windows"] == 1
+    created = body["tasks"]["created"]
+    assert created and all(window == 0 for _, _, window in task_rows(app_module, meeting_id).values())
+    set_status(app_module, created[0], "Done")
+
+    # Same task names again: rows are updated in place and keep their status
+    second = edit(client, meeting_id, {"index": 1, "text": original + " okay"}).get_json()
+    assert second["llm_windows"] == 1
+    assert sorted(second["tasks"]["updated"]) == sorted(created)
+    assert second["tasks"]["created"] == [] and second["tasks"]["deleted"] == []
+    assert task_rows(app_module, meeting_id)[created[0]][1] == "Done"
+
+    # Reverting to text extracted before reuses the stored window extraction
+    third = edit(client, meeting_id, {"index": 1, "text": original}).get_json()
+    assert third["changed_windows"] == [0] and third["llm_windows"] == 0
+
+
+def test_first_edit_revises_whole_meeting_summary(app_module, client, meeting_id):
+    body = edit(client, meeting_id, {"index": 39, "text": "we agreed on the plan"}).get_json()
+    assert body["changed_windows"] == [1]
+    assert body["summary_updated"]
+    assert body["meeting"]["summary"] not in ("", "Stored summary.")
+
+
+def test_failed_llm_stage_leaves_rows_and_segments_alone(app_module, client, meeting_id, monkeypatch):
+    text = segment_text(app_module, meeting_id, 0)
+    created = edit(client, meeting_id, {"index": 0, "text": text + " okay"}).get_json()["tasks"]["created"]
+    set_status(app_module, created[0], "Done")
+    before = task_rows(app_module, meeting_id)
+
+    monkeypatch.setattr(app_module, "_phi3_model", FailingLLM())
+    response = edit(client, meeting_id, {"index": 0, "text": text + "!"})
+    assert response.status_code == 500
+    assert response.get_json()["failed_windows"] == [0]
+    assert task_rows(app_module, meeting_id) == before
+    assert segment_text(app_module, meeting_id, 0) == text + " okay"
+
+
+def test_untagged_rows_in_the_changed_window_are_retired(app_module, client, meeting_id):
+    with app_module.app.app_context():
+        Task, db = app_module.Task, app_module.db
+        quoted_text = segment_text(app_module, meeting_id, 0)
+        quoted = Task(person="John", task=quoted_text, status="Pending", notes="", meeting_id=meeting_id)
+        unrelated = Task(person="Zed", task="Xylophone qq", status="Pending", notes="", meeting_id=meeting_id)
+        db.session.add_all([quoted, unrelated])
+        db.session.commit()
+        quoted_id, unrelated_id = quoted.id, unrelated.id
+
+    body = edit(client, meeting_id, {"index": 0, "text": "we moved on"}).get_json()
+    assert quoted_id in body["tasks"]["deleted"]
+    rows = task_rows(app_module, meeting_id)
+    assert quoted_text not in {task for task, _, _ in rows.values()}
+    assert rows[unrelated_id] == ("Xylophone qq", "Pending", None)
+
+
+@pytest.mark.parametrize("payload", [
+    {},
+    {"edits": []},
+    {"edits": [{"index": 999, "text": "x"}]},
+    {"edits": [{"index": 0}]},
+    {"edits": [{"index": 0, "text": 5}]},
+])
+def test_invalid_edits_are_rejected(client, meeting_id, payload):
+    assert client.patch(f"/api/meetings/{meeting_id}/segments", json=payload).status_code == 400
@@ -0,0 +1,155 @@
+"""
+Artifact Store
+Generated files (MoM documents) are stored under their content hash, so
+identical renders share one file. A file is referenced while some Meeting row
+points at it; a background task removes unreferenced files after a grace
+period and evicts the least-recently-used files once the store exceeds its
+size cap (evicted MoMs are re-rendered on the next request).
+"""
+
+import hashlib
+import os
+import re
+import threading
+import time
+import uuid
+
+from utils.structured_log import get_logger
+
+log = get_logger("artifacts")
+
+ARTIFACT_DIR = os.path.abspath(os.environ.get(
+    "MOM_FILES_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "files")
+))
+ARTIFACT_MAX_BYTES = int(os.environ.get("MOM_ARTIFACT_MAX_MB", "2048")) * 1024 * 1024
+# Unreferenced files younger than this are kept (a render may not be committed yet)
+ARTIFACT_GRACE_SECONDS = float(os.environ.get("MOM_ARTIFACT_GRACE_SECONDS", str(24 * 3600)))
+ARTIFACT_GC_INTERVAL = float(os.environ.get("MOM_ARTIFACT_GC_INTERVAL", "900"))
+TMP_MAX_AGE_SECONDS = 3600
+
+_HASH_NAME = re.compile(r"^[0-9a-f]{64}\.[a-z0-9]{1,8}$")
+_KEEP = {".gitkeep"}
+
+
+def is_content_addressed(filename):
+    return bool(_HASH_NAME.match(filename or ""))
+
+
+class ArtifactStore:
+    def __init__(self, root=ARTIFACT_DIR, max_bytes=ARTIFACT_MAX_BYTES, grace_seconds=ARTIFACT_GRACE_SECONDS):
+        self.root = os.path.abspath(root)
+        self.max_bytes = max_bytes
+        self.grace_seconds = grace_seconds
+        os.makedirs(self.root, exist_ok=True)
+
+    def path_for(self, filename):
+        return os.path.join(self.root, os.path.basename(filename))
+
+    def put_bytes(self, data, extension):
+        """Store `data` as <sha256>.<extension>; identical content is written once."""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path_for(f"{digest}.{extension.lstrip('.')}")
+        if os.path.exists(path):
+            # Refresh mtime so the LRU eviction sees it as recently used
+            os.utime(path)
+            return path
+        tmp_path = f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+        with open(tmp_path, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp_path, path)
+        return path
+
+    def touch(self, path):
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def _entries(self):
+        out = []
+        with os.scandir(self.root) as it:
+            for entry in it:
+                if entry.name in _KEEP or not entry.is_file():
+                    continue
+                try:
+                    st = entry.stat()
+                except FileNotFoundError:
+                    continue
+                out.append((entry.name, entry.path, st.st_size, st.st_mtime))
+        return out
+
+    def stats(self, referenced=()):
+        referenced = set(referenced)
+        entries = self._entries()
+        return {
+            "root": self.root,
+            "files": len(entries),
+            "bytes": sum(e[2] for e in entries),
+            "referenced_files": sum(1 for e in entries if e[0] in referenced),
+            "max_bytes": self.max_bytes,
+        }
+
+    def collect(self, referenced, now=None):
+        """
+        Remove unreferenced files older than the grace period and stale temp
+        files, then evict least-recently-used files while over the size cap.
+        `referenced` is the set of basenames still pointed at by Meeting rows.
+        """
+        now = now or time.time()
+        referenced = set(referenced)
+        removed, freed = 0, 0
+        kept = []
+        for name, path, size, mtime in self._entries():
+            age = now - mtime
+            stale_tmp = name.endswith(".tmp") and age > TMP_MAX_AGE_SECONDS
+            orphan = name not in referenced and not name.endswith(".tmp") and age > self.grace_seconds
+            if stale_tmp or orphan:
+                if self._remove(path):
+                    removed += 1
+                    freed += size
+            else:
+                kept.append((mtime, size, path, name))
+        total = sum(size for _, size, _, _ in kept)
+        for mtime, size, path, name in sorted(kept):
+            if total <= self.max_bytes:
+                break
+            if name.endswith(".tmp"):
+                continue
+            if self._remove(path):
+                removed += 1
+                freed += size
+                total -= size
+        if removed:
+            log.info("Artifact GC", extra={"removed": removed, "freed_bytes": freed, "store_bytes": total})
+        return {"removed": removed, "freed_bytes": freed, "store_bytes": total}
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+            return True
+        except FileNotFoundError:
+            return False
+        except OSError as e:
+            log.warning("Could not remove artifact", extra={"path": path, "error": str(e)})
+            return False
+
+    def start_gc(self, referenced_fn, interval=ARTIFACT_GC_INTERVAL):
+        """Run `collect(referenced_fn())` every `interval` seconds on a daemon thread."""
+        if not interval or interval <= 0:
+            return None
+
+        def loop():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.collect(referenced_fn())
+                except Exception as e:
+                    log.warning("Artifact GC failed", extra={"error": str(e)})
+
+        thread = threading.Thread(target=loop, name="artifact-gc", daemon=True)
+        thread.start()
+        return thread
+
+
+DEFAULT_STORE = ArtifactStore()
@@ -0,0 +1,197 @@
+"""
+Audio Pre-processing Utility
+Decodes an upload once to 16 kHz mono float32 PCM on disk, trims leading and
+trailing silence, and exposes the samples as a memory-mapped NumPy array.
+"""
+
+import json
+import os
+import time
+import uuid
+
+import numpy as np
+
+from utils.metrics import CACHE_REQUESTS
+from utils.structured_log import get_logger
+from utils.upload_spool import SPOOL_DIR, MAX_AUDIO_SECONDS, UploadRejected
+
+log = get_logger("audio")
+
+SAMPLE_RATE = 16000
+PCM_DTYPE = np.float32
+PCM_CACHE_DIR = os.path.join(SPOOL_DIR, "pcm")
+PCM_CACHE_MAX_BYTES = int(os.environ.get("MOM_PCM_CACHE_MB", "2048")) * 1024 * 1024
+PCM_CACHE_MIN_AGE_SECONDS = 30.0  # never prune files written or hit this recently (may be in use)
+os.makedirs(PCM_CACHE_DIR, exist_ok=True)
+
+FRAME_SAMPLES = 480          # 30 ms analysis frames
+SILENCE_DBFS = -45.0         # frames quieter than this count as silence
+TRIM_PADDING_SECONDS = 0.25  # keep a little context around speech
+
+
+class PreparedAudio:
+    """Pre-processed PCM on disk plus the trim window inside it."""
+
+    def __init__(self, path, start_sample, end_sample, total_samples, sha256=None):
+        self.path = path
+        self.start_sample = start_sample
+        self.end_sample = end_sample
+        self.total_samples = total_samples
+        self.sha256 = sha256
+
+    @property
+    def offset(self):
+        """Seconds trimmed from the front; add to timestamps of the trimmed audio."""
+        return self.start_sample / SAMPLE_RATE
+
+    @property
+    def duration(self):
+        return (self.end_sample - self.start_sample) / SAMPLE_RATE
+
+    @property
+    def source_duration(self):
+        return self.total_samples / SAMPLE_RATE
+
+    def pcm(self):
+        """Trimmed samples as a read-only memmap (zero-copy slice of the file)."""
+        if self.total_samples == 0:
+            return np.zeros(0, dtype=PCM_DTYPE)
+        data = np.memmap(self.path, dtype=PCM_DTYPE, mode="r", shape=(self.total_samples,))
+        return data[self.start_sample:self.end_sample]
+
+    def to_meta(self):
+        return {
+            "start_sample": self.start_sample,
+            "end_sample": self.end_sample,
+            "total_samples": self.total_samples,
+            "sha256": self.sha256,
+        }
+
+
+def _decode_to_file(src_path, dst_path, max_seconds):
+    """Stream-decode `src_path` frame by frame into raw float32 mono 16 kHz samples."""
+    import av
+
+    max_samples = int(max_seconds * SAMPLE_RATE) if max_seconds else None
+    total = 0
+    resampler = av.audio.resampler.AudioResampler(format="flt", layout="mono", rate=SAMPLE_RATE)
+    with av.open(src_path, metadata_errors="ignore") as container, open(dst_path, "wb") as out:
+        def write_frames(frames):
+            nonlocal total
+            for frame in frames or []:
+                samples = frame.to_ndarray().reshape(-1).astype(PCM_DTYPE, copy=False)
+                total += len(samples)
+                if max_samples and total > max_samples:
+                    raise UploadRejected(f"audio exceeds {max_seconds / 60:.0f} min limit", 413)
+                out.write(samples.tobytes())
+
+        for frame in container.decode(audio=0):
+            frame.pts = None
+            write_frames(resampler.resample(frame))
+        write_frames(resampler.resample(None))
+    return total
+
+
+def _frame_is_voiced(chunk):
+    if len(chunk) == 0:
+        return False
+    rms = float(np.sqrt(np.mean(np.square(chunk, dtype=np.float64))))
+    return rms > 0 and 20 * np.log10(rms) > SILENCE_DBFS
+
+
+def find_speech_bounds(pcm):
+    """
+    Return (start, end) sample indexes bounding non-silent audio.
+    Scans inward from both ends so only the silent edges are read. A recording
+    with no frame above SILENCE_DBFS (a quiet mic, not necessarily silence) is
+    kept whole rather than trimmed to nothing.
+    """
+    n = len(pcm)
+    start = 0
+    while start < n and not _frame_is_voiced(pcm[start:start + FRAME_SAMPLES]):
+        start += FRAME_SAMPLES
+    if start >= n:
+        return 0, n
+    end = n
+    while end > start and not _frame_is_voiced(pcm[max(end - FRAME_SAMPLES, start):end]):
+        end -= FRAME_SAMPLES
+    pad = int(TRIM_PADDING_SECONDS * SAMPLE_RATE)
+    return max(start - pad, 0), min(end + pad, n)
+
+
+def _cache_paths(sha256):
+    key = sha256 or f"tmp_{uuid.uuid4().hex}"
+    return os.path.join(PCM_CACHE_DIR, f"{key}.f32"), os.path.join(PCM_CACHE_DIR, f"{key}.json")
+
+
+def _remove_cached(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        log.warning("Could not remove cached PCM", extra={"path": path, "error": str(e)})
+
+
+def prune_pcm_cache(max_bytes=PCM_CACHE_MAX_BYTES, min_age=PCM_CACHE_MIN_AGE_SECONDS):
+    """
+    Drop least-recently-used PCM files once the cache exceeds `max_bytes`.
+    Files touched in the last `min_age` seconds are kept even over the limit,
+    so a concurrent cache hit does not lose the file it just returned.
+    """
+    entries = []
+    cutoff = time.time() - min_age
+    for name in os.listdir(PCM_CACHE_DIR):
+        if name.endswith(".f32"):
+            path = os.path.join(PCM_CACHE_DIR, name)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    for mtime, size, path in sorted(entries):
+        if total <= max_bytes or mtime >= cutoff:
+            break
+        for p in (path, path[:-4] + ".json"):
+            _remove_cached(p)
+        total -= size
+
+
+def preprocess_audio(src_path, sha256=None, max_seconds=MAX_AUDIO_SECONDS):
+    """
+    Convert an upload to trimmed 16 kHz mono float32 PCM once.
+    Results are cached by upload hash, so re-uploads skip decoding entirely.
+    """
+    pcm_path, meta_path = _cache_paths(sha256)
+    if sha256 and os.path.exists(pcm_path) and os.path.exists(meta_path):
+        with open(meta_path, "r", encoding="utf-8") as fh:
+            meta = json.load(fh)
+        os.utime(pcm_path)
+        CACHE_REQUESTS.inc(cache="pcm", result="hit")
+        log.info("PCM cache hit", extra={"audio_sha256": sha256})
+        return PreparedAudio(pcm_path, meta["start_sample"], meta["end_sample"], meta["total_samples"], sha256)
+
+    if sha256:
+        CACHE_REQUESTS.inc(cache="pcm", result="miss")
+    tmp_path = f"{pcm_path}.{uuid.uuid4().hex[:8]}.part"
+    try:
+        total = _decode_to_file(src_path, tmp_path, max_seconds)
+        os.replace(tmp_path, pcm_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    if total:
+        start, end = find_speech_bounds(np.memmap(pcm_path, dtype=PCM_DTYPE, mode="r", shape=(total,)))
+    else:
+        start, end = 0, 0
+    prepared = PreparedAudio(pcm_path, start, end, total, sha256)
+    with open(meta_path, "w", encoding="utf-8") as fh:
+        json.dump(prepared.to_meta(), fh)
+    log.info("Pre-processed audio", extra={
+        "decoded_seconds": round(prepared.source_duration, 2),
+        "kept_seconds": round(prepared.duration, 2),
+    })
+    prune_pcm_cache()
+    return prepared
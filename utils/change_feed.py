@@ -0,0 +1,215 @@
+"""
+Change Feed
+Every insert or update of a tracked model stamps the row's `version` column
+with a number from one database-wide sequence (one number per flush, so rows
+written together share it); deletes leave a tombstone carrying the number.
+Clients poll `?since=<version>` for deltas or keep a Server-Sent Events
+stream open, which is woken as soon as a commit in this process allocates a
+version (writes from other processes are picked up by the poll interval).
+Clients apply `deleted` before the returned rows: SQLite may reuse the id of
+a deleted row for a later insert.
+
+The sequence row is updated inside the writing transaction, so writers are
+serialised on it and versions become visible in commit order: once a reader
+sees version N, no transaction can still commit a version below N.
+"""
+
+import os
+import threading
+import time
+
+from sqlalchemy import event, func, insert, select, update
+
+from utils.serializers import dumps
+
+# A delta larger than this is answered with {"reset": true}; refetch the lists
+CHANGE_MAX_ROWS = int(os.environ.get("MOM_CHANGE_MAX_ROWS", "5000"))
+STREAM_POLL_SECONDS = float(os.environ.get("MOM_CHANGE_POLL_SECONDS", "2"))
+STREAM_HEARTBEAT_SECONDS = 15.0
+# Streams end after this long; EventSource reconnects with Last-Event-ID
+STREAM_MAX_SECONDS = float(os.environ.get("MOM_CHANGE_STREAM_MAX_SECONDS", "300"))
+STREAM_RETRY_MS = 3000
+
+_SEQUENCE_ID = 1
+
+
+class ChangeFeed:
+    def __init__(self, sequence_model, tombstone_model):
+        self.sequence = sequence_model.__table__
+        self.tombstones = tombstone_model.__table__
+        self.collections = {}  # name -> (model, schema)
+        self._names = {}  # model class -> name
+        self._latest = 0
+        self._cond = threading.Condition()
+
+    def track(self, name, model, schema):
+        """Version rows of `model` (which needs an integer `version` column) under `name`."""
+        self.collections[name] = (model, schema)
+        self._names[model] = name
+
+    def install(self, session):
+        """Attach the flush/commit hooks to a Session class, sessionmaker or scoped_session."""
+        event.listen(session, "before_flush", self._before_flush)
+        event.listen(session, "after_commit", self._after_commit)
+        event.listen(session, "after_rollback", self._after_rollback)
+
+    def ensure_sequence(self, session):
+        """Create the sequence row if missing, starting above any existing version."""
+        if session.execute(select(self.sequence.c.value).where(self.sequence.c.id == _SEQUENCE_ID)).first():
+            return
+        start = 0
+        for model, _ in self.collections.values():
+            start = max(start, session.query(func.max(model.version)).scalar() or 0)
+        session.execute(insert(self.sequence).values(id=_SEQUENCE_ID, value=start))
+        session.commit()
+
+    # -----------------------------
+    # Writing
+    # -----------------------------
+    def allocate(self, session):
+        """Take the next version inside the session's transaction."""
+        conn = session.connection()
+        conn.execute(
+            update(self.sequence)
+            .where(self.sequence.c.id == _SEQUENCE_ID)
+            .values(value=self.sequence.c.value + 1)
+        )
+        version = conn.execute(
+            select(self.sequence.c.value).where(self.sequence.c.id == _SEQUENCE_ID)
+        ).scalar_one()
+        session.info["change_version"] = version
+        return version
+
+    def _tombstone(self, session, name, ids, version):
+        session.connection().execute(
+            insert(self.tombstones),
+            [{"collection": name, "row_id": row_id, "version": version} for row_id in ids]
+        )
+
+    def _before_flush(self, session, flush_context, instances):
+        names = self._names
+        changed = [o for o in session.new if type(o) in names]
+        changed += [o for o in session.dirty if type(o) in names and session.is_modified(o)]
+        deleted = [o for o in session.deleted if type(o) in names]
+        if not changed and not deleted:
+            return
+        version = self.allocate(session)
+        for obj in changed:
+            obj.version = version
+        for obj in deleted:
+            self._tombstone(session, names[type(obj)], [obj.id], version)
+
+    def delete_where(self, session, model, *criteria):
+        """
+        Bulk DELETE that still leaves tombstones (Query.delete() skips the
+        flush hooks). Returns the number of rows removed.
+        """
+        ids = [row_id for (row_id,) in session.query(model.id).filter(*criteria)]
+        if not ids:
+            return 0
+        version = self.allocate(session)
+        self._tombstone(session, self._names[model], ids, version)
+        return session.query(model).filter(model.id.in_(ids)).delete()
+
+    def update_ids(self, session, model, ids, values):
+        """
+        Bulk `UPDATE ... SET values WHERE id IN ids` stamped with a new
+        version (Query.update() skips the flush hooks). Returns the row count.
+        """
+        if not ids:
+            return 0
+        values = dict(values, version=self.allocate(session))
+        return session.query(model).filter(model.id.in_(ids)).update(values, synchronize_session="fetch")
+
+    def _after_commit(self, session):
+        version = session.info.pop("change_version", None)
+        if version is not None:
+            self.notify(version)
+
+    def _after_rollback(self, session):
+        session.info.pop("change_version", None)
+
+    # -----------------------------
+    # Reading
+    # -----------------------------
+    def notify(self, version):
+        with self._cond:
+            if version > self._latest:
+                self._latest = version
+            self._cond.notify_all()
+
+    def wait(self, after_version, timeout):
+        """Block until this process commits a version above `after_version` or `timeout` passes."""
+        with self._cond:
+            if self._latest <= after_version:
+                self._cond.wait(timeout)
+            return self._latest
+
+    def current_version(self, session):
+        return session.execute(
+            select(self.sequence.c.value).where(self.sequence.c.id == _SEQUENCE_ID)
+        ).scalar() or 0
+
+    def changes_since(self, session, since, names=None, limit=CHANGE_MAX_ROWS):
+        """
+        Rows of each collection written after `since`, plus ids deleted since
+        then. Everything is bounded by the current version, so a write that
+        commits meanwhile is returned by the next call instead of being lost.
+        """
+        names = [n for n in (names or self.collections) if n in self.collections]
+        current = self.current_version(session)
+        payload = {"version": current, "since": since}
+        if since >= current:
+            for name in names:
+                payload[name] = []
+            payload["deleted"] = {}
+            return payload
+        for name in names:
+            model, schema = self.collections[name]
+            rows = (
+                session.query(*schema.columns(model))
+                .filter(model.version > since, model.version <= current)
+                .order_by(model.version, model.id)
+                .limit(limit + 1)
+                .all()
+            )
+            if len(rows) > limit:
+                return {"version": current, "since": since, "reset": True}
+            payload[name] = [schema.row_dict(r) for r in rows]
+        tomb = self.tombstones.c
+        deleted = {}
+        for name, row_id in session.execute(
+            select(tomb.collection, tomb.row_id)
+            .where(tomb.version > since, tomb.version <= current, tomb.collection.in_(names))
+            .order_by(tomb.version)
+        ):
+            deleted.setdefault(name, []).append(row_id)
+        payload["deleted"] = deleted
+        return payload
+
+    def stream(self, session, since, names=None, poll=STREAM_POLL_SECONDS,
+               heartbeat=STREAM_HEARTBEAT_SECONDS, max_seconds=STREAM_MAX_SECONDS):
+        """
+        Server-Sent Events generator: a "change" event (id = version) per
+        batch of commits, "reset" when the client is too far behind, and a
+        comment line as keepalive.
+        """
+        yield f"retry: {STREAM_RETRY_MS}\n\n"
+        started = last_sent = time.monotonic()
+        while time.monotonic() - started < max_seconds:
+            current = self.current_version(session)
+            if current > since:
+                payload = self.changes_since(session, since, names)
+                since = payload["version"]
+                if payload.get("reset") or payload["deleted"] or any(
+                    payload.get(name) for name in self.collections
+                ):
+                    kind = "reset" if payload.get("reset") else "change"
+                    yield f"id: {since}\nevent: {kind}\ndata: {dumps(payload).decode('utf-8')}\n\n"
+                    last_sent = time.monotonic()
+            # End the read transaction so the next poll sees new commits
+            session.rollback()
+            if time.monotonic() - last_sent >= heartbeat:
+                yield ": keepalive\n\n"
+                last_sent = time.monotonic()
+            self.wait(since, poll)
@@ -0,0 +1,149 @@
+"""
+Deadline Normalization Service
+Turns natural-language deadlines ("by Friday", "EOD", "next week") into ISO
+dates relative to the meeting date. Common phrases take a fast path; the rest
+go through an English-only dateparser configured once, and every result is
+cached by (phrase, anchor date).
+"""
+
+import calendar
+import re
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+try:
+    from dateparser.date import DateDataParser
+except Exception:
+    DateDataParser = None
+
+WEEKDAYS = {
+    "monday": 0, "mon": 0, "tuesday": 1, "tue": 1, "tues": 1, "wednesday": 2, "wed": 2,
+    "thursday": 3, "thu": 3, "thurs": 3, "friday": 4, "fri": 4, "saturday": 5, "sat": 5,
+    "sunday": 6, "sun": 6,
+}
+_ISO = re.compile(r"^(\d{4})-(\d{2})-(\d{2})(?:[T ].*)?$")
+_LEAD = re.compile(r"^(?:by|before|on|due|until|till|no later than)\s+")
+_IN_N = re.compile(r"^(?:in|within)\s+(\d+|a|one|two|three)\s+(day|week|month)s?$")
+_WEEKDAY = re.compile(r"^(?:(this|next|coming)\s+)?([a-z]+)$")
+_WORD_NUMBERS = {"a": 1, "one": 1, "two": 2, "three": 3}
+_SAME_DAY = {"today", "eod", "end of day", "end of the day", "tonight", "cob", "close of business"}
+
+
+def _add_months(d, months):
+    month = d.month - 1 + months
+    year = d.year + month // 12
+    month = month % 12 + 1
+    return date(year, month, min(d.day, calendar.monthrange(year, month)[1]))
+
+
+def _fast_path(phrase, anchor):
+    """Resolve ISO dates and common relative phrases without dateparser."""
+    m = _ISO.match(phrase)
+    if m:
+        try:
+            return date(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+        except ValueError:
+            return None
+    phrase = _LEAD.sub("", phrase).strip()
+    if phrase in _SAME_DAY:
+        return anchor
+    if phrase in ("tomorrow", "eod tomorrow", "tomorrow eod"):
+        return anchor + timedelta(days=1)
+    if phrase == "day after tomorrow":
+        return anchor + timedelta(days=2)
+    if phrase in ("next week", "a week", "one week"):
+        return anchor + timedelta(days=7)
+    if phrase in ("end of week", "end of the week", "eow", "this week"):
+        return anchor + timedelta(days=(4 - anchor.weekday()) % 7)
+    if phrase in ("end of month", "end of the month", "eom", "this month"):
+        return anchor.replace(day=calendar.monthrange(anchor.year, anchor.month)[1])
+    if phrase == "next month":
+        return _add_months(anchor, 1)
+    m = _IN_N.match(phrase)
+    if m:
+        n = _WORD_NUMBERS.get(m.group(1)) or int(m.group(1))
+        unit = m.group(2)
+        if unit == "day":
+            return anchor + timedelta(days=n)
+        if unit == "week":
+            return anchor + timedelta(weeks=n)
+        return _add_months(anchor, n)
+    m = _WEEKDAY.match(phrase)
+    if m and m.group(2) in WEEKDAYS:
+        ahead = (WEEKDAYS[m.group(2)] - anchor.weekday()) % 7
+        if m.group(1) == "next" and ahead == 0:
+            ahead = 7
+        return anchor + timedelta(days=ahead)
+    return None
+
+
+class DeadlineNormalizer:
+    """Cached deadline parser anchored on the meeting date."""
+
+    def __init__(self, languages=("en",), cache_size=4096):
+        self.languages = list(languages)
+        self._normalize_cached = lru_cache(maxsize=cache_size)(self._normalize_uncached)
+        self._parser_for = lru_cache(maxsize=32)(self._build_parser)
+        self.fast_path_hits = 0
+        self.dateparser_calls = 0
+
+    def _build_parser(self, anchor):
+        return DateDataParser(
+            languages=self.languages,
+            settings={
+                "PREFER_DATES_FROM": "future",
+                "RELATIVE_BASE": datetime.combine(anchor, datetime.min.time()),
+            },
+        )
+
+    def preload(self, anchor=None):
+        """Load dateparser's English data up front instead of on the first request."""
+        if DateDataParser is not None:
+            self._parser_for(anchor or date.today()).get_date_data("tomorrow")
+
+    def _normalize_uncached(self, phrase, anchor):
+        resolved = _fast_path(phrase, anchor)
+        if resolved is not None:
+            self.fast_path_hits += 1
+            return resolved.isoformat()
+        if DateDataParser is None:
+            return None
+        self.dateparser_calls += 1
+        data = self._parser_for(anchor).get_date_data(phrase)
+        dt = data["date_obj"] if data else None
+        return dt.date().isoformat() if dt else None
+
+    def normalize(self, deadline_str, anchor=None):
+        """
+        Convert a natural-language deadline into an ISO date string.
+        Unparseable phrases are returned unchanged; empty input returns "".
+        """
+        if not deadline_str or not isinstance(deadline_str, str):
+            return "" if not deadline_str else deadline_str
+        key = " ".join(deadline_str.lower().strip().rstrip(".").split())
+        if not key:
+            return ""
+        if isinstance(anchor, datetime):
+            anchor = anchor.date()
+        result = self._normalize_cached(key, anchor or date.today())
+        return result if result is not None else deadline_str
+
+    def normalize_many(self, phrases, anchor=None):
+        """Normalize a batch of phrases, parsing each distinct phrase once."""
+        resolved = {}
+        out = []
+        for phrase in phrases:
+            if phrase not in resolved:
+                resolved[phrase] = self.normalize(phrase, anchor)
+            out.append(resolved[phrase])
+        return out
+
+    def cache_info(self):
+        return self._normalize_cached.cache_info()
+
+
+DEFAULT_NORMALIZER = DeadlineNormalizer()
+
+
+def normalize_deadline(deadline_str, anchor=None):
+    return DEFAULT_NORMALIZER.normalize(deadline_str, anchor)
@@ -0,0 +1,284 @@
+"""
+MoM Exporters
+Pluggable renderers that turn a meeting snapshot (see
+mom_generator.snapshot_mom_inputs) into Markdown, HTML, JSON, PDF or DOCX
+bytes on demand. Rendered output is cached in memory by (format, content hash).
+"""
+
+import html
+import json
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+from types import SimpleNamespace
+
+from utils.mom_generator import mom_outline, mom_content_hash, render_mom_docx
+
+EXPORT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
+class Exporter:
+    def __init__(self, name, mimetype, extension, render, aliases=()):
+        self.name = name
+        self.mimetype = mimetype
+        self.extension = extension
+        self.render = render
+        self.aliases = tuple(aliases)
+
+
+EXPORTERS = {}
+
+
+def register_exporter(name, mimetype, extension, aliases=()):
+    """Decorator registering `render(snapshot) -> bytes` under `name` (and aliases)."""
+    def wrap(render):
+        exporter = Exporter(name, mimetype, extension, render, aliases)
+        for key in (name,) + tuple(aliases):
+            EXPORTERS[key] = exporter
+        return render
+    return wrap
+
+
+def get_exporter(fmt):
+    return EXPORTERS.get((fmt or "").lower())
+
+
+def export_formats():
+    return sorted({e.name for e in EXPORTERS.values()})
+
+
+def _objects(snapshot):
+    meeting = SimpleNamespace(**snapshot["meeting"])
+    tasks = [SimpleNamespace(**t) for t in snapshot["tasks"]]
+    conflicts = [SimpleNamespace(**c) for c in snapshot["conflicts"]]
+    return meeting, tasks, conflicts
+
+
+def _outline(snapshot):
+    return mom_outline(*_objects(snapshot))
+
+
+# -----------------------------
+# Formats
+# -----------------------------
+@register_exporter("markdown", "text/markdown; charset=utf-8", "md", aliases=("md",))
+def render_markdown(snapshot):
+    lines = []
+    for kind, text in _outline(snapshot):
+        text = text.strip("\n")
+        if kind == "title":
+            lines += [f"# {text}", ""]
+        elif kind == "heading":
+            if lines and lines[-1]:
+                lines.append("")
+            lines += [f"## {text}", ""]
+        elif kind == "bullet":
+            lines.append(f"- {text}")
+        else:
+            if lines and lines[-1].startswith("- "):
+                lines.append("")
+            lines += [text, ""]
+    return ("\n".join(lines).rstrip() + "\n").encode("utf-8")
+
+
+@register_exporter("html", "text/html; charset=utf-8", "html", aliases=("htm",))
+def render_html(snapshot):
+    out = []
+    in_list = False
+    for kind, text in _outline(snapshot):
+        text = html.escape(text.strip("\n"))
+        if kind == "bullet":
+            if not in_list:
+                out.append("<ul>")
+                in_list = True
+            out.append(f"<li>{text}</li>")
+            continue
+        if in_list:
+            out.append("</ul>")
+            in_list = False
+        if kind == "title":
+            out.append(f"<h1>{text}</h1>")
+        elif kind == "heading":
+            out.append(f"<h2>{text}</h2>")
+        else:
+            out.append(f"<p>{text}</p>")
+    if in_list:
+        out.append("</ul>")
+    title = html.escape(str(snapshot["meeting"].get("title") or "Minutes of Meeting"))
+    return (
+        "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\">"
+        f"<title>{title}</title></head>\n<body>\n" + "\n".join(out) + "\n</body></html>\n"
+    ).encode("utf-8")
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+@register_exporter("json", "application/json", "json")
+def render_json(snapshot):
+    summary = snapshot["meeting"].get("summary") or ""
+    doc = {
+        "meeting": snapshot["meeting"],
+        "summary_points": [s.strip() for s in summary.replace("\n", " ").split(".") if s.strip()],
+        "tasks": snapshot["tasks"],
+        "conflicts": snapshot["conflicts"],
+    }
+    return json.dumps(doc, default=_json_default, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+@register_exporter("docx", "application/vnd.openxmlformats-officedocument.wordprocessingml.document", "docx")
+def render_docx(snapshot):
+    return render_mom_docx(*_objects(snapshot))
+
+
+# -----------------------------
+# Minimal PDF writer (Helvetica, WinAnsi text, automatic line wrap and paging)
+# -----------------------------
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842  # A4 in points
+MARGIN = 56
+_PDF_STYLES = {"title": (18, 28), "heading": (14, 22), "para": (11, 15), "bullet": (11, 15)}
+_PDF_REPLACE = {"→": "->", "←": "<-", "✓": "v"}
+
+
+def _pdf_text(text):
+    for src, dst in _PDF_REPLACE.items():
+        text = text.replace(src, dst)
+    raw = text.encode("cp1252", errors="replace")
+    return raw.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+def _wrap(text, size, width):
+    # Helvetica averages ~0.5em per glyph; good enough for wrapping
+    max_chars = max(int(width / (size * 0.5)), 10)
+    lines = []
+    for raw in text.split("\n"):
+        words = raw.split(" ")
+        line = ""
+        for word in words:
+            candidate = f"{line} {word}" if line else word
+            if len(candidate) <= max_chars:
+                line = candidate
+                continue
+            if line:
+                lines.append(line)
+            while len(word) > max_chars:
+                lines.append(word[:max_chars])
+                word = word[max_chars:]
+            line = word
+        lines.append(line)
+    return lines
+
+
+@register_exporter("pdf", "application/pdf", "pdf")
+def render_pdf(snapshot):
+    pages = [[]]
+    y = PAGE_HEIGHT - MARGIN
+    for kind, text in _outline(snapshot):
+        size, leading = _PDF_STYLES[kind]
+        indent = 14 if kind == "bullet" else 0
+        prefix = "• " if kind == "bullet" else ""  # 0x95 in WinAnsi
+        font = "F2" if kind in ("title", "heading") else "F1"
+        if kind == "heading":
+            y -= 6
+        for i, line in enumerate(_wrap(text.strip("\n"), size, PAGE_WIDTH - 2 * MARGIN - indent)):
+            if y - leading < MARGIN:
+                pages.append([])
+                y = PAGE_HEIGHT - MARGIN
+            y -= leading
+            x = MARGIN + indent
+            if kind == "title":
+                x = max(MARGIN, (PAGE_WIDTH - len(line) * size * 0.5) / 2)
+            body = (prefix if i == 0 else "  ") + line if prefix else line
+            pages[-1].append(
+                b"BT /%s %d Tf %.1f %.1f Td (%s) Tj ET" % (font.encode(), size, x, y, _pdf_text(body))
+            )
+
+    objects = []  # index 0 -> object 1
+
+    def add(obj):
+        objects.append(obj)
+        return len(objects)
+
+    catalog = add(None)
+    pages_obj = add(None)
+    font_regular = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+    font_bold = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>")
+    page_ids = []
+    for ops in pages:
+        stream = b"\n".join(ops)
+        content = add(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] "
+            b"/Resources << /Font << /F1 %d 0 R /F2 %d 0 R >> >> /Contents %d 0 R >>"
+            % (pages_obj, PAGE_WIDTH, PAGE_HEIGHT, font_regular, font_bold, content)
+        ))
+    objects[catalog - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % pages_obj
+    objects[pages_obj - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % p for p in page_ids), len(page_ids))
+
+    out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for num, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (num, obj)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for off in offsets:
+        out += b"%010d 00000 n \n" % off
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog, xref)
+    return bytes(out)
+
+
+# -----------------------------
+# Content-hash cache
+# -----------------------------
+class ExportCache:
+    """Byte-bounded LRU of rendered exports keyed by (format, content hash)."""
+
+    def __init__(self, max_bytes=EXPORT_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            data = self._items.get(key)
+            if data is not None:
+                self._items.move_to_end(key)
+            return data
+
+    def put(self, key, data):
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._items[key] = data
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self._size -= len(evicted)
+
+
+EXPORT_CACHE = ExportCache()
+
+
+def export_etag(exporter, content_hash):
+    return f"{exporter.name}-{content_hash[:40]}"
+
+
+def render_export(exporter, snapshot, content_hash=None, cache=EXPORT_CACHE):
+    """Return (bytes, cache_hit) for `snapshot` in the exporter's format."""
+    content_hash = content_hash or mom_content_hash(snapshot)
+    key = (exporter.name, content_hash)
+    data = cache.get(key)
+    if data is not None:
+        return data, True
+    data = exporter.render(snapshot)
+    cache.put(key, data)
+    return data, False
@@ -0,0 +1,111 @@
+"""
+HTTP Response Caching and Compression
+Weak ETags for collection endpoints derived from (row count, max(updated_at))
+so a matching If-None-Match is answered with 304 before any rows are loaded,
+plus gzip/brotli compression of large text responses.
+"""
+
+import gzip
+import hashlib
+import os
+from functools import wraps
+
+from flask import request, Response, make_response
+from sqlalchemy import func
+
+try:
+    import brotli
+except Exception:
+    brotli = None
+
+COMPRESS_MIN_BYTES = int(os.environ.get("MOM_COMPRESS_MIN_BYTES", "1024"))
+COMPRESS_LEVEL_GZIP = 6
+COMPRESS_LEVEL_BROTLI = 5
+COMPRESSIBLE_TYPES = {
+    "application/json", "application/javascript", "application/xml", "image/svg+xml",
+    "text/html", "text/plain", "text/css", "text/csv", "text/markdown", "text/javascript",
+}
+
+
+def collection_version(session, *models):
+    """
+    (count, max(updated_at), max(created_at)) for each model in one round trip
+    per model. Changes whenever a row is inserted, updated or deleted.
+    """
+    parts = []
+    for model in models:
+        updated = getattr(model, "updated_at", None)
+        columns = [func.count(model.id), func.max(model.created_at)]
+        if updated is not None:
+            columns.append(func.max(updated))
+        row = session.query(*columns).one()
+        parts.append(f"{model.__tablename__}:" + ":".join(str(v) for v in row))
+    return "|".join(parts)
+
+
+def weak_etag(*parts):
+    return hashlib.sha1("\x1f".join(str(p) for p in parts).encode("utf-8")).hexdigest()[:32]
+
+
+def etag_from_version(version_fn):
+    """
+    Decorator for GET views: compute a cheap version string first and answer
+    If-None-Match with 304 without running the view (no query, no JSON).
+    The weak ETag also covers the path and query string.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            etag = weak_etag(request.full_path, version_fn(*args, **kwargs))
+            if request.if_none_match.contains_weak(etag):
+                response = Response(status=304)
+            else:
+                response = view(*args, **kwargs)
+                if not isinstance(response, Response):
+                    response = make_response(response)
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag, weak=True)
+            response.headers["Cache-Control"] = "no-cache"
+            return response
+        return wrapper
+    return decorator
+
+
+def _choose_encoding(accept_encoding):
+    if brotli is not None and "br" in accept_encoding:
+        return "br"
+    if "gzip" in accept_encoding:
+        return "gzip"
+    return None
+
+
+def compress_response(response, min_bytes=COMPRESS_MIN_BYTES):
+    """Compress a buffered text/JSON response in place when the client accepts it."""
+    if (
+        response.direct_passthrough
+        or response.is_streamed
+        or response.status_code < 200
+        or response.status_code in (204, 206, 304)
+        or "Content-Encoding" in response.headers
+        or response.mimetype not in COMPRESSIBLE_TYPES
+    ):
+        return response
+    response.vary.add("Accept-Encoding")
+    encoding = _choose_encoding(request.headers.get("Accept-Encoding", "").lower())
+    if encoding is None:
+        return response
+    data = response.get_data()
+    if len(data) < min_bytes:
+        return response
+    if encoding == "br":
+        body = brotli.compress(data, quality=COMPRESS_LEVEL_BROTLI)
+    else:
+        body = gzip.compress(data, compresslevel=COMPRESS_LEVEL_GZIP, mtime=0)
+    response.set_data(body)
+    response.headers["Content-Encoding"] = encoding
+    # A strong validator must change with the encoding; weak ones may stay
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
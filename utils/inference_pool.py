@@ -0,0 +1,155 @@
+"""
+Inference Pool
+Holds one or more model instances and leases them to callers, so independent
+pipeline stages can run LLM calls concurrently without sharing an instance.
+"""
+
+import queue
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+
+class InferencePool:
+    """Lazily-populated pool of model instances created by `factory`."""
+
+    def __init__(self, factory, size=1):
+        self.factory = factory
+        self.size = max(1, int(size))
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._waiting = 0
+
+    @property
+    def waiting(self):
+        """Callers currently blocked waiting for an instance (queue depth)."""
+        return self._waiting
+
+    @property
+    def in_use(self):
+        return self._created - self._idle.qsize()
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                create = True
+            else:
+                create = False
+        if create:
+            try:
+                return self.factory()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+        with self._lock:
+            self._waiting += 1
+        try:
+            return self._idle.get()
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+    @contextmanager
+    def lease(self):
+        instance = self._acquire()
+        try:
+            yield instance
+        finally:
+            self._idle.put(instance)
+
+    def warm(self):
+        """Create the first instance eagerly (surfaces load errors early)."""
+        with self.lease():
+            pass
+
+
+class PooledLLM:
+    """
+    Callable with the llama-cpp signature that leases an instance per call.
+    `observer(response, seconds)` is called after each completed call.
+    `speculative` (utils.speculative.SpeculativeDecoding) attaches a draft
+    model for the call sites that enable it.
+    """
+
+    def __init__(self, pool, observer=None, speculative=None):
+        self.pool = pool
+        self.observer = observer
+        self.speculative = speculative
+
+    def _draft(self, llm, kwargs):
+        if self.speculative is None:
+            return nullcontext()
+        return self.speculative.attach(llm, stream=bool(kwargs.get("stream")))
+
+    def __call__(self, *args, **kwargs):
+        with self.pool.lease() as llm:
+            with self._draft(llm, kwargs) as draft:
+                start = time.perf_counter()
+                response = llm(*args, **kwargs)
+                seconds = time.perf_counter() - start
+        if draft is not None:
+            self.speculative.annotate(response, draft, seconds)
+        if self.observer is not None:
+            self.observer(response, seconds)
+        return response
+
+    def stream(self, prompt, **kwargs):
+        """
+        Streaming completion: yields llama-cpp chunks while holding the lease.
+        Closing the generator early (or breaking out of the loop that drives
+        it) closes the llama-cpp stream, which stops token generation. The
+        observer gets a response assembled from the chunks, with
+        finish_reason "cancelled" when the consumer stopped early and
+        "first_token_seconds" for time-to-first-token.
+        """
+        kwargs["stream"] = True
+        with self.pool.lease() as llm:
+            with self._draft(llm, {}) as draft:
+                start = time.perf_counter()
+                chunks = llm(prompt=prompt, **kwargs)
+                texts = []
+                finish_reason = "cancelled"
+                first_token = None
+                try:
+                    for chunk in chunks:
+                        choice = chunk["choices"][0]
+                        texts.append(choice.get("text") or "")
+                        if first_token is None and texts[-1]:
+                            first_token = time.perf_counter() - start
+                        if choice.get("finish_reason"):
+                            finish_reason = choice["finish_reason"]
+                        yield chunk
+                    if finish_reason == "cancelled":
+                        finish_reason = "stop"
+                finally:
+                    close = getattr(chunks, "close", None)
+                    if close is not None:
+                        close()
+                    seconds = time.perf_counter() - start
+                    prompt_tokens = len(llm.tokenize(prompt.encode("utf-8"))) if hasattr(llm, "tokenize") else 0
+                    # Runs on early close too (GeneratorExit at the yield)
+                    self._observe_stream(prompt_tokens, texts, finish_reason, first_token, draft, seconds)
+
+    def _observe_stream(self, prompt_tokens, texts, finish_reason, first_token, draft, seconds):
+        # One chunk per generated token (the final chunk may only carry finish_reason)
+        completion_tokens = sum(1 for t in texts if t)
+        response = {
+            "choices": [{"text": "".join(texts), "index": 0, "finish_reason": finish_reason}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+            "first_token_seconds": first_token,
+        }
+        if draft is not None:
+            self.speculative.annotate(response, draft, seconds)
+        if self.observer is not None:
+            self.observer(response, seconds)
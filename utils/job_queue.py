@@ -0,0 +1,304 @@
+"""
+Job Queue
+A durable queue of pipeline jobs kept in a table of the app database, so any
+number of worker processes on any number of hosts can drain it while the
+web process only enqueues and reads results.
+
+A worker leases a job by flipping it to "running" with an UPDATE guarded by
+the same condition that made it claimable (compare-and-swap), which works on
+SQLite and PostgreSQL alike: only one of several racing workers matches the
+row. The lease lasts `visibility` seconds and is extended by heartbeats while
+the job runs; a job whose lease expires (worker killed, host gone) becomes
+claimable again. `attempts` is bumped on every lease and doubles as a fencing
+token, so a worker that lost its lease can no longer complete or fail the job.
+Failed attempts are retried with exponential backoff up to `max_attempts`.
+
+Delivery is at-least-once: a handler may run again after a lost lease, so
+handlers should be safe to repeat; attach_meeting() lets a handler record the
+meeting it created in the same transaction, so a retry can resume it. Lease deadlines are epoch seconds from the
+worker's clock; keep hosts NTP-synced and visibility well above clock skew.
+"""
+
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import and_, insert, or_, select, update
+
+from utils.structured_log import get_logger
+
+log = get_logger("job_queue")
+
+VISIBILITY_SECONDS = float(os.environ.get("MOM_JOB_VISIBILITY_SECONDS", "300"))
+MAX_ATTEMPTS = int(os.environ.get("MOM_JOB_MAX_ATTEMPTS", "3"))
+POLL_SECONDS = float(os.environ.get("MOM_JOB_POLL_SECONDS", "2"))
+RETRY_BACKOFF_SECONDS = float(os.environ.get("MOM_JOB_RETRY_BACKOFF_SECONDS", "10"))
+RETRY_BACKOFF_MAX_SECONDS = 600.0
+LEASE_CANDIDATES = 8  # ids read per lease attempt; losers of a race try the next one
+
+QUEUED, RUNNING, SUCCEEDED, FAILED = "queued", "running", "succeeded", "failed"
+
+
+class JobRejected(Exception):
+    """Raised by a handler for jobs that can never succeed; the job fails without retries."""
+
+
+def default_worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+def _utcnow():
+    return datetime.now(timezone.utc)
+
+
+class LeasedJob:
+    """A job row held by this worker; `attempts` is the fencing token of the lease."""
+
+    def __init__(self, row, worker_id):
+        self.id = row.id
+        self.kind = row.kind
+        self.payload = row.payload or {}
+        self.meeting_id = row.meeting_id
+        self.attempts = row.attempts
+        self.max_attempts = row.max_attempts
+        self.worker_id = worker_id
+        self.lost = False  # set when a heartbeat finds the lease taken over
+
+    @property
+    def last_attempt(self):
+        return self.attempts >= self.max_attempts
+
+
+class JobQueue:
+    """
+    `on_reap` maps a job kind to a callable taking the payload of a job of
+    that kind which reap() failed; no handler ever sees such a job again, so
+    this is where resources it owns (e.g. spooled audio) are released.
+    """
+
+    def __init__(self, job_model, visibility=VISIBILITY_SECONDS, max_attempts=MAX_ATTEMPTS, on_reap=None):
+        self.table = job_model.__table__
+        self.visibility = visibility
+        self.max_attempts = max_attempts
+        self.on_reap = dict(on_reap or {})
+        self.engine = None
+
+    def bind(self, engine):
+        """Use `engine` for the worker-side operations (each in its own short transaction)."""
+        self.engine = engine
+
+    def _claimable(self, now):
+        t = self.table
+        return and_(
+            t.c.attempts < t.c.max_attempts,
+            or_(
+                and_(t.c.status == QUEUED, t.c.available_at <= now),
+                and_(t.c.status == RUNNING, t.c.lease_expires_at < now),
+            ),
+        )
+
+    def _held(self, job):
+        t = self.table
+        return and_(t.c.id == job.id, t.c.status == RUNNING,
+                    t.c.lease_owner == job.worker_id, t.c.attempts == job.attempts)
+
+    # -----------------------------
+    # Web side
+    # -----------------------------
+    def enqueue(self, session, kind, payload, meeting_id=None, max_attempts=None, delay=0.0):
+        """Insert a queued job through `session` and commit; returns the job id."""
+        result = session.execute(insert(self.table).values(
+            kind=kind,
+            payload=payload,
+            meeting_id=meeting_id,
+            status=QUEUED,
+            attempts=0,
+            max_attempts=max_attempts or self.max_attempts,
+            available_at=time.time() + delay,
+            created_at=_utcnow(),
+        ))
+        job_id = result.inserted_primary_key[0]
+        session.commit()
+        log.info("Job enqueued", extra={"job_id": job_id, "kind": kind, "meeting_id": meeting_id})
+        return job_id
+
+    # -----------------------------
+    # Worker side
+    # -----------------------------
+    def reap(self):
+        """Fail running jobs whose lease expired on their last allowed attempt."""
+        t = self.table
+        now = time.time()
+        expired = and_(t.c.status == RUNNING, t.c.lease_expires_at < now, t.c.attempts >= t.c.max_attempts)
+        reaped = []
+        with self.engine.begin() as conn:
+            for row in conn.execute(select(t.c.id, t.c.kind, t.c.payload).where(expired)).all():
+                # Per row, so only the worker that flips a job runs its on_reap cleanup
+                if conn.execute(
+                    update(t).where(t.c.id == row.id, expired)
+                    .values(status=FAILED, error="lease expired on the last attempt", finished_at=_utcnow())
+                ).rowcount:
+                    reaped.append(row)
+        if reaped:
+            log.warning("Failed jobs whose last lease expired", extra={"count": len(reaped)})
+        for row in reaped:
+            cleanup = self.on_reap.get(row.kind)
+            if cleanup is None:
+                continue
+            try:
+                cleanup(row.payload or {})
+            except Exception as e:
+                log.warning("Reaped job cleanup failed", extra={"job_id": row.id, "error": str(e)})
+        return len(reaped)
+
+    def lease(self, worker_id, kinds=None):
+        """Claim the oldest claimable job for `worker_id`, or return None."""
+        t = self.table
+        self.reap()
+        now = time.time()
+        query = select(t.c.id).where(self._claimable(now))
+        if kinds:
+            query = query.where(t.c.kind.in_(list(kinds)))
+        with self.engine.begin() as conn:
+            candidates = conn.execute(
+                query.order_by(t.c.available_at, t.c.id).limit(LEASE_CANDIDATES)
+            ).scalars().all()
+        for job_id in candidates:
+            now = time.time()
+            with self.engine.begin() as conn:
+                claimed = conn.execute(
+                    update(t)
+                    .where(t.c.id == job_id, self._claimable(now))
+                    .values(status=RUNNING, lease_owner=worker_id,
+                            lease_expires_at=now + self.visibility,
+                            attempts=t.c.attempts + 1, started_at=_utcnow(), error=None)
+                ).rowcount
+                if claimed:
+                    row = conn.execute(select(t).where(t.c.id == job_id)).one()
+                    return LeasedJob(row, worker_id)
+        return None
+
+    def heartbeat(self, job):
+        """Extend the lease; False when it was lost (expired and taken by another worker)."""
+        with self.engine.begin() as conn:
+            held = conn.execute(
+                update(self.table).where(self._held(job))
+                .values(lease_expires_at=time.time() + self.visibility)
+            ).rowcount
+        return bool(held)
+
+    def attach_meeting(self, session, job, meeting_id):
+        """
+        Set the job's meeting_id through `session` without committing, so it
+        lands in the same transaction as the meeting it names; False when the
+        lease was lost. A retried handler sees it as `job.meeting_id`.
+        """
+        held = session.execute(
+            update(self.table).where(self._held(job)).values(meeting_id=meeting_id)
+        ).rowcount
+        if held:
+            job.meeting_id = meeting_id
+        return bool(held)
+
+    def complete(self, job, result=None):
+        with self.engine.begin() as conn:
+            done = conn.execute(
+                update(self.table).where(self._held(job))
+                .values(status=SUCCEEDED, result=result, finished_at=_utcnow())
+            ).rowcount
+        return bool(done)
+
+    def fail(self, job, error, retry=True):
+        """Requeue with backoff, or mark failed on the last attempt (or when not `retry`)."""
+        values = {"error": str(error)[:2000]}
+        if job.last_attempt or not retry:
+            values.update(status=FAILED, finished_at=_utcnow())
+        else:
+            backoff = min(RETRY_BACKOFF_SECONDS * 2 ** (job.attempts - 1), RETRY_BACKOFF_MAX_SECONDS)
+            values.update(status=QUEUED, available_at=time.time() + backoff, lease_owner=None)
+        with self.engine.begin() as conn:
+            done = conn.execute(update(self.table).where(self._held(job)).values(**values)).rowcount
+        return bool(done)
+
+
+class Worker:
+    """
+    Leases jobs and runs `handlers[job.kind](job)`; the handler's return value
+    is stored as the job result. `context()` wraps each job (e.g. an app
+    context). A heartbeat thread extends the lease every visibility / 3.
+    """
+
+    def __init__(self, queue, handlers, worker_id=None, kinds=None, poll=POLL_SECONDS, context=None):
+        self.queue = queue
+        self.handlers = handlers
+        self.worker_id = worker_id or default_worker_id()
+        self.kinds = list(kinds or handlers)
+        self.poll = poll
+        self.context = context
+        self.processed = 0
+
+    def _heartbeat(self, job, done):
+        interval = max(self.queue.visibility / 3.0, 0.05)
+        while not done.wait(interval):
+            try:
+                if not self.queue.heartbeat(job):
+                    job.lost = True
+                    log.warning("Job lease lost", extra={"job_id": job.id, "worker": self.worker_id})
+                    return
+            except Exception as e:
+                log.warning("Job heartbeat failed", extra={"job_id": job.id, "error": str(e)})
+
+    def run_one(self, job):
+        done = threading.Event()
+        beat = threading.Thread(target=self._heartbeat, args=(job, done), daemon=True,
+                                name=f"job-heartbeat-{job.id}")
+        beat.start()
+        start = time.perf_counter()
+        extra = {"job_id": job.id, "kind": job.kind, "attempt": job.attempts, "worker": self.worker_id}
+        log.info("Job started", extra=extra)
+        try:
+            if self.context is not None:
+                with self.context():
+                    result = self.handlers[job.kind](job)
+            else:
+                result = self.handlers[job.kind](job)
+        except Exception as e:
+            done.set()
+            if isinstance(e, JobRejected):
+                log.warning("Job rejected", extra=dict(extra, error=str(e)))
+            else:
+                log.exception("Job failed", extra=extra)
+            if not self.queue.fail(job, e, retry=not isinstance(e, JobRejected)):
+                log.warning("Job failure not recorded: lease lost", extra=extra)
+            return False
+        finally:
+            done.set()
+            beat.join()
+        if not self.queue.complete(job, result):
+            log.warning("Job result discarded: lease lost", extra=extra)
+            return False
+        log.info("Job finished", extra=dict(extra, duration_ms=round((time.perf_counter() - start) * 1000, 1)))
+        return True
+
+    def run(self, stop=None, max_jobs=None, exit_when_idle=False):
+        """Work until `stop` is set, `max_jobs` ran, or (exit_when_idle) the queue is empty."""
+        stop = stop or threading.Event()
+        log.info("Worker started", extra={"worker": self.worker_id, "kinds": self.kinds})
+        while not stop.is_set() and (max_jobs is None or self.processed < max_jobs):
+            try:
+                job = self.queue.lease(self.worker_id, self.kinds)
+            except Exception as e:
+                log.warning("Job lease failed", extra={"error": str(e)})
+                job = None
+            if job is None:
+                if exit_when_idle:
+                    break
+                stop.wait(self.poll)
+                continue
+            self.run_one(job)
+            self.processed += 1
+        log.info("Worker stopped", extra={"worker": self.worker_id, "processed": self.processed})
+        return self.processed
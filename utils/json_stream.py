@@ -0,0 +1,107 @@
+"""
+Incremental JSON Array Parser
+Consumes LLM output chunk by chunk and returns each element of the first
+top-level JSON array (or the first top-level object) as soon as it is
+complete, so callers can stop generation the moment the array closes
+instead of waiting for max_tokens of trailing commentary.
+
+Only string/escape state and bracket depth are tracked per character;
+each finished element is handed to json.loads once.
+"""
+
+import json
+import re
+
+_TRAILING_COMMA = re.compile(r",\s*([\]}])")
+_INVALID = object()
+
+
+def _loads(text):
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+    try:
+        return json.loads(_TRAILING_COMMA.sub(r"\1", text))
+    except ValueError:
+        return _INVALID
+
+
+class JsonArrayStream:
+    """
+    Feed text with `feed()`; it returns the elements completed by that chunk.
+    Text before the first "[" or "{" (e.g. "Here are the tasks:") is skipped.
+    `done` turns True when the top-level value closes; `items` holds every
+    element parsed so far and `errors` counts elements that were not valid
+    JSON even after dropping trailing commas.
+    """
+
+    def __init__(self):
+        self.items = []
+        self.errors = 0
+        self.done = False
+        self.is_array = None
+        self._chunks = []
+        self._element = []  # characters of the current element
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    @property
+    def text(self):
+        """All text fed so far (including anything after the closing bracket)."""
+        return "".join(self._chunks)
+
+    def _finish_element(self, out):
+        raw = "".join(self._element).strip()
+        self._element = []
+        if not raw:
+            return
+        value = _loads(raw)
+        if value is _INVALID:
+            self.errors += 1
+            return
+        self.items.append(value)
+        out.append(value)
+
+    def feed(self, chunk):
+        self._chunks.append(chunk)
+        out = []
+        if self.done:
+            return out
+        for ch in chunk:
+            if self._depth == 0:
+                if ch == "[":
+                    self.is_array = True
+                    self._depth = 1
+                elif ch == "{":
+                    self.is_array = False
+                    self._depth = 1
+                    self._element.append(ch)
+                continue
+            if self._in_string:
+                self._element.append(ch)
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+            if ch == '"':
+                self._in_string = True
+            elif ch in "[{":
+                self._depth += 1
+            elif ch in "]}":
+                self._depth -= 1
+                if self._depth == 0:
+                    if not self.is_array:
+                        self._element.append(ch)
+                    self._finish_element(out)
+                    self.done = True
+                    break
+            elif ch == "," and self._depth == 1 and self.is_array:
+                self._finish_element(out)
+                continue
+            self._element.append(ch)
+        return out
@@ -0,0 +1,270 @@
+"""
+Metrics Registry
+Minimal Prometheus-compatible counters, gauges and histograms with labels,
+rendered in the text exposition format served at /metrics.
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _label_str(names, values, extra=None):
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def header(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels):
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self):
+        lines = self.header()
+        with self._lock:
+            for key, v in sorted(self._values.items()):
+                lines.append(f"{self.name}{_label_str(self.labelnames, key)} {v}")
+        return lines
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name, help_text, labelnames=(), callback=None):
+        super().__init__(name, help_text, labelnames)
+        # callback() -> {label-values tuple: value}, evaluated at scrape time
+        self.callback = callback
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def render(self):
+        lines = self.header()
+        values = dict(self._values)
+        if self.callback is not None:
+            try:
+                values.update(self.callback())
+            except Exception:
+                pass
+        for key, v in sorted(values.items()):
+            lines.append(f"{self.name}{_label_str(self.labelnames, key)} {v}")
+        return lines
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            idx = bisect.bisect_left(self.buckets, value)
+            if idx < len(self.buckets):
+                state[0][idx] += 1
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self):
+        lines = self.header()
+        with self._lock:
+            for key, (counts, total, n) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, c in zip(self.buckets, counts):
+                    cumulative += c
+                    lines.append(f"{self.name}_bucket{_label_str(self.labelnames, key, ('le', bound))} {cumulative}")
+                lines.append(f"{self.name}_bucket{_label_str(self.labelnames, key, ('le', '+Inf'))} {n}")
+                lines.append(f"{self.name}_sum{_label_str(self.labelnames, key)} {total}")
+                lines.append(f"{self.name}_count{_label_str(self.labelnames, key)} {n}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name, help_text, labelnames=()):
+        return self._register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name, help_text, labelnames=(), callback=None):
+        return self._register(Gauge(name, help_text, labelnames, callback))
+
+    def histogram(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+
+    def render(self):
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+# -----------------------------
+# Pipeline metrics
+# -----------------------------
+STAGE_SECONDS = REGISTRY.histogram(
+    "mom_stage_duration_seconds", "Duration of pipeline stages.", ("pipeline", "stage"))
+HTTP_SECONDS = REGISTRY.histogram(
+    "mom_http_request_duration_seconds", "HTTP request latency.", ("endpoint", "method", "status"))
+LLM_CALL_SECONDS = REGISTRY.histogram(
+    "mom_llm_call_duration_seconds", "Wall time of a single LLM call.", ("site",))
+LLM_TOKENS = REGISTRY.counter(
+    "mom_llm_tokens_total", "Tokens processed by the LLM.", ("kind",))
+LLM_TOKENS_PER_SECOND = REGISTRY.histogram(
+    "mom_llm_tokens_per_second", "Per-call LLM throughput (tokens / call wall time).", ("kind",),
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000))
+ASR_RTF = REGISTRY.histogram(
+    "mom_asr_real_time_factor", "ASR processing time divided by audio duration.",
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1, 1.5, 2, 5))
+ASR_AUDIO_SECONDS = REGISTRY.counter(
+    "mom_asr_audio_seconds_total", "Seconds of audio transcribed.")
+CACHE_REQUESTS = REGISTRY.counter(
+    "mom_cache_requests_total", "Cache lookups by cache and result.", ("cache", "result"))
+LLM_DECODE_TOKENS_PER_SECOND = REGISTRY.histogram(
+    "mom_llm_decode_tokens_per_second", "Completion tokens per second by call site and decoding mode.",
+    ("site", "mode"), buckets=(1, 2, 5, 10, 20, 30, 50, 75, 100, 200, 500))
+LLM_DRAFT_TOKENS = REGISTRY.counter(
+    "mom_llm_draft_tokens_total", "Speculative draft tokens proposed and (estimated) accepted.", ("site", "result"))
+LLM_DRAFT_ACCEPTANCE = REGISTRY.histogram(
+    "mom_llm_draft_acceptance_ratio", "Per-call share of drafted tokens accepted.", ("site",),
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1))
+LLM_CANCELLED = REGISTRY.counter(
+    "mom_llm_cancelled_total", "Streamed LLM calls stopped early (output complete or client gone).", ("site",))
+LLM_FIRST_TOKEN_SECONDS = REGISTRY.histogram(
+    "mom_llm_first_token_seconds", "Streamed LLM calls: seconds until the first generated token.", ("site",),
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30))
+NEAR_DUPLICATES = REGISTRY.counter(
+    "mom_near_duplicates_total", "Extracted rows matching an earlier meeting's row.", ("collection", "action"))
+DB_QUERY_SECONDS = REGISTRY.histogram(
+    "mom_db_query_duration_seconds", "SQL statement execution time.", ("operation",),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5))
+
+
+_site = threading.local()
+
+
+@contextmanager
+def llm_site(name):
+    """Label LLM calls made inside this block (per thread) with a call-site name."""
+    previous = getattr(_site, "name", None)
+    _site.name = name
+    try:
+        yield
+    finally:
+        _site.name = previous
+
+
+def current_llm_site():
+    return getattr(_site, "name", None) or "other"
+
+
+def observe_stage_run(pipeline, run):
+    """Feed every stage of a StageRun into the stage histogram."""
+    for stage, timing in run.timings.items():
+        STAGE_SECONDS.observe(timing["duration"], pipeline=pipeline, stage=stage)
+
+
+def observe_llm_call(response, seconds, site=None):
+    """Record tokens and throughput from a llama-cpp completion response."""
+    site = site or current_llm_site()
+    LLM_CALL_SECONDS.observe(seconds, site=site)
+    if isinstance(response, dict) and (response.get("choices") or [{}])[0].get("finish_reason") == "cancelled":
+        LLM_CANCELLED.inc(site=site)
+    if isinstance(response, dict) and response.get("first_token_seconds") is not None:
+        LLM_FIRST_TOKEN_SECONDS.observe(response["first_token_seconds"], site=site)
+    usage = response.get("usage") if isinstance(response, dict) else None
+    if not usage:
+        return
+    for kind in ("prompt", "completion"):
+        tokens = usage.get(f"{kind}_tokens") or 0
+        LLM_TOKENS.inc(tokens, kind=kind)
+        if seconds > 0 and tokens:
+            LLM_TOKENS_PER_SECOND.observe(tokens / seconds, kind=kind)
+    speculative = response.get("speculative")
+    completion = usage.get("completion_tokens") or 0
+    if seconds > 0 and completion:
+        LLM_DECODE_TOKENS_PER_SECOND.observe(
+            completion / seconds, site=site, mode="speculative" if speculative else "standard")
+    if speculative:
+        LLM_DRAFT_TOKENS.inc(speculative["proposed_tokens"], site=site, result="proposed")
+        LLM_DRAFT_TOKENS.inc(speculative["accepted_tokens"], site=site, result="accepted")
+        if speculative["proposed_tokens"]:
+            LLM_DRAFT_ACCEPTANCE.observe(speculative["acceptance_rate"], site=site)
+
+
+def instrument_sqlalchemy(engine):
+    """Time every SQL statement executed on `engine`."""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("query_start")
+        if not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+        operation = statement.lstrip().split(None, 1)[0].lower() if statement else "unknown"
+        DB_QUERY_SECONDS.observe(elapsed, operation=operation)
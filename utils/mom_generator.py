@@ -1,97 +1,201 @@
 from docx import Document
-from docx.shared import Pt
+from functools import lru_cache
+from types import SimpleNamespace
+from xml.sax.saxutils import escape
+import hashlib
+import io
 import os
+import re
+import zipfile
 
-FILES_DIR = os.path.join(os.getcwd(), "files")
-os.makedirs(FILES_DIR, exist_ok=True)
+from utils.artifact_store import ARTIFACT_DIR as FILES_DIR, ArtifactStore, DEFAULT_STORE
 
-def generate_mom_document(meeting_data, tasks, conflicts, transcript_segments=None):
+# Bump when the document layout changes so cached MoMs are regenerated
+RENDERER_VERSION = "2"
+
+# Characters python-docx would reject in a w:t element
+_XML_INVALID = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+# -----------------------------
+# TEMPLATE CACHE
+# -----------------------------
+@lru_cache(maxsize=1)
+def _template():
     """
-    Generate MoM DOCX with:
+    Build the default python-docx package once and keep its parts as bytes.
+    Every render reuses the styles, theme, settings etc. verbatim and only
+    writes a new word/document.xml, so no XML is parsed per document.
+    """
+    buf = io.BytesIO()
+    Document().save(buf)
+    parts = []
+    with zipfile.ZipFile(buf) as z:
+        for info in z.infolist():
+            parts.append((info.filename, z.read(info.filename)))
+    document_xml = dict(parts)["word/document.xml"].decode("utf-8")
+    body = document_xml.index("<w:body>") + len("<w:body>")
+    sect = document_xml.index("<w:sectPr", body)
+    return parts, document_xml[:body], document_xml[sect:]
+
+def _run_xml(text):
+    # Same mapping as python-docx's run.text setter: \n -> w:br, \t -> w:tab
+    out = []
+    for i, line in enumerate(_XML_INVALID.sub("", str(text)).split("\n")):
+        if i:
+            out.append("<w:br/>")
+        for j, piece in enumerate(line.split("\t")):
+            if j:
+                out.append("<w:tab/>")
+            if piece:
+                out.append(f'<w:t xml:space="preserve">{escape(piece)}</w:t>')
+    return f"<w:r>{''.join(out)}</w:r>"
+
+def _paragraph(text, style=None, center=False):
+    ppr = ""
+    if style or center:
+        ppr = "<w:pPr>"
+        if style:
+            ppr += f'<w:pStyle w:val="{style}"/>'
+        if center:
+            ppr += '<w:jc w:val="center"/>'
+        ppr += "</w:pPr>"
+    return f"<w:p>{ppr}{_run_xml(text)}</w:p>"
+
+def _bullets(items, empty):
+    return [("bullet", item) for item in items] or [("bullet", empty)]
+
+def mom_outline(meeting_data, tasks, conflicts):
+    """
+    MoM content as (kind, text) items shared by every output format.
+    kind is one of "title", "heading", "para", "bullet":
     - Meeting Details
     - Summary
     - Action Items (Tasks)
     - Conflicts (if any)
     """
-
-    doc = Document()
-
-    # Main Title
-    title = doc.add_heading("Minutes of Meeting (MoM)", level=1)
-    title.alignment = 1
+    items = [("title", "Minutes of Meeting (MoM)")]
 
     # -----------------------------
     # MEETING DETAILS
     # -----------------------------
-    doc.add_paragraph(f"Meeting Name: {meeting_data.title}")
-    doc.add_paragraph(f"Meeting Host: {meeting_data.host}")
-
-    doc.add_paragraph("Present Members:")
-    if meeting_data.presentees:
-        for p in meeting_data.presentees.split(","):
-            doc.add_paragraph(f"    • {p.strip()}")
-    else:
-        doc.add_paragraph("    • Not Provided")
-
-    doc.add_paragraph("\nAbsent Members:")
-    if meeting_data.absentees:
-        for p in meeting_data.absentees.split(","):
-            doc.add_paragraph(f"    • {p.strip()}")
-    else:
-        doc.add_paragraph("    • None")
-
-    doc.add_paragraph(f"\nDate of Meeting: {meeting_data.date}")
-    doc.add_paragraph(f"Time: {meeting_data.start_time or ''} – {meeting_data.end_time or ''} (IST)")
+    items.append(("para", f"Meeting Name: {meeting_data.title}"))
+    items.append(("para", f"Meeting Host: {meeting_data.host}"))
+
+    items.append(("para", "Present Members:"))
+    presentees = [p.strip() for p in meeting_data.presentees.split(",")] if meeting_data.presentees else []
+    items.extend(_bullets(presentees, "Not Provided"))
+
+    items.append(("para", "\nAbsent Members:"))
+    absentees = [p.strip() for p in meeting_data.absentees.split(",")] if meeting_data.absentees else []
+    items.extend(_bullets(absentees, "None"))
+
+    items.append(("para", f"\nDate of Meeting: {meeting_data.date}"))
+    items.append(("para", f"Time: {meeting_data.start_time or ''} – {meeting_data.end_time or ''} (IST)"))
 
     # -----------------------------
     # SUMMARY SECTION
     # -----------------------------
-    doc.add_heading("Agenda → Summary of Meeting :", level=2)
-
+    items.append(("heading", "Agenda → Summary of Meeting :"))
+    # Split into bullet points if possible
+    points = []
     if meeting_data.summary:
-        # Split into bullet points if possible
-        points = [
-            s.strip() for s in meeting_data.summary.replace("\n", " ").split(".")
-            if s.strip()
-        ]
-        for p in points:
-            doc.add_paragraph(f"    • {p}")
-    else:
-        doc.add_paragraph("    • No summary available.")
+        points = [s.strip() for s in meeting_data.summary.replace("\n", " ").split(".") if s.strip()]
+    items.extend(_bullets(points, "No summary available."))
 
     # -----------------------------
     # TASKS SECTION
     # -----------------------------
-    doc.add_heading("Action Items → Tasks Assigned :", level=2)
-
-    if tasks:
-        for t in tasks:
-            person = t.person or "Unknown"
-            task_text = t.task or "Unnamed Task"
-            status = t.status or "Pending"
-            doc.add_paragraph(f"    • {person} → {task_text}. ({status})")
-    else:
-        doc.add_paragraph("    • No tasks assigned.")
+    items.append(("heading", "Action Items → Tasks Assigned :"))
+    items.extend(_bullets([
+        f"{t.person or 'Unknown'} → {t.task or 'Unnamed Task'}. ({t.status or 'Pending'})"
+        for t in tasks or []
+    ], "No tasks assigned."))
 
     # -----------------------------
     # CONFLICTS SECTION
     # -----------------------------
-    doc.add_heading("Conflicts / Issues Raised :", level=2)
-
-    if conflicts:
-        for c in conflicts:
-            issue = c.issue or "No issue description"
-            raised_by = c.raised_by or "Unknown"
-            sev = c.severity
-            doc.add_paragraph(f"    • {issue} → Raised By: {raised_by}  (Severity: {sev})")
-    else:
-        doc.add_paragraph("    • No conflicts reported.")
+    items.append(("heading", "Conflicts / Issues Raised :"))
+    items.extend(_bullets([
+        f"{c.issue or 'No issue description'} → Raised By: {c.raised_by or 'Unknown'}  (Severity: {c.severity})"
+        for c in conflicts or []
+    ], "No conflicts reported."))
+    return items
+
+def _body_paragraphs(meeting_data, tasks, conflicts):
+    paras = []
+    for kind, text in mom_outline(meeting_data, tasks, conflicts):
+        if kind == "title":
+            paras.append(_paragraph(text, style="Heading1", center=True))
+        elif kind == "heading":
+            paras.append(_paragraph(text, style="Heading2"))
+        elif kind == "bullet":
+            paras.append(_paragraph(f"    • {text}"))
+        else:
+            paras.append(_paragraph(text))
+    return paras
+
+_ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+
+def render_mom_docx(meeting_data, tasks, conflicts):
+    """Render the MoM as DOCX bytes from the cached template."""
+    parts, head, tail = _template()
+    document_xml = head + "".join(_body_paragraphs(meeting_data, tasks, conflicts)) + tail
+    buf = io.BytesIO()
+    # Fixed entry order, timestamps and compression so identical content gives
+    # identical bytes (and one content-addressed file)
+    with zipfile.ZipFile(buf, "w") as z:
+        for name, data in sorted(parts):
+            info = zipfile.ZipInfo(name, date_time=_ZIP_EPOCH)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            z.writestr(info, document_xml.encode("utf-8") if name == "word/document.xml" else data)
+    return buf.getvalue()
+
+def generate_mom_document(meeting_data, tasks, conflicts, transcript_segments=None, files_dir=None):
+    """
+    Generate MoM DOCX with:
+    - Meeting Details
+    - Summary
+    - Action Items (Tasks)
+    - Conflicts (if any)
+    """
+    data = render_mom_docx(meeting_data, tasks, conflicts)
 
     # -----------------------------
-    # SAVE FILE
+    # SAVE FILE (content-addressed, see utils.artifact_store)
     # -----------------------------
-    filename = f"MoM_{meeting_data.id}.docx"
-    filepath = os.path.join(FILES_DIR, filename)
-    doc.save(filepath)
-
-    return filepath
\ No newline at end of file
+    store = DEFAULT_STORE if not files_dir or os.path.abspath(files_dir) == FILES_DIR else ArtifactStore(files_dir)
+    return store.put_bytes(data, "docx")
+
+# -----------------------------
+# CONTENT HASH + SNAPSHOTS (batch regeneration)
+# -----------------------------
+MEETING_FIELDS = ("id", "title", "host", "presentees", "absentees", "date", "start_time", "end_time", "summary")
+TASK_FIELDS = ("person", "task", "status")
+CONFLICT_FIELDS = ("issue", "raised_by", "severity")
+
+def snapshot_mom_inputs(meeting_data, tasks, conflicts):
+    """Plain, picklable copy of exactly the fields the MoM renders."""
+    return {
+        "meeting": {f: getattr(meeting_data, f, None) for f in MEETING_FIELDS},
+        "tasks": [{f: getattr(t, f, None) for f in TASK_FIELDS} for t in tasks or []],
+        "conflicts": [{f: getattr(c, f, None) for f in CONFLICT_FIELDS} for c in conflicts or []],
+    }
+
+def mom_content_hash(snapshot):
+    """Hash of the rendered inputs; equal hashes mean an identical document."""
+    h = hashlib.sha256(RENDERER_VERSION.encode())
+    meeting = snapshot["meeting"]
+    for f in MEETING_FIELDS:
+        h.update(b"\x1f" + str(meeting.get(f)).encode("utf-8"))
+    for key, fields in (("tasks", TASK_FIELDS), ("conflicts", CONFLICT_FIELDS)):
+        h.update(b"\x1e" + key.encode())
+        for row in snapshot[key]:
+            h.update(b"\x1d" + "\x1f".join(str(row.get(f)) for f in fields).encode("utf-8"))
+    return h.hexdigest()
+
+def render_snapshot(snapshot, files_dir=None):
+    """Process-pool entry point: render a snapshot and return (meeting_id, path)."""
+    meeting = SimpleNamespace(**snapshot["meeting"])
+    tasks = [SimpleNamespace(**t) for t in snapshot["tasks"]]
+    conflicts = [SimpleNamespace(**c) for c in snapshot["conflicts"]]
+    return meeting.id, generate_mom_document(meeting, tasks, conflicts, files_dir=files_dir)
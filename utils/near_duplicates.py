@@ -0,0 +1,158 @@
+"""
+Near-Duplicate Detection
+MinHash signatures over character shingles of normalized text, indexed with
+banded LSH so each lookup only compares against rows sharing at least one
+band bucket instead of scanning the table. Used to spot recurring action
+items and conflicts ("Prepare quarterly budget" -> Rahul) across meetings.
+
+With the default 64 permutations in 16 bands of 4 rows, pairs with Jaccard
+similarity 0.5 become candidates ~64% of the time and pairs at 0.8 >99.9%;
+candidates are then confirmed against `threshold` using the signatures.
+"""
+
+import re
+import threading
+import zlib
+
+import numpy as np
+
+NUM_PERM = 64
+BANDS = 16
+SHINGLE_CHARS = 3
+DEFAULT_THRESHOLD = 0.6
+
+_MERSENNE = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_WORD = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and the to of for on in at by with from is are be will should can "
+    "we i you he she they it this that our your their please also".split()
+)
+
+
+def normalize_text(text):
+    """Lower-case words without punctuation, stopwords or plural "s"."""
+    words = []
+    for word in _WORD.findall((text or "").lower()):
+        if word in _STOPWORDS:
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        words.append(word)
+    return " ".join(words)
+
+
+def shingles(text, k=SHINGLE_CHARS):
+    text = normalize_text(text)
+    if not text:
+        return set()
+    padded = f" {text} "
+    if len(padded) <= k:
+        return {padded}
+    return {padded[i:i + k] for i in range(len(padded) - k + 1)}
+
+
+class MinHasher:
+    """Universal hashing (a*x + b mod 2^61-1) over CRC32 shingle hashes, vectorised with numpy."""
+
+    def __init__(self, num_perm=NUM_PERM, seed=1):
+        rng = np.random.RandomState(seed)
+        self.num_perm = num_perm
+        self._a = rng.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+    def signature(self, text):
+        """uint32 signature of `text`, or None when nothing is left after normalizing."""
+        grams = shingles(text)
+        if not grams:
+            return None
+        hashes = np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64, count=len(grams))
+        permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE & _MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+
+def similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity of two signatures."""
+    return float(np.count_nonzero(sig_a == sig_b)) / len(sig_a)
+
+
+class NearDuplicateIndex:
+    """
+    Incremental LSH index of row id -> signature. `scope` partitions the
+    index (e.g. the assignee of a task) so only rows in the same scope can
+    match. Thread-safe.
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, num_perm=NUM_PERM, bands=BANDS, hasher=None):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows_per_band = num_perm // bands
+        self.hasher = hasher or MinHasher(num_perm)
+        self.version = None  # change-feed version the index is synced to (set by the caller)
+        self._rows = {}  # row_id -> (scope, signature, meeting_id)
+        self._buckets = {}  # (band, scope, band bytes) -> set of row ids
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._rows)
+
+    def _keys(self, scope, signature):
+        r = self.rows_per_band
+        return [(band, scope, signature[band * r:(band + 1) * r].tobytes()) for band in range(self.bands)]
+
+    def add(self, row_id, scope, text, meeting_id=None):
+        signature = self.hasher.signature(text)
+        with self._lock:
+            self._remove(row_id)
+            if signature is None:
+                return
+            self._rows[row_id] = (scope, signature, meeting_id)
+            for key in self._keys(scope, signature):
+                self._buckets.setdefault(key, set()).add(row_id)
+
+    def remove(self, row_id):
+        with self._lock:
+            self._remove(row_id)
+
+    def _remove(self, row_id):
+        entry = self._rows.pop(row_id, None)
+        if entry is None:
+            return
+        scope, signature, _ = entry
+        for key in self._keys(scope, signature):
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(row_id)
+                if not bucket:
+                    del self._buckets[key]
+
+    def clear(self):
+        with self._lock:
+            self._rows.clear()
+            self._buckets.clear()
+            self.version = None
+
+    def best_match(self, scope, text, exclude_meeting=None):
+        """
+        (row_id, similarity) of the most similar indexed row at or above the
+        threshold, skipping rows from `exclude_meeting`; None if there is none.
+        """
+        signature = self.hasher.signature(text)
+        if signature is None:
+            return None
+        with self._lock:
+            candidates = set()
+            for key in self._keys(scope, signature):
+                candidates.update(self._buckets.get(key, ()))
+            best = None
+            for row_id in candidates:
+                _, other, meeting_id = self._rows[row_id]
+                if exclude_meeting is not None and meeting_id == exclude_meeting:
+                    continue
+                score = similarity(signature, other)
+                # Ties go to the oldest row so clusters keep one canonical id
+                if score >= self.threshold and (best is None or (score, -row_id) > (best[1], -best[0])):
+                    best = (row_id, score)
+            return best
@@ -0,0 +1,265 @@
+"""
+Request Profiler
+Opt-in per-request profiling: cProfile around the handler plus a timeline of
+pipeline stages, LLM calls and SQL statements. Artifacts are written under
+PROFILE_DIR/meeting_<id>/ so a slow meeting's profile sits next to its id.
+Only the newest MAX_PROFILES (MOM_PROFILE_MAX) profiles are kept.
+
+Nothing is installed unless a request is profiled; after the first profiled
+request the SQL hooks only do a context-variable lookup per statement.
+"""
+
+import contextvars
+import cProfile
+import io
+import json
+import os
+import pstats
+import re
+import threading
+import time
+from datetime import datetime, timezone
+
+PROFILE_DIR = os.environ.get(
+    "MOM_PROFILE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "profiles")
+)
+PROFILE_HEADER = "X-Profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+# Stored profiles kept across all folders; the oldest are deleted first
+MAX_PROFILES = int(os.environ.get("MOM_PROFILE_MAX", "200"))
+MAX_SQL_STATEMENTS = 2000
+TOP_FUNCTIONS = 40
+
+_PROFILE_ID = re.compile(r"^[A-Za-z0-9_-]{1,160}$")
+_active = contextvars.ContextVar("mom_request_profile", default=None)
+_hooked_engines = set()
+_hook_lock = threading.Lock()
+
+
+class RequestProfile:
+    """Everything captured while one request is being profiled."""
+
+    def __init__(self, request_id, method, path):
+        self.request_id = request_id
+        self.method = method
+        self.path = path
+        self.started_at = datetime.now(timezone.utc)
+        self._t0 = time.perf_counter()
+        self._lock = threading.Lock()
+        self.profiler = cProfile.Profile()
+        self.cprofile_active = False
+        self.stages = {}
+        self.llm_calls = []
+        self.sql = []
+        self.sql_dropped = 0
+
+    def now(self):
+        return round(time.perf_counter() - self._t0, 6)
+
+    def add_sql(self, statement, start, seconds):
+        with self._lock:
+            if len(self.sql) >= MAX_SQL_STATEMENTS:
+                self.sql_dropped += 1
+                return
+            self.sql.append({
+                "start": round(start - self._t0, 6),
+                "duration": round(seconds, 6),
+                "thread": threading.current_thread().name,
+                "statement": " ".join(statement.split()),
+            })
+
+    def add_llm_call(self, response, seconds, site):
+        usage = response.get("usage") if isinstance(response, dict) else None
+        call = {
+            "end": self.now(),
+            "duration": round(seconds, 6),
+            "site": site,
+            "thread": threading.current_thread().name,
+            "usage": usage or {},
+        }
+        if isinstance(response, dict) and response.get("speculative"):
+            call["speculative"] = response["speculative"]
+        with self._lock:
+            self.llm_calls.append(call)
+
+    def add_stage_run(self, pipeline, run):
+        with self._lock:
+            key, n = pipeline, 1
+            while key in self.stages:
+                n += 1
+                key = f"{pipeline}#{n}"
+            self.stages[key] = run.to_dict()
+
+    def top_functions(self, limit=TOP_FUNCTIONS):
+        if not self.cprofile_active:
+            return ""
+        out = io.StringIO()
+        stats = pstats.Stats(self.profiler, stream=out)
+        stats.sort_stats("cumulative").print_stats(limit)
+        return out.getvalue()
+
+    def to_dict(self, duration, status, meeting_id):
+        return {
+            "request_id": self.request_id,
+            "method": self.method,
+            "path": self.path,
+            "status": status,
+            "meeting_id": meeting_id,
+            "started_at": self.started_at.isoformat(),
+            "duration": round(duration, 6),
+            "stages": self.stages,
+            "llm_calls": self.llm_calls,
+            "sql": self.sql,
+            "sql_count": len(self.sql) + self.sql_dropped,
+            "sql_seconds": round(sum(q["duration"] for q in self.sql), 6),
+            "top_functions": self.top_functions(),
+        }
+
+
+def current_profile():
+    return _active.get()
+
+
+def should_profile(headers, always=False, allow_header=True):
+    if always:
+        return True
+    return allow_header and headers.get(PROFILE_HEADER, "").lower() in ("1", "true", "yes")
+
+
+def _hook_engine(engine):
+    with _hook_lock:
+        if id(engine) in _hooked_engines:
+            return
+        from sqlalchemy import event
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def _before(conn, cursor, statement, parameters, context, executemany):
+            if _active.get() is not None:
+                conn.info.setdefault("profile_query_start", []).append(time.perf_counter())
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def _after(conn, cursor, statement, parameters, context, executemany):
+            profile = _active.get()
+            starts = conn.info.get("profile_query_start")
+            if profile is None or not starts:
+                return
+            start = starts.pop()
+            profile.add_sql(statement or "", start, time.perf_counter() - start)
+
+        _hooked_engines.add(id(engine))
+
+
+def start(request_id, method, path, engine=None):
+    """Begin profiling the current request; returns the context token for `finish`."""
+    if engine is not None:
+        _hook_engine(engine)
+    profile = RequestProfile(request_id, method, path)
+    token = _active.set(profile)
+    try:
+        profile.profiler.enable()
+        profile.cprofile_active = True
+    except ValueError:
+        # Only one cProfile can run per process; concurrent profiled requests
+        # still get the stage/LLM/SQL timeline
+        pass
+    return token
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def prune_profiles(profile_dir=PROFILE_DIR, keep=MAX_PROFILES):
+    """Delete the oldest stored profiles (.json and .prof) beyond `keep`."""
+    if not os.path.isdir(profile_dir):
+        return 0
+    stored = []
+    for folder in os.listdir(profile_dir):
+        path = os.path.join(profile_dir, folder)
+        if not os.path.isdir(path):
+            continue
+        for name in os.listdir(path):
+            if name.endswith(".json"):
+                try:
+                    stored.append((os.path.getmtime(os.path.join(path, name)), path, name[:-5]))
+                except OSError:
+                    continue
+    stored.sort(reverse=True)
+    for _, path, profile_id in stored[keep:]:
+        _remove(os.path.join(path, f"{profile_id}.json"))
+        _remove(os.path.join(path, f"{profile_id}.prof"))
+    return max(len(stored) - keep, 0)
+
+
+def finish(token, status, meeting_id=None, profile_dir=PROFILE_DIR):
+    """Stop the active profile, write its artifacts and return the profile id."""
+    profile = _active.get()
+    _active.reset(token)
+    if profile is None:
+        return None
+    if profile.cprofile_active:
+        profile.profiler.disable()
+    duration = profile.now()
+    stamp = profile.started_at.strftime("%Y%m%dT%H%M%S")
+    profile_id = f"{stamp}_{profile.request_id}"
+    if not _PROFILE_ID.match(profile_id):
+        profile_id = f"{stamp}_{os.urandom(8).hex()}"
+    folder = os.path.join(profile_dir, f"meeting_{meeting_id}" if meeting_id else "unscoped")
+    os.makedirs(folder, exist_ok=True)
+    if profile.cprofile_active:
+        profile.profiler.dump_stats(os.path.join(folder, f"{profile_id}.prof"))
+    with open(os.path.join(folder, f"{profile_id}.json"), "w", encoding="utf-8") as fh:
+        json.dump(profile.to_dict(duration, status, meeting_id), fh, indent=1, default=str)
+    prune_profiles(profile_dir)
+    return profile_id
+
+
+def record_llm_call(response, seconds, site):
+    profile = _active.get()
+    if profile is not None:
+        profile.add_llm_call(response, seconds, site)
+
+
+def record_stage_run(pipeline, run):
+    profile = _active.get()
+    if profile is not None:
+        profile.add_stage_run(pipeline, run)
+
+
+def find_profile(profile_id, profile_dir=PROFILE_DIR):
+    """Return (folder, meeting_id) for a stored profile, or None."""
+    if not _PROFILE_ID.match(profile_id or "") or not os.path.isdir(profile_dir):
+        return None
+    for folder in os.listdir(profile_dir):
+        path = os.path.join(profile_dir, folder)
+        if os.path.exists(os.path.join(path, f"{profile_id}.json")):
+            meeting_id = folder[len("meeting_"):] if folder.startswith("meeting_") else None
+            return path, meeting_id
+    return None
+
+
+def list_profiles(meeting_id=None, profile_dir=PROFILE_DIR):
+    """Newest-first listing of stored profiles, optionally for one meeting."""
+    if not os.path.isdir(profile_dir):
+        return []
+    folders = [f"meeting_{meeting_id}"] if meeting_id else os.listdir(profile_dir)
+    out = []
+    for folder in folders:
+        path = os.path.join(profile_dir, folder)
+        if not os.path.isdir(path):
+            continue
+        for name in os.listdir(path):
+            if not name.endswith(".json"):
+                continue
+            profile_id = name[:-5]
+            out.append({
+                "profile_id": profile_id,
+                "meeting_id": folder[len("meeting_"):] if folder.startswith("meeting_") else None,
+                "size": os.path.getsize(os.path.join(path, f"{profile_id}.prof"))
+                if os.path.exists(os.path.join(path, f"{profile_id}.prof")) else 0,
+            })
+    return sorted(out, key=lambda p: p["profile_id"], reverse=True)
@@ -0,0 +1,82 @@
+"""
+Runtime Profile
+Host-specific llama-cpp and Faster-Whisper settings written by
+`python -m benchmarks.autotune` and read by the model loaders at startup.
+A profile only applies on the host it was tuned on (same machine type and
+CPU count); elsewhere the built-in defaults are used.
+"""
+
+import json
+import os
+import platform
+import uuid
+from functools import lru_cache
+
+from utils.structured_log import get_logger
+
+log = get_logger("runtime_profile")
+
+PROFILE_PATH = os.environ.get(
+    "MOM_RUNTIME_PROFILE",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models", "runtime_profile.json")
+)
+LLM_KEYS = ("model_file", "n_ctx", "n_threads", "n_threads_batch", "n_batch")
+ASR_KEYS = ("compute_type", "cpu_threads", "num_workers", "beam_size")
+
+
+def host_fingerprint():
+    return {
+        "system": platform.system(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+@lru_cache(maxsize=None)
+def load_profile(path=PROFILE_PATH):
+    """The profile for this host, or {} when missing, unreadable or tuned elsewhere."""
+    if not path or path.lower() in ("off", "none") or not os.path.exists(path):
+        return {}
+    try:
+        with open(path, encoding="utf-8") as fh:
+            profile = json.load(fh)
+    except Exception as e:
+        log.warning("Ignoring unreadable runtime profile", extra={"path": path, "error": str(e)})
+        return {}
+    host = host_fingerprint()
+    tuned_on = profile.get("host") or {}
+    if any(tuned_on.get(k) != host[k] for k in ("machine", "cpu_count")):
+        log.warning("Ignoring runtime profile tuned on another host", extra={"path": path, "tuned_on": tuned_on})
+        return {}
+    log.info("Using runtime profile", extra={"path": path, "llm": profile.get("llm"), "asr": profile.get("asr")})
+    return profile
+
+
+def _settings(section, keys, defaults):
+    tuned = load_profile().get(section) or {}
+    settings = dict(defaults)
+    settings.update({k: tuned[k] for k in keys if tuned.get(k) is not None})
+    return settings
+
+
+def llm_settings(defaults):
+    """`defaults` overridden by the tuned llama-cpp settings (keys in LLM_KEYS)."""
+    return _settings("llm", LLM_KEYS, defaults)
+
+
+def asr_settings(defaults):
+    """`defaults` overridden by the tuned Faster-Whisper settings (keys in ASR_KEYS)."""
+    return _settings("asr", ASR_KEYS, defaults)
+
+
+def write_profile(profile, path=PROFILE_PATH):
+    """Atomically write `profile` (stamped with this host's fingerprint)."""
+    profile = dict(profile, host=host_fingerprint())
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fh:
+        json.dump(profile, fh, indent=2)
+        fh.write("\n")
+    os.replace(tmp_path, path)
+    load_profile.cache_clear()
+    return path
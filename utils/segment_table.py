@@ -0,0 +1,203 @@
+"""
+Columnar Segment Storage
+Holds transcript segments as parallel typed arrays instead of a list of dicts.
+"""
+
+import struct
+import sys
+from array import array
+
+try:
+    from sqlalchemy.types import TypeDecorator, LargeBinary
+except Exception:
+    TypeDecorator = None
+    LargeBinary = None
+
+MAGIC = b"SEGT"
+VERSION = 1
+# magic, version, segment count, speaker count, text buffer size
+_HEADER = struct.Struct("<4sBIHI")
+
+
+def _le(arr):
+    """Return a copy of `arr` in little-endian byte order (no-op on LE hosts)."""
+    if sys.byteorder == "big":
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr
+
+
+class SegmentTable:
+    """
+    Compact transcript segments.
+
+    - starts / ends : float32 arrays (seconds)
+    - speaker_ids   : uint16 indexes into `speakers`
+    - text          : one UTF-8 buffer, sliced by `offsets` (n + 1 entries)
+    """
+
+    __slots__ = ("starts", "ends", "speaker_ids", "speakers", "offsets", "text", "_speaker_index")
+
+    def __init__(self):
+        self.starts = array("f")
+        self.ends = array("f")
+        self.speaker_ids = array("H")
+        self.speakers = []
+        self.offsets = array("I", [0])
+        self.text = bytearray()
+        self._speaker_index = {}
+
+    # -----------------------------
+    # Construction
+    # -----------------------------
+    @classmethod
+    def from_dicts(cls, segments):
+        """Build a table from the legacy list-of-dicts form."""
+        table = cls()
+        table.extend(segments or [])
+        return table
+
+    @classmethod
+    def coerce(cls, value):
+        """Accept a SegmentTable, a list of dicts or None and return a SegmentTable."""
+        if isinstance(value, cls):
+            return value
+        return cls.from_dicts(value)
+
+    def _speaker_id(self, speaker):
+        speaker = speaker or "UNKNOWN"
+        sid = self._speaker_index.get(speaker)
+        if sid is None:
+            sid = len(self.speakers)
+            self.speakers.append(speaker)
+            self._speaker_index[speaker] = sid
+        return sid
+
+    def append(self, start, end, speaker, text):
+        self.starts.append(float(start or 0.0))
+        self.ends.append(float(end or 0.0))
+        self.speaker_ids.append(self._speaker_id(speaker))
+        self.text += (text or "").encode("utf-8")
+        self.offsets.append(len(self.text))
+
+    def extend(self, segments):
+        for seg in segments:
+            self.append(seg.get("start"), seg.get("end"), seg.get("speaker"), seg.get("text"))
+
+    # -----------------------------
+    # Access
+    # -----------------------------
+    def __len__(self):
+        return len(self.starts)
+
+    def text_at(self, i):
+        return self.text[self.offsets[i]:self.offsets[i + 1]].decode("utf-8")
+
+    def speaker_at(self, i):
+        return self.speakers[self.speaker_ids[i]]
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("segment index out of range")
+        return {
+            "start": round(self.starts[i], 3),
+            "end": round(self.ends[i], 3),
+            "speaker": self.speaker_at(i),
+            "text": self.text_at(i),
+        }
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __eq__(self, other):
+        if not isinstance(other, SegmentTable):
+            return NotImplemented
+        return self.to_bytes() == other.to_bytes()
+
+    def to_dicts(self):
+        """Convert back to the list-of-dicts form used by the API."""
+        return list(self)
+
+    def unique_speakers(self):
+        """Speakers that actually occur in the table, in first-seen order."""
+        used = set(self.speaker_ids)
+        return [s for i, s in enumerate(self.speakers) if i in used]
+
+    # -----------------------------
+    # Binary encoding
+    # -----------------------------
+    def to_bytes(self):
+        parts = [_HEADER.pack(MAGIC, VERSION, len(self), len(self.speakers), len(self.text))]
+        for name in self.speakers:
+            raw = name.encode("utf-8")
+            parts.append(struct.pack("<H", len(raw)))
+            parts.append(raw)
+        for arr in (self.starts, self.ends, self.speaker_ids, self.offsets):
+            parts.append(_le(arr).tobytes())
+        parts.append(bytes(self.text))
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data):
+        data = memoryview(data)
+        magic, version, count, n_speakers, text_len = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError("not a SegmentTable buffer")
+        if version != VERSION:
+            raise ValueError(f"unsupported SegmentTable version: {version}")
+        pos = _HEADER.size
+        table = cls()
+        for _ in range(n_speakers):
+            (size,) = struct.unpack_from("<H", data, pos)
+            pos += 2
+            table._speaker_id(bytes(data[pos:pos + size]).decode("utf-8"))
+            pos += size
+        for attr, typecode, n in (("starts", "f", count), ("ends", "f", count),
+                                  ("speaker_ids", "H", count), ("offsets", "I", count + 1)):
+            arr = array(typecode)
+            width = arr.itemsize * n
+            arr.frombytes(data[pos:pos + width])
+            setattr(table, attr, _le(arr))
+            pos += width
+        table.text = bytearray(data[pos:pos + text_len])
+        return table
+
+    def __reduce__(self):
+        return (SegmentTable.from_bytes, (self.to_bytes(),))
+
+
+def segments_as_dicts(value):
+    """Return stored segments (table or legacy list) in list-of-dicts form."""
+    if value is None:
+        return None
+    if isinstance(value, SegmentTable):
+        return value.to_dicts()
+    return list(value)
+
+
+if TypeDecorator is not None:
+    class SegmentTableType(TypeDecorator):
+        """
+        Column type storing a SegmentTable in its binary encoding.
+        Rows written before the columnar format (pickled lists) are still readable.
+        """
+
+        impl = LargeBinary
+        cache_ok = True
+
+        def process_bind_param(self, value, dialect):
+            if value is None:
+                return None
+            return SegmentTable.coerce(value).to_bytes()
+
+        def process_result_value(self, value, dialect):
+            if value is None:
+                return None
+            value = bytes(value)
+            if value[:4] == MAGIC:
+                return SegmentTable.from_bytes(value)
+            import pickle
+            return SegmentTable.coerce(pickle.loads(value))
@@ -0,0 +1,134 @@
+"""
+Serialization Layer
+Schema-driven row encoders for the API. A schema lists the fields of a model
+once; it can turn ORM objects into dicts (for jsonify) or turn plain row
+tuples from `session.query(*schema.columns(Model))` straight into JSON bytes,
+skipping ORM object construction. orjson is used when installed (it encodes
+dates/datetimes natively); the stdlib json module is the fallback.
+"""
+
+import json
+from datetime import date, datetime
+
+try:
+    import orjson
+except Exception:
+    orjson = None
+
+STREAM_CHUNK_ROWS = 500
+
+
+def _default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    def dumps(obj):
+        return orjson.dumps(obj, default=_default)
+else:
+    _ENCODER = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False, default=_default)
+
+    def dumps(obj):
+        return _ENCODER.encode(obj).encode("utf-8")
+
+
+# -----------------------------
+# Field converters
+# -----------------------------
+def iso_or_none(value):
+    return value.isoformat() if value else None
+
+
+def list_or_empty(value):
+    return value if isinstance(value, list) else []
+
+
+def or_none(value):
+    return value or None
+
+
+def or_empty(value):
+    return value or ""
+
+
+class Field:
+    """
+    One output key. `convert` maps the raw column value; `native=True` marks
+    converters the JSON encoder already does itself (dates), so the bytes
+    path can skip them.
+    """
+
+    __slots__ = ("key", "attr", "convert", "native")
+
+    def __init__(self, key, attr=None, convert=None, native=False):
+        self.key = key
+        self.attr = attr or key
+        self.convert = convert
+        self.native = native
+
+
+def iso(key, attr=None):
+    return Field(key, attr, iso_or_none, native=True)
+
+
+class Schema:
+    def __init__(self, *fields):
+        self.fields = fields
+        self.keys = tuple(f.key for f in fields)
+        self._dict_converters = [(i, f.key, f.convert) for i, f in enumerate(fields) if f.convert]
+        skip_native = orjson is not None
+        self._row_converters = [
+            (i, f.key, f.convert) for i, f in enumerate(fields)
+            if f.convert and not (skip_native and f.native)
+        ]
+
+    def columns(self, model):
+        """Column attributes to select so rows line up with the schema."""
+        return [getattr(model, f.attr) for f in self.fields]
+
+    def to_dict(self, obj):
+        """ORM object -> dict of JSON-safe values (for jsonify and nested payloads)."""
+        values = [getattr(obj, f.attr) for f in self.fields]
+        d = dict(zip(self.keys, values))
+        for i, key, convert in self._dict_converters:
+            d[key] = convert(values[i])
+        return d
+
+    def row_dict(self, row):
+        """Row tuple -> dict ready for `dumps` (native types left to the encoder)."""
+        d = dict(zip(self.keys, row))
+        for i, key, convert in self._row_converters:
+            d[key] = convert(row[i])
+        return d
+
+    def dumps_rows(self, rows):
+        """Encode row tuples as one JSON array (bytes)."""
+        row_dict = self.row_dict
+        return dumps([row_dict(r) for r in rows])
+
+    def stream_rows(self, rows, chunk_rows=STREAM_CHUNK_ROWS):
+        """Yield a JSON array in chunks; memory stays bounded for any number of rows."""
+        return stream_json_array(rows, self.row_dict, chunk_rows)
+
+
+def stream_json_array(items, encode=None, chunk_rows=STREAM_CHUNK_ROWS):
+    """
+    Generator of bytes forming a JSON array of `encode(item)` for each item.
+    Items are encoded in batches so per-chunk overhead stays small.
+    """
+    yield b"["
+    batch = []
+    first = True
+    for item in items:
+        batch.append(encode(item) if encode else item)
+        if len(batch) >= chunk_rows:
+            body = dumps(batch)[1:-1]
+            yield body if first else b"," + body
+            first = False
+            batch = []
+    if batch:
+        body = dumps(batch)[1:-1]
+        yield body if first else b"," + body
+    yield b"]"
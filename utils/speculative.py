@@ -0,0 +1,128 @@
+"""
+Speculative Decoding (prompt lookup)
+The draft for the next tokens is the continuation of the latest earlier
+occurrence of the last n-gram in prompt + output. Extraction output (names,
+task phrases, quoted issues) mostly copies transcript spans, so many drafted
+tokens are accepted and one forward pass verifies several tokens at once on
+CPU. No second model is needed.
+
+llama-cpp reads `Llama.draft_model` on every generation, so a draft is
+attached per call for the call sites that enable it. The instance itself has
+to be created with logits_all=True, which keeps logits for every position
+(n_ctx * n_vocab floats, ~0.5 GB for Phi-3 at n_ctx=4096).
+"""
+
+from contextlib import contextmanager
+
+import numpy as np
+
+try:
+    from llama_cpp.llama_speculative import LlamaDraftModel as _DraftBase
+except Exception:
+    _DraftBase = object
+
+MAX_NGRAM_SIZE = 2
+NUM_PRED_TOKENS = 10
+
+# Call-site names come from metrics.llm_site(); groups can be used in config
+SITE_GROUPS = {
+    "extraction": ("tasks", "tasks_retry", "conflicts"),
+    "summarization": ("summary",),
+}
+SITE_GROUPS["all"] = SITE_GROUPS["extraction"] + SITE_GROUPS["summarization"]
+
+
+def parse_sites(value):
+    """"extraction,summary" -> frozenset of call-site names (groups expanded)."""
+    sites = set()
+    for name in (value or "").split(","):
+        name = name.strip().lower()
+        if name:
+            sites.update(SITE_GROUPS.get(name, (name,)))
+    return frozenset(sites)
+
+
+def lookup_draft(input_ids, max_ngram_size=MAX_NGRAM_SIZE, num_pred_tokens=NUM_PRED_TOKENS):
+    """
+    Tokens following the most recent earlier match of the trailing n-gram
+    (longest n first), or an empty array.
+    """
+    n = input_ids.shape[0]
+    for size in range(min(max_ngram_size, n - 1), 0, -1):
+        windows = np.lib.stride_tricks.sliding_window_view(input_ids[:-1], size)
+        matches = np.nonzero(np.all(windows == input_ids[-size:], axis=1))[0]
+        for idx in matches[::-1]:
+            start = idx + size
+            if start < n:
+                return input_ids[start:min(start + num_pred_tokens, n)]
+    return np.array([], dtype=np.intc)
+
+
+class PromptLookupDraft(_DraftBase):
+    """llama-cpp draft model that counts what it proposes."""
+
+    def __init__(self, max_ngram_size=MAX_NGRAM_SIZE, num_pred_tokens=NUM_PRED_TOKENS):
+        self.max_ngram_size = max_ngram_size
+        self.num_pred_tokens = num_pred_tokens
+        self.calls = 0
+        self.proposed = 0
+
+    def __call__(self, input_ids, /, **kwargs):
+        draft = lookup_draft(np.asarray(input_ids), self.max_ngram_size, self.num_pred_tokens)
+        self.calls += 1
+        self.proposed += len(draft)
+        return draft
+
+    def stats(self, completion_tokens, seconds):
+        """
+        Every verification step emits the accepted draft tokens plus one
+        sampled token and then asks for a new draft, so accepted drafts are
+        estimated as completion tokens minus draft calls.
+        """
+        accepted = min(max(completion_tokens - self.calls, 0), self.proposed)
+        return {
+            "draft_calls": self.calls,
+            "proposed_tokens": self.proposed,
+            "accepted_tokens": accepted,
+            "acceptance_rate": round(accepted / self.proposed, 4) if self.proposed else 0.0,
+            "tokens_per_second": round(completion_tokens / seconds, 2) if seconds > 0 else 0.0,
+        }
+
+
+class SpeculativeDecoding:
+    """Per-call-site switch for prompt-lookup drafting; `site_fn()` names the current call site."""
+
+    def __init__(self, sites, site_fn, max_ngram_size=MAX_NGRAM_SIZE, num_pred_tokens=NUM_PRED_TOKENS):
+        self.sites = frozenset(sites)
+        self.site_fn = site_fn
+        self.max_ngram_size = max_ngram_size
+        self.num_pred_tokens = num_pred_tokens
+
+    @property
+    def enabled(self):
+        """True when any site uses drafting (instances then need logits_all=True)."""
+        return bool(self.sites)
+
+    @contextmanager
+    def attach(self, instance, stream=False):
+        """
+        Attach a fresh draft to `instance` for one call when the current call
+        site enables it; yields the draft or None. Streamed calls are left
+        alone because generation outlives this block.
+        """
+        if stream or not hasattr(instance, "draft_model") or self.site_fn() not in self.sites:
+            yield None
+            return
+        draft = PromptLookupDraft(self.max_ngram_size, self.num_pred_tokens)
+        instance.draft_model = draft
+        try:
+            yield draft
+        finally:
+            instance.draft_model = None
+
+    def annotate(self, response, draft, seconds):
+        """Add {"speculative": {...}} with acceptance and throughput to a completion response."""
+        if draft is None or not isinstance(response, dict):
+            return
+        completion = (response.get("usage") or {}).get("completion_tokens") or 0
+        response["speculative"] = dict(draft.stats(completion, seconds), site=self.site_fn())
@@ -0,0 +1,123 @@
+"""
+Stage DAG Executor
+Runs pipeline stages as soon as their dependencies finish, executing
+independent stages concurrently, and records per-stage timings.
+"""
+
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from contextlib import contextmanager
+
+
+class StageError(RuntimeError):
+    """Raised when a stage fails; carries the stage name and the timings so far."""
+
+    def __init__(self, stage, error, run):
+        super().__init__(f"stage '{stage}' failed: {error}")
+        self.stage = stage
+        self.error = error
+        self.run = run
+
+
+class StageRun:
+    """Results and timeline of one pipeline run."""
+
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.results = {}
+        self.timings = {}
+        self.deps = {}
+
+    def record(self, name, start, end, deps=()):
+        self.timings[name] = {
+            "start": round(start - self.t0, 4),
+            "end": round(end - self.t0, 4),
+            "duration": round(end - start, 4),
+        }
+        self.deps[name] = tuple(deps)
+
+    @contextmanager
+    def time(self, name, deps=()):
+        """Time an inline stage (e.g. DB writes that must stay on the request thread)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter(), deps)
+
+    def critical_path(self):
+        """Chain of stages that determined the total latency (walks back from the last to finish)."""
+        if not self.timings:
+            return []
+        name = max(self.timings, key=lambda n: self.timings[n]["end"])
+        path = [name]
+        while True:
+            deps = [d for d in self.deps.get(name, ()) if d in self.timings]
+            if not deps:
+                break
+            name = max(deps, key=lambda n: self.timings[n]["end"])
+            path.append(name)
+        return list(reversed(path))
+
+    def to_dict(self):
+        return {
+            "stages": self.timings,
+            "critical_path": self.critical_path(),
+            "total": round(max((t["end"] for t in self.timings.values()), default=0.0), 4),
+        }
+
+
+class StageGraph:
+    """
+    A small DAG of callables. Each stage is called with a dict holding the
+    results of the stages it depends on.
+    """
+
+    def __init__(self):
+        self._stages = {}
+
+    def add(self, name, fn, deps=()):
+        for d in deps:
+            if d not in self._stages:
+                raise ValueError(f"stage '{name}' depends on unknown stage '{d}'")
+        self._stages[name] = (fn, tuple(deps))
+        return self
+
+    def __contains__(self, name):
+        return name in self._stages
+
+    def run(self, max_workers=None, run=None):
+        run = run or StageRun()
+        if not self._stages:
+            return run
+        pending = dict(self._stages)
+        running = {}
+
+        def call(name, fn, deps):
+            start = time.perf_counter()
+            try:
+                return fn({d: run.results[d] for d in deps})
+            finally:
+                run.record(name, start, time.perf_counter(), deps)
+
+        with ThreadPoolExecutor(max_workers=max_workers or len(self._stages)) as pool:
+            while pending or running:
+                for name, (fn, deps) in list(pending.items()):
+                    if all(d in run.results for d in deps):
+                        # Stages see the caller's context variables (e.g. an active request profile)
+                        ctx = contextvars.copy_context()
+                        running[pool.submit(ctx.run, call, name, fn, deps)] = name
+                        del pending[name]
+                if not running:
+                    raise RuntimeError(f"unsatisfiable stages: {', '.join(pending)}")
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        run.results[name] = future.result()
+                    except Exception as e:
+                        for f in running:
+                            f.cancel()
+                        raise StageError(name, e, run) from e
+        return run
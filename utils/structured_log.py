@@ -0,0 +1,71 @@
+"""
+Structured Logging
+JSON log lines tagged with the current request id.
+"""
+
+import json
+import logging
+import os
+import sys
+import time
+import uuid
+
+try:
+    from flask import g, has_request_context
+except Exception:
+    g = None
+
+    def has_request_context():
+        return False
+
+REQUEST_ID_HEADER = "X-Request-ID"
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+def current_request_id():
+    if has_request_context():
+        return getattr(g, "request_id", None)
+    return None
+
+
+def new_request_id(incoming=None):
+    """Reuse a sane incoming X-Request-ID, otherwise mint one."""
+    if incoming and len(incoming) <= 128 and incoming.replace("-", "").isalnum():
+        return incoming
+    return uuid.uuid4().hex
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None) or current_request_id()
+        if request_id:
+            entry["request_id"] = request_id
+        # Anything passed via `extra=` becomes a top-level field
+        for key, value in vars(record).items():
+            if key not in _RESERVED and key not in entry:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+def configure_logging(level=None):
+    """Install the JSON formatter on the root "mom" logger (idempotent)."""
+    logger = logging.getLogger("mom")
+    if not any(isinstance(h.formatter, JsonFormatter) for h in logger.handlers):
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(JsonFormatter())
+        logger.addHandler(handler)
+        logger.propagate = False
+    logger.setLevel(level or os.environ.get("MOM_LOG_LEVEL", "INFO").upper())
+    return logger
+
+
+def get_logger(name):
+    return logging.getLogger(f"mom.{name}")
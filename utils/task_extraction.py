@@ -0,0 +1,144 @@
+"""
+Regex Task Extraction Engine
+Heuristic task extraction used when the LLM output cannot be parsed.
+
+All patterns are compiled once and combined into a single alternation that is
+run over each speaker segment, one sentence at a time. Sentences are capped at
+MAX_SENTENCE_CHARS, so the work per character is bounded and the scan is
+linear in the transcript length.
+"""
+
+import re
+
+MAX_SENTENCE_CHARS = 600
+
+_DEADLINE = r"(?:\s+by\s+(?P<{name}>[\w\s,/-]+))?"
+
+# Each alternative is wrapped in a lookahead so one scan can report matches
+# from every pattern family, and every alternative runs to the end of the
+# sentence (mirroring the old "[.\n]" terminator).
+_SCANNER = re.compile(
+    r"(?=(?:"
+    # Pattern 1: "Name: (I'll|I will|I am going to) <task> (by <deadline>)"
+    r"\b(?P<p1_speaker>[a-z]{2,}):\s*(?:I will|I'll|I am going to|I’ll)\s*(?P<p1_task>.*?)"
+    + _DEADLINE.format(name="p1_deadline") + r"\s*$"
+    # Pattern 2: "Assign <Name> to <task> (by <deadline>)"
+    r"|assign(?:ed)?\s+(?:to\s+)?(?P<p2_name>[a-z]{2,})\s+(?:to\s+)?(?P<p2_task>.*?)"
+    + _DEADLINE.format(name="p2_deadline") + r"\s*$"
+    # Pattern 3: "<Name>, can you <task>" or "can you <task>, <Name>"
+    r"|\b(?P<p3_name1>[a-z]{2,}),\s*can you\s*(?P<p3_task1>.*?)\s*$"
+    r"|\bcan you\s*(?P<p3_task2>.*?)\s*,\s*(?P<p3_name2>[a-z]{2,})\s*$"
+    r"))",
+    re.IGNORECASE,
+)
+_SENTENCE_SPLIT = re.compile(r"[.\n]")
+# Trigger phrases locate the few positions where a pattern can start, so the
+# scanner is only tried there instead of at every character
+_TRIGGER = re.compile(r":\s*I(?: will|'ll|’ll| am going to)|assign|can you", re.IGNORECASE)
+_NAME_BEFORE = re.compile(r"\b[a-z]{2,}[:,]?\s*$", re.IGNORECASE)
+
+
+def _sentences(text):
+    for sentence in _SENTENCE_SPLIT.split(text):
+        if not sentence.strip():
+            continue
+        # Hard cap keeps backtracking bounded on run-on ASR output
+        for i in range(0, len(sentence), MAX_SENTENCE_CHARS):
+            yield sentence[i:i + MAX_SENTENCE_CHARS]
+
+
+def _task(name, task_text, deadline, deadline_parser):
+    return {
+        "task_name": task_text,
+        "assigned_to": name,
+        "due_date": deadline_parser(deadline) if deadline and deadline_parser else (deadline or ""),
+        "status": "pending"
+    }
+
+
+class TaskExtractionEngine:
+    """Single-pass regex scanner over speaker segments."""
+
+    def __init__(self, deadline_parser=None):
+        self.deadline_parser = deadline_parser
+
+    def scan_line(self, line, found):
+        """Scan one speaker line, appending matches to the per-pattern lists in `found`."""
+        for sentence in _sentences(line):
+            starts = set()
+            for t in _TRIGGER.finditer(sentence):
+                starts.add(t.start())
+                before = _NAME_BEFORE.search(sentence, max(t.start() - 64, 0), t.start())
+                if before:
+                    starts.add(before.start())
+            # Old semantics: each pattern consumed up to the sentence end, so at
+            # most one match per pattern family per sentence.
+            seen_families = set()
+            for pos in sorted(starts):
+                m = _SCANNER.match(sentence, pos)
+                if m is None:
+                    continue
+                if m.group("p1_speaker") is not None:
+                    family = 1
+                elif m.group("p2_name") is not None:
+                    family = 2
+                else:
+                    family = 3
+                if family in seen_families:
+                    continue
+                seen_families.add(family)
+                found[family].append(m)
+                if len(seen_families) == 3:
+                    break
+
+    def _to_tasks(self, found, deadline_parser):
+        raw = []
+        for m in found[1]:
+            raw.append((m.group("p1_speaker"), m.group("p1_task"), m.group("p1_deadline")))
+        for m in found[2]:
+            raw.append((m.group("p2_name"), m.group("p2_task"), m.group("p2_deadline")))
+        for m in found[3]:
+            name = m.group("p3_name1") or m.group("p3_name2") or ""
+            if name:
+                raw.append((name, m.group("p3_task1") or m.group("p3_task2") or "", None))
+        # Deduplicate before deadline parsing so each (person, task) is parsed once
+        tasks = []
+        seen = set()
+        for name, task_text, deadline in raw:
+            name = name.strip()
+            task_text = task_text.strip().rstrip(".")
+            if not task_text:
+                continue
+            key = (name.lower(), task_text.lower())
+            if key in seen:
+                continue
+            seen.add(key)
+            tasks.append(_task(name, task_text, (deadline or "").strip(), deadline_parser))
+        return tasks
+
+    def extract(self, transcript, deadline_parser=None):
+        """
+        Extract tasks from a transcript string ("SPEAKER: text" lines or plain text).
+        Returns a list of dicts with keys: task_name, assigned_to, due_date, status
+        """
+        found = {1: [], 2: [], 3: []}
+        for line in (transcript or "").splitlines():
+            self.scan_line(line, found)
+        return self._to_tasks(found, deadline_parser or self.deadline_parser)
+
+    def extract_segments(self, segments, deadline_parser=None):
+        """Extract tasks from transcript segments without building the transcript blob."""
+        found = {1: [], 2: [], 3: []}
+        for seg in segments or []:
+            text = seg.get("text") or ""
+            speaker = seg.get("speaker")
+            line = f"{speaker}: {text}" if speaker and speaker != "UNKNOWN" else text
+            self.scan_line(line, found)
+        return self._to_tasks(found, deadline_parser or self.deadline_parser)
+
+
+DEFAULT_ENGINE = TaskExtractionEngine()
+
+
+def extract_tasks_regex(transcript, deadline_parser=None):
+    return DEFAULT_ENGINE.extract(transcript, deadline_parser)
@@ -0,0 +1,53 @@
+"""
+Transcript Windowing Utility
+Groups segments into fixed time windows so extraction can run per window.
+Windows are cut by time, so editing a segment's text changes only the window
+that contains it; `window_hash` keys cached per-window extraction results.
+"""
+
+import hashlib
+
+WINDOW_SECONDS = 120.0
+
+
+def window_index(start, window_seconds=WINDOW_SECONDS):
+    """Index of the window a segment starting at `start` belongs to."""
+    return int(max(float(start or 0.0), 0.0) // window_seconds)
+
+
+def group_segments_into_windows(segments, window_seconds=WINDOW_SECONDS):
+    """
+    Group segments by start time.
+
+    Args:
+        segments: List of segments with start, end, speaker, text
+        window_seconds: Window length (seconds)
+
+    Returns:
+        List of (window_idx, segments) tuples ordered by window index
+    """
+    windows = {}
+    for seg in segments or []:
+        windows.setdefault(window_index(seg.get("start"), window_seconds), []).append(seg)
+    return sorted(windows.items())
+
+
+def windows_between(segments, from_seconds, until_seconds=None, window_seconds=WINDOW_SECONDS):
+    """
+    Windows starting at or after `from_seconds` that are closed by `until_seconds`
+    (a window is closed once audio up to its end has been received).
+    Pass `until_seconds=None` to include every remaining window.
+    """
+    selected = []
+    for idx, segs in group_segments_into_windows(segments, window_seconds):
+        if idx * window_seconds < from_seconds:
+            continue
+        if until_seconds is not None and (idx + 1) * window_seconds > until_seconds:
+            continue
+        selected.append((idx, segs))
+    return selected
+
+
+def window_hash(transcript, salt=""):
+    """SHA-256 of a window's LLM input (plus anything else the result depends on)."""
+    return hashlib.sha256(f"{salt}\n{transcript}".encode("utf-8")).hexdigest()
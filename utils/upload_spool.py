@@ -0,0 +1,177 @@
+"""
+Upload Spooling Utility
+Streams uploaded audio straight to a spool directory in fixed-size chunks,
+hashing the bytes as they are written and enforcing size/type limits early.
+"""
+
+import hashlib
+import os
+import shutil
+import uuid
+
+from flask import Request
+from werkzeug.exceptions import RequestEntityTooLarge, UnsupportedMediaType
+from werkzeug.utils import secure_filename
+
+SPOOL_DIR = os.environ.get(
+    "MOM_SPOOL_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "spool")
+)
+os.makedirs(SPOOL_DIR, exist_ok=True)
+
+CHUNK_SIZE = 1024 * 1024  # 1 MiB
+MAX_UPLOAD_BYTES = int(os.environ.get("MOM_MAX_UPLOAD_MB", "512")) * 1024 * 1024
+MAX_AUDIO_SECONDS = float(os.environ.get("MOM_MAX_AUDIO_MINUTES", "240")) * 60
+ALLOWED_AUDIO_EXTENSIONS = {
+    ".wav", ".mp3", ".m4a", ".mp4", ".aac", ".ogg", ".oga", ".opus", ".webm", ".flac", ".wma", ".amr"
+}
+
+
+class UploadRejected(Exception):
+    """Raised when an upload fails validation; carries the HTTP status to return."""
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def audio_extension(filename):
+    """Lower-cased extension of a sanitized filename ('' if none)."""
+    return os.path.splitext(secure_filename(filename or ""))[1].lower()
+
+
+class HashingSpoolFile:
+    """
+    Write-through file in the spool directory that hashes bytes as they arrive
+    and refuses to grow beyond `max_bytes`.
+    """
+
+    def __init__(self, suffix="", max_bytes=MAX_UPLOAD_BYTES, spool_dir=SPOOL_DIR):
+        self.path = os.path.join(spool_dir, f"upload_{uuid.uuid4().hex}{suffix}.part")
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._hash = hashlib.sha256()
+        self._fh = open(self.path, "w+b")
+
+    def write(self, data):
+        self.size += len(data)
+        if self.max_bytes and self.size > self.max_bytes:
+            self.discard()
+            raise RequestEntityTooLarge(f"upload exceeds {self.max_bytes // (1024 * 1024)} MB limit")
+        self._hash.update(data)
+        return self._fh.write(data)
+
+    def hexdigest(self):
+        return self._hash.hexdigest()
+
+    def discard(self):
+        try:
+            self._fh.close()
+        finally:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+    def __getattr__(self, name):
+        # read/seek/tell/flush/close are delegated to the underlying file
+        if name == "_fh":
+            raise AttributeError(name)
+        return getattr(self._fh, name)
+
+
+class SpoolingRequest(Request):
+    """Flask request whose multipart file parts are written directly to the spool dir."""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        ext = audio_extension(filename)
+        if ext and ext not in ALLOWED_AUDIO_EXTENSIONS:
+            raise UnsupportedMediaType(f"unsupported audio type: {ext}")
+        spool = HashingSpoolFile(suffix=ext)
+        if not hasattr(self, "_spool_files"):
+            self._spool_files = []
+        self._spool_files.append(spool)
+        return spool
+
+    def cleanup_spool_files(self):
+        """Remove spool files no endpoint claimed."""
+        for spool in getattr(self, "_spool_files", []):
+            spool.discard()
+
+
+class SpooledUpload:
+    """An uploaded audio file that is fully on disk, with its SHA-256."""
+
+    def __init__(self, path, sha256, size, filename):
+        self.path = path
+        self.sha256 = sha256
+        self.size = size
+        self.filename = filename
+
+    def remove(self):
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def spool_upload(file_storage, max_bytes=MAX_UPLOAD_BYTES, spool_dir=SPOOL_DIR):
+    """
+    Move an uploaded FileStorage into the spool directory and return a SpooledUpload.
+    Streams parsed by SpoolingRequest are already on disk and hashed; anything else
+    is copied in CHUNK_SIZE pieces so memory stays bounded.
+    """
+    filename = file_storage.filename or ""
+    if not filename:
+        raise UploadRejected("empty filename")
+    ext = audio_extension(filename)
+    if ext not in ALLOWED_AUDIO_EXTENSIONS:
+        raise UploadRejected(f"unsupported audio type: {ext or 'none'}", 415)
+
+    stream = file_storage.stream
+    if isinstance(stream, HashingSpoolFile):
+        stream.flush()
+        stream._fh.close()
+        spool = stream
+    else:
+        spool = HashingSpoolFile(suffix=ext, max_bytes=max_bytes, spool_dir=spool_dir)
+        try:
+            while True:
+                chunk = stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                spool.write(chunk)
+            spool._fh.close()
+        except RequestEntityTooLarge as e:
+            raise UploadRejected(e.description, 413)
+    if spool.size == 0:
+        spool.discard()
+        raise UploadRejected("empty audio file")
+
+    final_path = os.path.join(spool_dir, f"{spool.hexdigest()}_{uuid.uuid4().hex[:8]}{ext}")
+    # The request-time spool file may sit on another filesystem than spool_dir
+    # (e.g. a shared job spool on NFS), where a plain rename fails with EXDEV
+    shutil.move(spool.path, final_path)
+    return SpooledUpload(final_path, spool.hexdigest(), spool.size, filename)
+
+
+def probe_duration(path):
+    """Container duration in seconds via PyAV (None if it cannot be determined)."""
+    try:
+        import av
+    except Exception:
+        return None
+    try:
+        with av.open(path) as container:
+            if container.duration:
+                return container.duration / 1_000_000
+            stream = container.streams.audio[0]
+            if stream.duration and stream.time_base:
+                return float(stream.duration * stream.time_base)
+    except Exception:
+        return None
+    return None
+
+
+def check_audio_duration(path, max_seconds=MAX_AUDIO_SECONDS):
+    """Reject audio longer than `max_seconds` from the container header, before decoding."""
+    duration = probe_duration(path)
+    if duration is not None and max_seconds and duration > max_seconds:
+        raise UploadRejected(f"audio is {duration / 60:.1f} min; limit is {max_seconds / 60:.0f} min", 413)
+    return duration